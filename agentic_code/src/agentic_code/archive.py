@@ -0,0 +1,173 @@
+import json
+import os
+import sqlite3
+import time
+
+from agentic_code.incremental import list_project_files
+from agentic_code.storage import STAGING_PREFIX
+
+ARCHIVE_DB_NAME = ".archive.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    project_id    TEXT PRIMARY KEY,
+    path          TEXT NOT NULL,
+    prompt        TEXT,
+    models        TEXT,
+    started_at    TEXT,
+    wall_s        REAL,
+    tokens        INTEGER,
+    file_count    INTEGER,
+    total_bytes   INTEGER,
+    files         TEXT,
+    validation_ok INTEGER,
+    failing       TEXT,
+    cache_hit     INTEGER,
+    indexed_at    REAL
+);
+CREATE INDEX IF NOT EXISTS projects_started ON projects (started_at DESC, project_id DESC);
+"""
+FTS_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(project_id UNINDEXED, prompt, files)"
+
+
+def _read_json(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+
+class ProjectArchive:
+    """
+    SQLite index of Results/ projects: prompt, models, timings, files and
+    validation status, with full-text search over prompts and file names.
+    Rows are built from each project's metrics.json and validation.json, so
+    the index can always be rebuilt from disk with `sync()`.
+    """
+
+    def __init__(self, results_root="Results", db_path=None):
+        self.results_root = os.path.abspath(results_root)
+        self.db_path = db_path or os.path.join(self.results_root, ARCHIVE_DB_NAME)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            try:
+                conn.execute(FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5: search falls back to LIKE
+                self.fts = False
+
+    def _connect(self):
+        # One short-lived connection per call: job threads and Streamlit sessions share the file
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    # --- WRITES ---
+
+    def index_project(self, results_base):
+        """Adds or refreshes one project's row from the files on disk."""
+        results_base = os.path.abspath(results_base)
+        project_id = os.path.basename(results_base)
+        metrics = _read_json(os.path.join(results_base, "metrics.json"))
+        report = _read_json(os.path.join(results_base, "validation.json"))
+
+        files = list_project_files(results_base)
+        total_bytes = sum(os.path.getsize(os.path.join(results_base, f)) for f in files)
+        models = metrics.get("models") or sorted({c["model"] for c in metrics.get("llm_calls", [])})
+        row = {
+            "project_id": project_id,
+            "path": results_base,
+            "prompt": metrics.get("topic"),
+            "models": json.dumps(models),
+            "started_at": metrics.get("started_at")
+                          or time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(os.path.getmtime(results_base))),
+            "wall_s": metrics.get("wall_s"),
+            "tokens": (metrics.get("prompt_tokens") or 0) + (metrics.get("completion_tokens") or 0),
+            "file_count": len(files),
+            "total_bytes": total_bytes,
+            "files": json.dumps(files),
+            "validation_ok": None if not report else int(report.get("ok", False)),
+            "failing": json.dumps(report.get("failing", [])),
+            "cache_hit": int(bool(metrics.get("cache_hit"))),
+            "indexed_at": time.time(),
+        }
+        with self._connect() as conn:
+            conn.execute(f"INSERT OR REPLACE INTO projects ({', '.join(row)}) "
+                         f"VALUES ({', '.join('?' * len(row))})", list(row.values()))
+            if self.fts:
+                conn.execute("DELETE FROM projects_fts WHERE project_id = ?", (project_id,))
+                conn.execute("INSERT INTO projects_fts (project_id, prompt, files) VALUES (?, ?, ?)",
+                             (project_id, row["prompt"] or "", " ".join(files)))
+        return row
+
+    def remove(self, project_id):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM projects WHERE project_id = ?", (project_id,))
+            if self.fts:
+                conn.execute("DELETE FROM projects_fts WHERE project_id = ?", (project_id,))
+
+    def sync(self):
+        """
+        Indexes project folders the archive has not seen and drops rows whose
+        folder is gone. One directory scan; existing rows are not re-read.
+        Returns (added, removed) counts.
+        """
+        on_disk = set()
+        if os.path.isdir(self.results_root):
+            with os.scandir(self.results_root) as entries:
+                on_disk = {e.name for e in entries
+                           if e.is_dir() and not e.name.startswith((".", STAGING_PREFIX))}
+        with self._connect() as conn:
+            indexed = {r[0] for r in conn.execute("SELECT project_id FROM projects")}
+        for project_id in sorted(on_disk - indexed):
+            self.index_project(os.path.join(self.results_root, project_id))
+        for project_id in indexed - on_disk:
+            self.remove(project_id)
+        return len(on_disk - indexed), len(indexed - on_disk)
+
+    # --- QUERIES ---
+
+    def search(self, query="", page=0, page_size=25):
+        """Newest-first page of projects matching `query`. Returns (rows, total)."""
+        where, params = "", []
+        terms = [t.replace('"', "") for t in query.split() if t.replace('"', "")]
+        if terms and self.fts:
+            where = ("WHERE project_id IN (SELECT project_id FROM projects_fts "
+                     "WHERE projects_fts MATCH ?)")
+            params.append(" ".join(f'"{t}"*' for t in terms))
+        elif terms:
+            where = "WHERE " + " AND ".join("(prompt LIKE ? OR files LIKE ? OR project_id LIKE ?)" for _ in terms)
+            for t in terms:
+                params.extend([f"%{t}%"] * 3)
+
+        with self._connect() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM projects {where}", params).fetchone()[0]
+            rows = conn.execute(f"SELECT * FROM projects {where} ORDER BY started_at DESC, project_id DESC "
+                                f"LIMIT ? OFFSET ?", params + [page_size, page * page_size]).fetchall()
+        return [self._row_dict(r) for r in rows], total
+
+    def get(self, project_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM projects WHERE project_id = ?", (project_id,)).fetchone()
+        return self._row_dict(row) if row else None
+
+    @staticmethod
+    def _row_dict(row):
+        data = dict(row)
+        for key in ("models", "files", "failing"):
+            data[key] = json.loads(data[key]) if data[key] else []
+        return data
+
+
+def index_project(results_base):
+    """Records a finished project in the archive of its Results folder; never raises."""
+    try:
+        ProjectArchive(os.path.dirname(os.path.abspath(results_base))).index_project(results_base)
+    except (OSError, sqlite3.Error) as e:
+        print(f"⚠️ Archive index not updated: {e}")
@@ -0,0 +1,111 @@
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+
+def load_prompts(source):
+    """
+    Reads batch prompts from `source`.
+
+    A directory contributes one prompt per '*.txt' file (sorted by name);
+    a file contributes one prompt per non-empty line.
+    """
+    if os.path.isdir(source):
+        prompts = []
+        for name in sorted(os.listdir(source)):
+            if not name.endswith(".txt"):
+                continue
+            with open(os.path.join(source, name), "r", encoding="utf-8") as f:
+                text = f.read().strip()
+            if text:
+                prompts.append(text)
+        return prompts
+
+    with open(source, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def run_batch(prompts, run_job, workers=2, timeout=None, results_root="Results"):
+    """
+    Runs `run_job(prompt, results_base)` for every prompt on a bounded thread pool.
+
+    Each job gets its own Results/Project_<batch>_<nn> folder. A job that runs
+    longer than `timeout` seconds is reported as timed out; Python threads
+    cannot be killed, so its worker is released once the underlying call
+    returns (the Ollama client timeout bounds that). Returns the summary dict
+    that is also written to Results/batch_<batch>.json.
+    """
+    batch_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    os.makedirs(results_root, exist_ok=True)
+
+    jobs = []
+    for i, prompt in enumerate(prompts, start=1):
+        project_id = f"Project_{batch_id}_{i:03d}"
+        jobs.append({
+            "index": i,
+            "prompt": prompt,
+            "project": os.path.join(results_root, project_id),
+            "status": "queued",
+            "started": None,
+            "seconds": None,
+            "error": None,
+        })
+
+    def _execute(job):
+        job["status"] = "running"
+        job["started"] = time.monotonic()
+        run_job(job["prompt"], job["project"])
+        return job
+
+    batch_start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="crew-batch") as pool:
+        pending = {pool.submit(_execute, job): job for job in jobs}
+        while pending:
+            done, _ = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = pending.pop(future)
+                if job["status"] == "timeout":
+                    continue
+                job["seconds"] = round(time.monotonic() - job["started"], 2)
+                try:
+                    future.result()
+                    job["status"] = "ok"
+                    print(f"✅ [{job['index']}/{len(jobs)}] {job['project']} ({job['seconds']}s)")
+                except Exception as e:
+                    job["status"] = "failed"
+                    job["error"] = str(e)
+                    print(f"❌ [{job['index']}/{len(jobs)}] {e}")
+
+            if timeout is None:
+                continue
+            now = time.monotonic()
+            for future, job in pending.items():
+                if job["status"] == "running" and now - job["started"] > timeout:
+                    job["status"] = "timeout"
+                    job["seconds"] = round(now - job["started"], 2)
+                    job["error"] = f"Exceeded {timeout}s"
+                    print(f"⏱️ [{job['index']}/{len(jobs)}] Timed out after {timeout}s")
+            # Timed-out jobs are only waited on once their call returns
+            for future in [f for f, j in pending.items() if j["status"] == "timeout" and f.done()]:
+                pending.pop(future)
+
+    counts = {}
+    for job in jobs:
+        job.pop("started")
+        counts[job["status"]] = counts.get(job["status"], 0) + 1
+
+    summary = {
+        "batch_id": batch_id,
+        "workers": workers,
+        "timeout": timeout,
+        "wall_seconds": round(time.monotonic() - batch_start, 2),
+        "counts": counts,
+        "jobs": jobs,
+    }
+    report_path = os.path.join(results_root, f"batch_{batch_id}.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    print(f"\n📊 Batch summary: {counts} in {summary['wall_seconds']}s -> {report_path}")
+    return summary
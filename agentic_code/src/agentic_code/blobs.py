@@ -0,0 +1,276 @@
+import errno
+import gzip
+import hashlib
+import os
+import shutil
+import stat
+import time
+import uuid
+from datetime import datetime
+
+from agentic_code.incremental import list_project_files
+
+# reflink  -> copy-on-write clones (btrfs/xfs); files stay writable. Where the filesystem
+#             cannot clone (ext4, tmpfs, NTFS) it falls back to hardlink (default)
+# hardlink -> project files are read-only (0444) hard links to one stored copy (one inode per
+#             unique file); a file made writable and edited in place changes every project sharing it
+# off      -> plain files, no store
+BLOB_MODES = ("hardlink", "reflink", "off")
+DEFAULT_BLOB_MODE = os.environ.get("AGENTIC_BLOB_MODE", "off" if os.name == "nt" else "reflink")
+
+BLOB_DIR = ".blobs"
+FICLONE = 0x40049409
+GC_MIN_AGE_S = 600
+
+# Errors of a filesystem that cannot link or clone at all
+_UNSUPPORTED_ERRNOS = (errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL)
+_FALLBACK = {"reflink": "hardlink", "hardlink": "off"}
+
+# (mode, results root) -> mode used instead, once the filesystem turned the first down
+_fallbacks = {}
+
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _clone(src, dst):
+    """Copy-on-write clone of src into the new file dst (Linux FICLONE)."""
+    import fcntl
+
+    with open(src, "rb") as s, open(dst, "xb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            os.remove(dst)
+            raise
+
+
+class BlobStore:
+    """
+    Content-addressed store under <results_root>/.blobs/objects/ab/<sha256>.
+
+    `absorb()` swaps every file of a project for a link to the stored copy of
+    its content, so the same requirements.txt or empty __init__.py in a
+    thousand projects takes one copy on disk (and, with hard links, one
+    inode). A blob no project links to any more is removed by `gc()`.
+    """
+
+    def __init__(self, results_root="Results", mode=None):
+        mode = mode or DEFAULT_BLOB_MODE
+        if mode not in BLOB_MODES:
+            raise ValueError(f"Unknown blob mode '{mode}', expected one of {BLOB_MODES}")
+        self.results_root = os.path.abspath(results_root)
+        while (mode, self.results_root) in _fallbacks:
+            mode = _fallbacks[(mode, self.results_root)]
+        self.mode = mode
+        self.root = os.path.join(self.results_root, BLOB_DIR, "objects")
+
+    def path_for(self, digest):
+        return os.path.join(self.root, digest[:2], digest)
+
+    def _link(self, src, dst):
+        if self.mode == "hardlink":
+            os.link(src, dst)
+        else:
+            _clone(src, dst)
+
+    def _store(self, path, blob):
+        """Makes `path` the stored copy of its content (replacing a full blob)."""
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        tmp = f"{blob}.tmp-{uuid.uuid4().hex[:8]}"
+        try:
+            self._link(path, tmp)
+        except OSError:
+            self._prune(os.path.dirname(blob))
+            raise
+        # Read-only: a hard-linked file written in place would change every project sharing it
+        os.chmod(tmp, 0o444)
+        os.replace(tmp, blob)
+
+    def _prune(self, directory):
+        """Removes `directory` and its parents up to the results root while they are empty."""
+        while directory.startswith(os.path.join(self.results_root, BLOB_DIR)):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                return
+            directory = os.path.dirname(directory)
+
+    def _fall_back(self, error):
+        """Switches to the next mode after the filesystem refused this one. Returns the new mode."""
+        fallback = _FALLBACK[self.mode]
+        print(f"⚠️ Blob store: {self.mode} not supported here ({error}), using {fallback}")
+        _fallbacks[(self.mode, self.results_root)] = fallback
+        self.mode = fallback
+        return fallback
+
+    def _absorb_file(self, path, st, blob):
+        """Links one project file to its blob. Returns 'kept', 'linked' or 'stored'."""
+        try:
+            blob_st = os.stat(blob)
+        except FileNotFoundError:
+            blob_st = None
+        if blob_st is not None and (blob_st.st_ino, blob_st.st_dev) == (st.st_ino, st.st_dev):
+            return "kept"
+        if blob_st is not None:
+            try:
+                if self._materialize(blob, path):
+                    return "linked"
+            except OSError as e:
+                if e.errno != errno.EMLINK:
+                    raise
+                # Link limit of the filesystem reached: this file starts a fresh blob
+        self._store(path, blob)
+        return "stored"
+
+    def _materialize(self, blob, path):
+        """Replaces `path` with a link to `blob`. False when the blob is gone (gc)."""
+        tmp = f"{path}.blob-{uuid.uuid4().hex[:8]}"
+        try:
+            self._link(blob, tmp)
+        except FileNotFoundError:
+            return False
+        os.replace(tmp, path)
+        return True
+
+    def absorb(self, project_dir):
+        """
+        Moves the project's files into the store. Safe to repeat: files already
+        linked are only hashed. Returns {'files', 'stored', 'linked', 'saved_bytes'}.
+        """
+        stats = {"files": 0, "stored": 0, "linked": 0, "saved_bytes": 0}
+        if self.mode == "off" or not os.path.isdir(project_dir):
+            return stats
+        for rel_path in list_project_files(project_dir):
+            path = os.path.join(project_dir, rel_path)
+            st = os.lstat(path)
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            stats["files"] += 1
+            blob = self.path_for(_hash_file(path))
+            while True:
+                try:
+                    outcome = self._absorb_file(path, st, blob)
+                    break
+                except OSError as e:
+                    if e.errno not in _UNSUPPORTED_ERRNOS:
+                        raise
+                    if self._fall_back(e) == "off":
+                        return stats
+            if outcome == "linked":
+                stats["linked"] += 1
+                stats["saved_bytes"] += st.st_size
+            elif outcome == "stored":
+                stats["stored"] += 1
+        return stats
+
+    def _live_digests(self):
+        """Content hashes of every project file under the results root (reflink mode)."""
+        live = set()
+        for name in os.listdir(self.results_root):
+            project_dir = os.path.join(self.results_root, name)
+            if name.startswith(".") or not os.path.isdir(project_dir):
+                continue
+            for rel_path in list_project_files(project_dir):
+                live.add(_hash_file(os.path.join(project_dir, rel_path)))
+        return live
+
+    def gc(self, dry_run=False, min_age_s=GC_MIN_AGE_S):
+        """
+        Deletes blobs no project uses any more and that are older than
+        `min_age_s`. With hard links that is a link count of 1; reflinked
+        copies have their own inodes, so projects are hashed instead.
+        Returns {'blobs', 'removed', 'freed_bytes'}.
+        """
+        stats = {"blobs": 0, "removed": 0, "freed_bytes": 0}
+        if not os.path.isdir(self.root):
+            return stats
+        live = self._live_digests() if self.mode == "reflink" else None
+        now = time.time()
+        for fan_out in sorted(os.listdir(self.root)):
+            fan_dir = os.path.join(self.root, fan_out)
+            if not os.path.isdir(fan_dir):
+                continue
+            for name in os.listdir(fan_dir):
+                path = os.path.join(fan_dir, name)
+                st = os.stat(path)
+                if ".tmp-" in name:
+                    # Left behind by an interrupted store
+                    unused = True
+                else:
+                    stats["blobs"] += 1
+                    unused = name not in live if live is not None else st.st_nlink == 1
+                if not unused or now - st.st_mtime < min_age_s:
+                    continue
+                stats["removed"] += 1
+                stats["freed_bytes"] += st.st_size
+                if not dry_run:
+                    os.remove(path)
+            if not dry_run and not os.listdir(fan_dir):
+                os.rmdir(fan_dir)
+        return stats
+
+    def stats(self):
+        blobs = total = 0
+        if os.path.isdir(self.root):
+            for fan_out in os.listdir(self.root):
+                for entry in os.scandir(os.path.join(self.root, fan_out)):
+                    blobs += 1
+                    total += entry.stat().st_size
+        return {"mode": self.mode, "blobs": blobs, "bytes": total}
+
+
+def absorb_project(project_dir):
+    """Dedupes one project into the store next to it. Never raises; returns the stats or None."""
+    project_dir = os.path.abspath(project_dir)
+    try:
+        return BlobStore(os.path.dirname(project_dir)).absorb(project_dir)
+    except Exception as e:
+        print(f"⚠️ Blob store skipped: {e}")
+        return None
+
+
+def save_raw_output(directory, text=None, source_path=None):
+    """
+    Stores a raw model answer gzip-compressed as raw_output_<timestamp>.txt.gz,
+    from `text` or by moving the file at `source_path`. Returns the path.
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filepath = os.path.join(directory, f"raw_output_{timestamp}.txt.gz")
+    tmp_path = filepath + ".part"
+    with gzip.open(tmp_path, "wb", compresslevel=6) as out:
+        if source_path is not None:
+            with open(source_path, "rb") as src:
+                shutil.copyfileobj(src, out)
+        else:
+            out.write(text.encode("utf-8"))
+    os.replace(tmp_path, filepath)
+    if source_path is not None:
+        os.remove(source_path)
+    return filepath
+
+
+def compress_raw_outputs(results_root, dry_run=False):
+    """Gzips raw_output_*.txt files written before compression. Returns (files, bytes before)."""
+    count = size = 0
+    if not os.path.isdir(results_root):
+        return count, size
+    for name in sorted(os.listdir(results_root)):
+        path = os.path.join(results_root, name)
+        if not (name.startswith("raw_output_") and name.endswith(".txt")) or not os.path.isfile(path):
+            continue
+        count += 1
+        size += os.path.getsize(path)
+        if not dry_run:
+            tmp_path = path + ".gz.part"
+            with open(path, "rb") as src, gzip.open(tmp_path, "wb", compresslevel=6) as out:
+                shutil.copyfileobj(src, out)
+            os.replace(tmp_path, path + ".gz")
+            os.remove(path)
+    return count, size
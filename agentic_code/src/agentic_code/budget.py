@@ -0,0 +1,182 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# CrewAI appends the previous task's output to the next task's prompt after this line
+CONTEXT_MARKER = "This is the context you're working with:"
+# ...and its own instructions after the context; the ReAct parser depends on them
+CONTEXT_END_MARKERS = ("\n\nBegin!", "\nThought:", "\nThis is the expected criteria for your final answer:",
+                       "\nyou MUST return the actual complete content", "\nIMPORTANT:", "\nCurrent Task:")
+
+# Prompt token budget per task; the inter-task context is compacted to fit
+DEFAULT_BUDGETS = {"coding_task": 2000, "review_task": 2500, "update_task": 6000, "file_task": 2500}
+MIN_CONTEXT_TOKENS = 200
+COMPACTED_ENTRIES = 64
+
+
+def parse_budgets(spec):
+    """'review_task=1800,coding_task=1500' -> {task_name: tokens}."""
+    budgets = {}
+    for item in spec.split(","):
+        name, _, tokens = item.partition("=")
+        if name.strip() and tokens.strip().isdigit():
+            budgets[name.strip()] = int(tokens)
+    return budgets
+
+
+TASK_BUDGETS = {**DEFAULT_BUDGETS, **parse_budgets(os.environ.get("AGENTIC_TASK_BUDGETS", ""))}
+
+
+class TokenEstimator:
+    """
+    Character-based token estimate per model, calibrated from the real
+    prompt_eval_count Ollama reports, so no tokenizer has to be loaded.
+    """
+
+    DEFAULT_CHARS_PER_TOKEN = 3.6
+
+    def __init__(self):
+        self._ratios = {}
+        self._lock = threading.Lock()
+
+    def chars_per_token(self, model):
+        return self._ratios.get(model, self.DEFAULT_CHARS_PER_TOKEN)
+
+    def count(self, text, model=None):
+        return int(len(text) / self.chars_per_token(model)) + 1
+
+    def reset(self):
+        """Forgets the calibration (replayed runs must all start from the same estimate)."""
+        with self._lock:
+            self._ratios.clear()
+
+    def observe(self, model, chars, tokens):
+        """Moves the model's ratio towards an observed prompt (ignores cache-shortened counts)."""
+        if not tokens or not chars:
+            return
+        ratio = chars / tokens
+        if not 2.0 <= ratio <= 6.0:
+            return
+        with self._lock:
+            self._ratios[model] = round(0.7 * self.chars_per_token(model) + 0.3 * ratio, 3)
+
+
+estimator = TokenEstimator()
+
+
+def _line_priority(line):
+    """Structure (headings, lists, files, signatures) is kept before prose."""
+    stripped = line.strip()
+    if re.match(r"^(#+\s|\*\*|\d+[.)]\s|[-*+]\s)", stripped):
+        return 2
+    if re.search(r"\.py\b|requirements|\bimport\b|\bdef\b|\bclass\b|src/", stripped):
+        return 2
+    return 1
+
+
+def compact_text(text, max_tokens, model=None):
+    """
+    Shrinks text to about `max_tokens`: whitespace first, then low-priority
+    lines, keeping the original line order. No model call is made.
+    """
+    lines = [re.sub(r"[ \t]+", " ", line).rstrip() for line in text.splitlines()]
+    compact, blank = [], False
+    for line in lines:
+        if not line.strip():
+            if not blank:
+                compact.append("")
+            blank = True
+            continue
+        compact.append(line)
+        blank = False
+    text = "\n".join(compact).strip()
+    if estimator.count(text, model) <= max_tokens:
+        return text
+
+    ranked = sorted(range(len(compact)), key=lambda i: (-_line_priority(compact[i]), i))
+    keep, used = set(), 0
+    budget = max_tokens - 20  # room for the omission note
+    for i in ranked:
+        cost = estimator.count(compact[i], model)
+        if compact[i] and used + cost <= budget:
+            keep.add(i)
+            used += cost
+    dropped = sum(1 for i, line in enumerate(compact) if line and i not in keep)
+    kept = [line for i, line in enumerate(compact) if i in keep]
+    return "\n".join(kept) + f"\n[... {dropped} lines omitted to fit the prompt budget]"
+
+
+def split_context(text):
+    """(context block, CrewAI's trailing instructions) of the text after CONTEXT_MARKER."""
+    ends = [i for i in (text.find(marker) for marker in CONTEXT_END_MARKERS) if i != -1]
+    end = min(ends) if ends else len(text)
+    return text[:end], text[end:]
+
+
+# Context message as sent -> its content after fit_messages, per task and model.
+# A task's later ReAct calls resend the same context message and must get the
+# byte-identical text back, or Ollama's prompt-prefix cache misses
+_fitted = OrderedDict()
+_fitted_lock = threading.Lock()
+
+
+def _fit_context(content, task_name, model, budget, before):
+    """The content to send for one context message, decided on its first call."""
+    key = hashlib.sha256(f"{task_name}\0{model}\0{budget}\0{content}".encode("utf-8")).hexdigest()
+    with _fitted_lock:
+        fitted = _fitted.get(key)
+        if fitted is not None:
+            _fitted.move_to_end(key)
+            return fitted
+    if before <= budget:
+        fitted = content
+    else:
+        head, _, context = content.partition(CONTEXT_MARKER)
+        context, tail = split_context(context)
+        rest = before - estimator.count(context, model)
+        target = max(MIN_CONTEXT_TOKENS, budget - rest)
+        fitted = f"{head}{CONTEXT_MARKER}\n{compact_text(context, target, model)}{tail}"
+    with _fitted_lock:
+        _fitted[key] = fitted
+        while len(_fitted) > COMPACTED_ENTRIES:
+            _fitted.popitem(last=False)
+    return fitted
+
+
+def fit_messages(messages, task_name, model):
+    """
+    Measures the prompt and, when it exceeds the task's budget, compacts the
+    inter-task context in the last user message. The context is compacted
+    once per task: later calls of the same task reuse the exact same text,
+    however much the conversation has grown. Returns (messages, report).
+    """
+    start = time.perf_counter()
+    budget = TASK_BUDGETS.get(task_name)
+    before = sum(estimator.count(m.get("content") or "", model) for m in messages)
+    report = {"task": task_name, "budget": budget, "tokens_before": before, "tokens_after": before,
+              "compacted": False, "over_budget": before > budget if budget is not None else False}
+    if budget is None:
+        report["compaction_s"] = round(time.perf_counter() - start, 5)
+        return messages, report
+
+    for index in range(len(messages) - 1, -1, -1):
+        content = messages[index].get("content") or ""
+        if messages[index].get("role") != "user" or CONTEXT_MARKER not in content:
+            continue
+        fitted = _fit_context(content, task_name, model, budget, before)
+        if fitted != content:
+            messages = [dict(m) for m in messages]
+            messages[index]["content"] = fitted
+            report["compacted"] = True
+        break
+
+    after = sum(estimator.count(m.get("content") or "", model) for m in messages)
+    report["tokens_after"] = after
+    report["over_budget"] = after > budget
+    report["compaction_s"] = round(time.perf_counter() - start, 5)
+    if report["compacted"]:
+        print(f"✂️ {task_name}: prompt compacted {before} -> {after} tokens (budget {budget})")
+    return messages, report
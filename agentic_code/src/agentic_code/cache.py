@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import threading
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config")
+CONFIG_FILES = ("agents.yaml", "tasks.yaml")
+
+DEFAULT_CACHE_DIR = os.environ.get("AGENTIC_CACHE_DIR", os.path.join(".cache", "crew_results"))
+DEFAULT_MAX_BYTES = int(float(os.environ.get("AGENTIC_CACHE_MAX_MB", "256")) * 1024 * 1024)
+
+
+def normalize_topic(topic):
+    """Collapses whitespace so cosmetic prompt edits hit the same entry."""
+    return " ".join(topic.split())
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def make_cache_key(topic, models, generation="single", config_dir=CONFIG_DIR):
+    """
+    Content address of a crew run: normalized topic + model names + generation
+    mode (single or fanout) + YAML config hashes.
+    """
+    material = {
+        "topic": normalize_topic(topic),
+        "models": list(models),
+        "generation": generation,
+        "config": {name: _file_digest(os.path.join(config_dir, name)) for name in CONFIG_FILES},
+    }
+    payload = json.dumps(material, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk store of raw crew outputs with size-bounded LRU eviction.
+
+    Each entry is a '<key>.txt' file; its mtime doubles as the last-access
+    time, so recency survives restarts without a separate index.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.txt")
+
+    def get(self, key):
+        """Returns the cached output for `key` or None."""
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    text = f.read()
+            except FileNotFoundError:
+                self.misses += 1
+                self._record(hit=False)
+                return None
+            os.utime(path)  # Mark as most recently used
+            self.hits += 1
+            self._record(hit=True)
+            return text
+
+    def put(self, key, text):
+        """Stores `text` under `key` and evicts least recently used entries."""
+        path = self._path(key)
+        tmp_path = path + ".tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+            self._evict()
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".txt"):
+                continue
+            stat = os.stat(os.path.join(self.cache_dir, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+            print(f"🧹 Cache evicted: {name}")
+
+    # --- COUNTERS ---
+
+    def _stats_path(self):
+        return os.path.join(self.cache_dir, "stats.json")
+
+    def _record(self, hit):
+        stats = self.stats()
+        stats["hits" if hit else "misses"] += 1
+        with open(self._stats_path(), "w", encoding="utf-8") as f:
+            json.dump(stats, f)
+
+    def stats(self):
+        """Lifetime hit/miss counters persisted next to the entries."""
+        try:
+            with open(self._stats_path(), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {"hits": 0, "misses": 0}
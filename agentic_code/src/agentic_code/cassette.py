@@ -0,0 +1,192 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import uuid
+from collections import Counter
+
+# live   -> plain ChatOllama clients
+# record -> live calls, every request/response pair is saved to the cassette
+# replay -> answers come from the cassette; no network, no langchain import
+LLM_MODES = ("live", "record", "replay")
+LLM_MODE = os.environ.get("AGENTIC_LLM_MODE", "live")
+DEFAULT_CASSETTE = os.environ.get("AGENTIC_LLM_CASSETTE", os.path.join("cassettes", "pipeline.json.gz"))
+
+CASSETTE_VERSION = 1
+REPLAY_CHUNK_CHARS = 48
+
+# Parts of a prompt that change between otherwise identical runs
+_VOLATILE = (
+    (re.compile(r"Project_\d{8}_\d{6}\w*"), "Project_*"),
+    (re.compile(r"\s+"), " "),
+)
+
+
+class CassetteMiss(Exception):
+    """Replay mode met a prompt the cassette has no recording for."""
+
+
+def normalize_prompt(text):
+    for pattern, replacement in _VOLATILE:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def cassette_key(model, messages, stop=None):
+    """Hash of the model, the normalized messages and the stop words."""
+    payload = json.dumps([
+        model,
+        [[m.get("role"), normalize_prompt(m.get("content") or "")] for m in messages],
+        sorted(stop or []),
+    ], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _json_safe(metadata):
+    return {k: v for k, v in (metadata or {}).items() if v is None or isinstance(v, (str, int, float, bool))}
+
+
+class ReplayChunk:
+    """The two fields of a langchain stream chunk that OllamaLLM reads."""
+
+    def __init__(self, content, response_metadata=None):
+        self.content = content
+        self.response_metadata = response_metadata or {}
+
+
+class Cassette:
+    """
+    Recorded LLM answers in one gzip'd JSON file, keyed by cassette_key().
+
+    A prompt asked several times keeps every answer in order, and replay
+    serves them in the same order (repeating the last one).
+    """
+
+    def __init__(self, path=DEFAULT_CASSETTE, mode="replay", reset=False):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode '{mode}', expected record or replay")
+        self.path = path
+        self.mode = mode
+        self.meta = {}
+        self.interactions = {}
+        self.hits = 0
+        self.recorded = 0
+        self._served = Counter()
+        self._lock = threading.Lock()
+        if os.path.exists(path) and not reset:
+            self.load()
+        elif mode == "replay":
+            raise FileNotFoundError(f"No cassette at {path}")
+
+    def load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"{self.path}: cassette version {data.get('version')}, expected {CASSETTE_VERSION}")
+        self.meta = data.get("meta") or {}
+        self.interactions = data.get("interactions") or {}
+
+    def save(self):
+        """Atomic rewrite; mtime=0 keeps the file byte-identical for identical content."""
+        with self._lock:
+            data = {"version": CASSETTE_VERSION, "meta": self.meta, "interactions": self.interactions}
+            body = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.{uuid.uuid4().hex[:8]}.part"
+        with open(tmp_path, "wb") as f:
+            f.write(gzip.compress(body.encode("utf-8"), compresslevel=9, mtime=0))
+        os.replace(tmp_path, self.path)
+
+    def rewind(self):
+        """Serves every prompt from its first recorded answer again (one replayed run each)."""
+        with self._lock:
+            self._served.clear()
+
+    def play(self, key, messages=()):
+        with self._lock:
+            answers = self.interactions.get(key)
+            if answers:
+                index = min(self._served[key], len(answers) - 1)
+                self._served[key] += 1
+                self.hits += 1
+                return answers[index]
+        last = normalize_prompt(messages[-1].get("content") or "")[:160] if messages else ""
+        raise CassetteMiss(f"No recording for prompt {key} in {self.path} "
+                           f"(re-record with `test --record`): {last}...")
+
+    def record(self, key, model, response, metadata):
+        with self._lock:
+            self.interactions.setdefault(key, []).append(
+                {"model": model, "response": response, "metadata": _json_safe(metadata)})
+            self.recorded += 1
+        self.save()
+
+    def client(self, model, inner=None):
+        return CassetteClient(self, model, inner)
+
+
+class CassetteClient:
+    """Stands in for a ChatOllama client: `stream()` records through `inner` or replays."""
+
+    def __init__(self, cassette, model, inner=None):
+        self.cassette = cassette
+        self.model = model
+        self.inner = inner
+
+    def stream(self, messages, stop=None):
+        key = cassette_key(self.model, messages, stop)
+        if self.cassette.mode == "replay":
+            answer = self.cassette.play(key, messages)
+            text = answer["response"]
+            for i in range(0, len(text), REPLAY_CHUNK_CHARS):
+                yield ReplayChunk(text[i:i + REPLAY_CHUNK_CHARS])
+            yield ReplayChunk("", dict(answer["metadata"], done=True))
+            return
+
+        parts, metadata = [], {}
+        for chunk in self.inner.stream(messages, stop=stop):
+            if isinstance(chunk.content, str):
+                parts.append(chunk.content)
+            if chunk.response_metadata.get("done"):
+                metadata = chunk.response_metadata
+            yield chunk
+        # Only complete answers are recorded
+        self.cassette.record(key, self.model, "".join(parts), metadata)
+
+
+_active = None
+_active_lock = threading.Lock()
+
+
+def get_cassette():
+    """The process-wide cassette (AGENTIC_LLM_MODE / AGENTIC_LLM_CASSETTE); None when live."""
+    global _active
+    with _active_lock:
+        if _active is None and LLM_MODE != "live":
+            if LLM_MODE not in LLM_MODES:
+                raise ValueError(f"Unknown AGENTIC_LLM_MODE '{LLM_MODE}', expected one of {LLM_MODES}")
+            _active = Cassette(DEFAULT_CASSETTE, LLM_MODE)
+        return _active
+
+
+def use_cassette(cassette):
+    """Routes the LLM clients built from now on through `cassette`; call before the first LLM call."""
+    global _active
+    with _active_lock:
+        _active = cassette
+
+
+def project_digest(project_dir):
+    """(sha256 of the whole project, {path: sha256}) over the files list_project_files sees."""
+    from agentic_code.incremental import list_project_files
+
+    files = {}
+    total = hashlib.sha256()
+    for rel_path in list_project_files(project_dir):
+        with open(os.path.join(project_dir, rel_path), "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        files[rel_path] = digest
+        total.update(f"{rel_path}\0{digest}\n".encode("utf-8"))
+    return total.hexdigest(), files
@@ -0,0 +1,120 @@
+import json
+import os
+import time
+
+from agentic_code.jobs import TASK_ORDER
+
+DEFAULT_CHECKPOINT_DIR = os.environ.get("AGENTIC_CHECKPOINT_DIR", ".checkpoints")
+
+
+class RunCheckpoint:
+    """
+    Task outputs of one crew run, saved as they complete.
+
+    Layout: <checkpoint_dir>/<run_id>/run.json plus one <task_name>.txt per
+    finished task. A failed run keeps whatever finished, so `replay` can
+    restart from the first incomplete task.
+    """
+
+    def __init__(self, run_dir):
+        self.run_dir = run_dir
+        self.run_id = os.path.basename(run_dir)
+
+    @classmethod
+    def start(cls, topic, results_base, checkpoint_dir=DEFAULT_CHECKPOINT_DIR):
+        run_dir = os.path.join(checkpoint_dir, os.path.basename(os.path.normpath(results_base)))
+        checkpoint = cls(run_dir)
+        if os.path.isdir(run_dir) and checkpoint._previous_topic() != topic:
+            # A reused or colliding run id must never resume another topic's outputs
+            print(f"⚠️ Checkpoint {checkpoint.run_id} held another topic: starting it over")
+            checkpoint.clear()
+        os.makedirs(run_dir, exist_ok=True)
+        checkpoint._write_meta({
+            "topic": topic,
+            "results_base": results_base,
+            "status": "running",
+            "created": time.time(),
+            "error": None,
+        })
+        return checkpoint
+
+    @classmethod
+    def load(cls, run_id, checkpoint_dir=DEFAULT_CHECKPOINT_DIR):
+        run_dir = os.path.join(checkpoint_dir, run_id)
+        if not os.path.exists(os.path.join(run_dir, "run.json")):
+            return None
+        return cls(run_dir)
+
+    # --- METADATA ---
+
+    def meta(self):
+        with open(os.path.join(self.run_dir, "run.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_meta(self, meta):
+        tmp_path = os.path.join(self.run_dir, "run.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.run_dir, "run.json"))
+
+    def _previous_topic(self):
+        try:
+            return self.meta().get("topic")
+        except (OSError, ValueError):
+            return None
+
+    def update(self, **fields):
+        meta = self.meta()
+        meta.update(fields)
+        self._write_meta(meta)
+
+    # --- TASK OUTPUTS ---
+
+    def completed(self):
+        """{task_name: raw output} for every task that finished, in crew order."""
+        outputs = {}
+        for name in TASK_ORDER:
+            path = os.path.join(self.run_dir, f"{name}.txt")
+            if not os.path.exists(path):
+                break
+            with open(path, "r", encoding="utf-8") as f:
+                outputs[name] = f.read()
+        return outputs
+
+    def save_task(self, name, raw):
+        tmp_path = os.path.join(self.run_dir, f"{name}.txt.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(raw)
+        os.replace(tmp_path, os.path.join(self.run_dir, f"{name}.txt"))
+        print(f"💾 Checkpoint: {name} saved for {self.run_id}")
+
+    def clear(self):
+        """Removes every saved task output."""
+        for name in os.listdir(self.run_dir):
+            if name.endswith((".txt", ".txt.tmp")):
+                os.remove(os.path.join(self.run_dir, name))
+
+    def task_completed(self, output):
+        """Crew task_callback: stores the finished task's raw output."""
+        done = self.completed()
+        name = getattr(output, "name", None)
+        if name not in TASK_ORDER:
+            # Sequential crew: the finished task is the first one without a checkpoint
+            name = TASK_ORDER[min(len(done), len(TASK_ORDER) - 1)]
+        self.save_task(name, getattr(output, "raw", str(output)))
+
+
+def list_runs(checkpoint_dir=DEFAULT_CHECKPOINT_DIR):
+    """Metadata of all checkpointed runs, newest first."""
+    if not os.path.isdir(checkpoint_dir):
+        return []
+    runs = []
+    for run_id in os.listdir(checkpoint_dir):
+        checkpoint = RunCheckpoint.load(run_id, checkpoint_dir)
+        if checkpoint is None:
+            continue
+        meta = checkpoint.meta()
+        meta["run_id"] = run_id
+        meta["completed"] = list(checkpoint.completed())
+        runs.append(meta)
+    return sorted(runs, key=lambda m: m["created"], reverse=True)
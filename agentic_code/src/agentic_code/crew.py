@@ -1,8 +1,8 @@
 import os
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
-from langchain_ollama import ChatOllama
-from crewai_tools import FileReadTool
+from agentic_code.llms import CODER_MODEL, REVIEWER_MODEL, get_llm, model_names
+from agentic_code.tools.custom_tool import workspace_tools
 
 # Set environment variables to prevent CrewAI from looking for OpenAI
 os.environ["OPENAI_API_KEY"] = "NA"
@@ -12,27 +12,29 @@ os.environ["OTEL_SDK_DISABLED"] = "true"
 class AgenticCodeCrew():
     """AgenticCode crew for Multi-Agent Coding"""
 
-    # 1. Define LLMs with high timeout for your i5-1235U
-    # Using the exact names from your 'ollama list'
-    local_llm = ChatOllama(
-        model="qwen2.5-coder:7b", 
-        base_url="http://localhost:11434/v1",
-        timeout=300
-    )
-    
-    reviewer_llm = ChatOllama(
-        model="llama3.2:latest", 
-        base_url="http://localhost:11434/v1",
-        timeout=300
-    )
+    # 1. LLM clients are built on first use (see agentic_code.llms)
+    @property
+    def local_llm(self):
+        return get_llm(CODER_MODEL)
+
+    @property
+    def reviewer_llm(self):
+        return get_llm(REVIEWER_MODEL)
+
+    @classmethod
+    def model_names(cls):
+        """Models behind the coder and reviewer agents (part of the result cache key)."""
+        return model_names()
 
     # --- AGENTS ---
 
     @agent
     def coder_agent(self) -> Agent:
+        # Tokens are streamed to main.py only while a run is inside stream_files_to
         return Agent(
             config=self.agents_config['coder_agent'],
             llm=self.local_llm,
+            tools=workspace_tools(),
             verbose=True,
             allow_delegation=False
         )
@@ -42,6 +44,7 @@ class AgenticCodeCrew():
         return Agent(
             config=self.agents_config['reviewer_agent'],
             llm=self.reviewer_llm,
+            tools=workspace_tools(),
             verbose=True,
             allow_delegation=False
         )
@@ -73,4 +76,75 @@ class AgenticCodeCrew():
             process=Process.sequential,     # Runs tasks one after the other
             manager_llm=self.local_llm,     # Prevents OpenAI 401 error
             verbose=True
-        )
\ No newline at end of file
+        )
+
+    def resume_crew(self, completed):
+        """
+        Crew for a checkpointed run: tasks in `completed` ({task_name: raw output})
+        are skipped and their saved output is handed to the next task as context.
+        """
+        from crewai.tasks.task_output import TaskOutput
+
+        full_crew = self.crew()
+        remaining = []
+        previous = None
+        for task in full_crew.tasks:
+            if task.name in completed:
+                task.output = TaskOutput(
+                    description=task.description,
+                    name=task.name,
+                    raw=completed[task.name],
+                    agent=task.agent.role if task.agent else "",
+                )
+            else:
+                if previous is not None and previous.name in completed:
+                    task.context = [previous]
+                remaining.append(task)
+            previous = task
+        return Crew(
+            agents=full_crew.agents,
+            tasks=remaining,
+            process=Process.sequential,
+            manager_llm=self.local_llm,
+            verbose=True
+        )
+
+    def design_crew(self):
+        """Crew running only the design task; fan-out mode then writes the files one crew per file."""
+        return Crew(
+            agents=[self.reviewer_agent()],
+            tasks=[self.coding_task()],
+            process=Process.sequential,
+            manager_llm=self.local_llm,
+            verbose=True
+        )
+
+    def file_crew(self, design):
+        """
+        Single-file crew for fan-out generation (see agentic_code.fanout): the
+        finished design is handed to file_task as its context.
+        """
+        from crewai.tasks.task_output import TaskOutput
+
+        design_task = self.coding_task()
+        design_task.output = TaskOutput(
+            description=design_task.description,
+            name=design_task.name,
+            raw=design,
+            agent=design_task.agent.role if design_task.agent else "",
+        )
+        return Crew(
+            agents=[self.coder_agent()],
+            tasks=[Task(config=self.tasks_config['file_task'], context=[design_task])],
+            process=Process.sequential,
+            verbose=False
+        )
+
+    def update_crew(self):
+        """Single-task crew that edits an existing project (see agentic_code.incremental)."""
+        return Crew(
+            agents=[self.coder_agent()],
+            tasks=[Task(config=self.tasks_config['update_task'])],
+            process=Process.sequential,
+            verbose=True
+        )
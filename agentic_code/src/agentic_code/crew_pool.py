@@ -0,0 +1,206 @@
+import os
+import re
+import threading
+import time
+
+from agentic_code.cache import CONFIG_DIR, CONFIG_FILES
+
+# Placeholders the YAML may use; main.py and incremental.py fill these in
+KNOWN_INPUTS = {"topic", "context", "design", "existing_files", "path", "files"}
+REQUIRED_AGENT_KEYS = ("role", "goal", "backstory")
+REQUIRED_TASK_KEYS = ("description", "expected_output", "agent")
+
+
+def validate_config(agents, tasks):
+    """Problems in parsed agents.yaml / tasks.yaml, as readable strings (empty if valid)."""
+    problems = []
+    if not isinstance(agents, dict) or not agents:
+        return ["agents.yaml defines no agents"]
+    if not isinstance(tasks, dict) or not tasks:
+        return ["tasks.yaml defines no tasks"]
+    for name, config in agents.items():
+        for key in REQUIRED_AGENT_KEYS:
+            if not isinstance(config, dict) or not str(config.get(key) or "").strip():
+                problems.append(f"agent '{name}' is missing '{key}'")
+    for name, config in tasks.items():
+        if not isinstance(config, dict):
+            problems.append(f"task '{name}' is not a mapping")
+            continue
+        for key in REQUIRED_TASK_KEYS:
+            if not str(config.get(key) or "").strip():
+                problems.append(f"task '{name}' is missing '{key}'")
+        if config.get("agent") and config["agent"] not in agents:
+            problems.append(f"task '{name}' uses unknown agent '{config['agent']}'")
+    for kind, section in (("agent", agents), ("task", tasks)):
+        for name, config in section.items():
+            text = " ".join(str(v) for v in (config or {}).values()) if isinstance(config, dict) else ""
+            for placeholder in set(re.findall(r"\{(\w+)\}", text)) - KNOWN_INPUTS:
+                problems.append(f"{kind} '{name}' uses unknown placeholder '{{{placeholder}}}'")
+    return problems
+
+
+def _reset_agent(agent):
+    """Per-run state of one agent: executor conversation, tool results and tool usage."""
+    executor = getattr(agent, "agent_executor", None)
+    if executor is not None:
+        if isinstance(getattr(executor, "messages", None), list):
+            executor.messages.clear()
+        for name, value in (("iterations", 0), ("have_forced_answer", False), ("ask_for_human_input", False)):
+            if hasattr(executor, name):
+                setattr(executor, name, value)
+    if isinstance(getattr(agent, "tools_results", None), list):
+        agent.tools_results.clear()
+    tools_handler = getattr(agent, "tools_handler", None)
+    if tools_handler is not None and hasattr(tools_handler, "last_used_tool"):
+        tools_handler.last_used_tool = {}
+    cache_handler = getattr(agent, "cache_handler", None)
+    if isinstance(getattr(cache_handler, "_cache", None), dict):
+        # Tool results read Results/, which the previous job just changed
+        cache_handler._cache.clear()
+    for tool in getattr(agent, "tools", None) or []:
+        if hasattr(tool, "current_usage_count"):
+            tool.current_usage_count = 0
+    if hasattr(agent, "_times_executed"):
+        agent._times_executed = 0
+
+
+def _reset_run_state(crew):
+    """
+    Clears what a kickoff leaves on a crew so the next run starts clean.
+    Task callbacks must go: CrewAI only assigns crew.task_callback to tasks
+    that have none, so a stale one would report into the previous job. Agent
+    executors are reused across tasks and keep their whole conversation, so a
+    pooled crew would send the previous job's topic and output with the next
+    job's first prompt.
+    """
+    crew.task_callback = None
+    for agent in crew.agents:
+        _reset_agent(agent)
+    for task in crew.tasks:
+        task.output = None
+        task.callback = None
+        for counter in ("used_tools", "tools_errors", "delegations"):
+            if hasattr(task, counter):
+                setattr(task, counter, 0)
+    if hasattr(crew, "usage_metrics"):
+        crew.usage_metrics = None
+
+
+class CrewFactory:
+    """
+    Validates the YAML config once and hands out pooled, pre-built crews.
+
+    `acquire()` reuses an idle crew when there is one, so a request skips the
+    YAML parse and Agent/Task/Crew construction; `release()` resets per-run
+    state and returns it to the pool. Edited YAML files are picked up on the
+    next acquire: the config is revalidated and the old crews are dropped.
+    """
+
+    def __init__(self, config_dir=CONFIG_DIR, max_idle=4):
+        self.config_dir = config_dir
+        self.max_idle = max_idle
+        self.generation = 0
+        self._signature = None
+        self._rejected = None
+        self._error = None
+        self._idle = []
+        self._lock = threading.Lock()
+        self._stats = {"built": 0, "reused": 0, "reloads": 0, "acquire_ms_total": 0.0, "acquires": 0}
+
+    # --- CONFIG ---
+
+    def _config_signature(self):
+        signature = []
+        for name in CONFIG_FILES:
+            stat = os.stat(os.path.join(self.config_dir, name))
+            signature.append((name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _load_and_validate(self):
+        import yaml
+
+        parsed = {}
+        for name in CONFIG_FILES:
+            with open(os.path.join(self.config_dir, name), "r", encoding="utf-8") as f:
+                parsed[name] = yaml.safe_load(f)
+        problems = validate_config(parsed["agents.yaml"], parsed["tasks.yaml"])
+        if problems:
+            raise ValueError("Invalid crew config:\n  " + "\n  ".join(problems))
+
+    def _check_config(self):
+        """Reloads on YAML changes. Called with the lock held."""
+        signature = self._config_signature()
+        if signature in (self._signature, self._rejected):
+            return
+        try:
+            self._load_and_validate()
+        except ValueError as e:
+            self._rejected, self._error = signature, e
+            if self._signature is None:
+                raise
+            # Pooled crews keep the last good config while the file is being edited
+            print(f"⚠️ Crew config change ignored: {e}")
+            return
+        self._rejected = self._error = None
+        if self._signature is not None:
+            self._stats["reloads"] += 1
+            print("🔄 Crew config changed on disk: rebuilding crews")
+        self._signature = signature
+        self.generation += 1
+        self._idle.clear()
+
+    # --- POOL ---
+
+    def new_base(self):
+        """A fresh AgenticCodeCrew built from the validated config (for resume/update crews)."""
+        with self._lock:
+            self._check_config()
+            if self._rejected is not None:
+                # CrewBase would parse the broken files on disk
+                raise self._error
+        from agentic_code.crew import AgenticCodeCrew
+
+        return AgenticCodeCrew()
+
+    def acquire(self):
+        """Returns (crew, generation); hand both back to release() after kickoff."""
+        start = time.perf_counter()
+        with self._lock:
+            self._check_config()
+            generation = self.generation
+            crew = self._idle.pop() if self._idle else None
+        reused = crew is not None
+        if not reused:
+            crew = self.new_base().crew()
+        with self._lock:
+            self._stats["reused" if reused else "built"] += 1
+            self._stats["acquires"] += 1
+            self._stats["acquire_ms_total"] += (time.perf_counter() - start) * 1000
+        return crew, generation
+
+    def release(self, crew, generation):
+        _reset_run_state(crew)
+        with self._lock:
+            if generation == self.generation and len(self._idle) < self.max_idle:
+                self._idle.append(crew)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["idle"] = len(self._idle)
+            stats["generation"] = self.generation
+        stats["acquire_ms_avg"] = round(stats.pop("acquire_ms_total") / stats["acquires"], 3) if stats["acquires"] else None
+        return stats
+
+
+_factory = None
+_factory_lock = threading.Lock()
+
+
+def get_crew_factory():
+    """The process-wide CrewFactory (batch workers and hub sessions share one pool)."""
+    global _factory
+    with _factory_lock:
+        if _factory is None:
+            _factory = CrewFactory()
+        return _factory
@@ -0,0 +1,212 @@
+import ast
+import contextvars
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agentic_code.llms import CODER_MODEL
+from agentic_code.markers import MARKER, clean_block_content, iter_file_blocks
+from agentic_code.scheduler import get_scheduler
+from agentic_code.validation import defined_names
+
+# single -> the coder writes every file in one completion (review_task)
+# fanout -> one generation per file after the design, run concurrently
+GENERATION_MODE = os.environ.get("AGENTIC_GENERATION", "single")
+# Per-file crews in flight; the LLM scheduler still gates how many calls reach Ollama
+FANOUT_WORKERS = int(os.environ.get("AGENTIC_FANOUT_WORKERS", "4"))
+FANOUT_RETRIES = 1
+MAX_FANOUT_FILES = 8
+
+# The layout review_task asks for; __init__.py and requirements.txt need no model call
+DEFAULT_LAYOUT = ("src/__init__.py", "src/engine.py", "app.py", "requirements.txt")
+_SRC_PATH = re.compile(r"\bsrc/[\w/]+\.py\b")
+
+# Import name -> pip package, where they differ
+PIP_NAMES = {
+    "sklearn": "scikit-learn", "PIL": "pillow", "cv2": "opencv-python", "yaml": "pyyaml",
+    "bs4": "beautifulsoup4", "dateutil": "python-dateutil", "dotenv": "python-dotenv",
+}
+
+
+def plan_files(design):
+    """Files of the project: the standard layout plus extra src/ modules the design names."""
+    files = list(DEFAULT_LAYOUT)
+    for path in _SRC_PATH.findall(design or ""):
+        if path not in files and len(files) < MAX_FANOUT_FILES:
+            files.append(path)
+    return files
+
+
+def _file_content(answer, path):
+    """The content of `path` from a model answer, with or without a file marker."""
+    blocks = dict(iter_file_blocks(answer))
+    if path in blocks:
+        return blocks[path]
+    if blocks:
+        # Misnamed marker: the first block is still the requested file
+        return next(iter(blocks.values()))
+    return clean_block_content(answer)
+
+
+def _parse(source):
+    try:
+        return ast.parse(source)
+    except SyntaxError:
+        return None
+
+
+def _imported_modules(path, tree):
+    """(absolute module, imported names) for every `from ... import` in `tree`."""
+    package = path[:-3].split("/")[:-1]
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.ImportFrom):
+            continue
+        module = node.module or ""
+        if node.level:
+            base = package[:len(package) - (node.level - 1)]
+            module = ".".join(base + ([module] if module else []))
+        yield module, [alias.name for alias in node.names if alias.name != "*"]
+
+
+def import_mismatches(sources):
+    """{path: {module paths}}: files importing names another generated module does not define."""
+    modules = {path[:-3].replace("/", "."): path for path in sources
+               if path.endswith(".py") and os.path.basename(path) != "__init__.py"}
+    defined = {}
+    for module, path in modules.items():
+        tree = _parse(sources[path])
+        defined[module] = defined_names(tree) if tree is not None else None
+    mismatches = {}
+    for path, source in sources.items():
+        tree = _parse(source) if path.endswith(".py") else None
+        if tree is None:
+            continue
+        for module, names in _imported_modules(path, tree):
+            known = defined.get(module)
+            if known is not None and any(name not in known for name in names):
+                mismatches.setdefault(path, set()).add(modules[module])
+    return mismatches
+
+
+def public_api(source):
+    """Top-level functions, classes and constants of a module, one per line."""
+    tree = _parse(source)
+    if tree is None:
+        return "(does not parse)"
+    lines = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and not node.name.startswith("_"):
+            lines.append(f"def {node.name}({ast.unparse(node.args)})")
+        elif isinstance(node, ast.ClassDef) and not node.name.startswith("_"):
+            methods = [n.name for n in node.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))
+                       and not n.name.startswith("_")]
+            lines.append(f"class {node.name}" + (f"  # methods: {', '.join(methods)}" if methods else ""))
+        elif isinstance(node, ast.Assign):
+            lines.extend(t.id for t in node.targets if isinstance(t, ast.Name) and t.id.isupper())
+    return "\n".join(lines) or "(no public names)"
+
+
+def requirements_for(sources):
+    """requirements.txt content from the third-party imports of the generated Python files."""
+    local = {path.split("/")[0].removesuffix(".py") for path in sources}
+    packages = set()
+    for path, source in sources.items():
+        tree = _parse(source) if path.endswith(".py") else None
+        if tree is None:
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                top = name.split(".")[0]
+                if top not in local and top not in sys.stdlib_module_names:
+                    packages.add(PIP_NAMES.get(top, top))
+    return "".join(f"{name}\n" for name in sorted(packages, key=str.lower))
+
+
+def generate_files(topic, design, build_crew, workers=None):
+    """
+    Generates the planned files concurrently, one single-file crew each, then
+    runs a consistency pass. `build_crew()` returns a fresh crew (see
+    AgenticCodeCrew.file_crew). A failed file is retried once and otherwise
+    left out; the others are kept. Returns (answer in '--- FILE:' format, report).
+    """
+    start = time.perf_counter()
+    paths = plan_files(design)
+    generated = [p for p in paths if p.endswith(".py") and os.path.basename(p) != "__init__.py"]
+    listing = ", ".join(paths)
+    workers = max(1, min(workers or FANOUT_WORKERS, len(generated)))
+    limit = get_scheduler().limit(CODER_MODEL)
+    report = {"workers": workers, "scheduler_limit": limit, "files": {}, "consistency_fixes": []}
+    if limit < workers:
+        # Crews overlap their host work, but their LLM calls queue at the scheduler
+        print(f"⚠️ Fan-out: {CODER_MODEL} admits {limit} call(s) at a time, so files are generated "
+              f"{limit} at a time. Raise AGENTIC_MODEL_CONCURRENCY (and Ollama's OLLAMA_NUM_PARALLEL) "
+              f"to {workers} for parallel generation.")
+    sources = {}
+
+    def _generate(path, crew, note=""):
+        file_start = time.perf_counter()
+        answer = str(crew.kickoff(inputs={"topic": topic, "path": path, "files": listing + note}))
+        content = _file_content(answer, path)
+        if not content.strip():
+            raise ValueError("empty answer")
+        return content, time.perf_counter() - file_start
+
+    # 1. One crew per file, `workers` at a time; every job runs in a copy of
+    #    this context so tracing, live tokens and the scheduler see the run
+    print(f"\n[🔀] Generating {len(generated)} file(s), {workers} at a time: {', '.join(generated)}")
+    pending = generated
+    for attempt in range(1, FANOUT_RETRIES + 2):
+        if not pending:
+            break
+        crews = {path: build_crew() for path in pending}
+        failed = []
+        with ThreadPoolExecutor(max_workers=min(workers, len(pending)), thread_name_prefix="crew-fanout") as pool:
+            futures = {path: pool.submit(contextvars.copy_context().run, _generate, path, crews[path])
+                       for path in pending}
+            for path, future in futures.items():
+                try:
+                    content, wall_s = future.result()
+                except Exception as e:
+                    failed.append(path)
+                    report["files"][path] = {"ok": False, "attempts": attempt, "error": str(e)}
+                    print(f"❌ {path} failed (attempt {attempt}): {e}")
+                    continue
+                sources[path] = content
+                report["files"][path] = {"ok": True, "attempts": attempt, "wall_s": round(wall_s, 2),
+                                         "chars": len(content)}
+                print(f"✅ Generated: {path} ({wall_s:.1f}s)")
+        pending = failed
+    if not sources:
+        raise RuntimeError("Fan-out generation produced no files")
+
+    # 2. Consistency pass: a file importing names its sibling does not define
+    #    is regenerated once against the sibling's actual API
+    for path, modules in sorted(import_mismatches(sources).items()):
+        api = "\n".join(f"{m}:\n{public_api(sources[m])}" for m in sorted(modules))
+        print(f"🛠️ Consistency: regenerating {path} against {', '.join(sorted(modules))}")
+        try:
+            sources[path], _ = _generate(path, build_crew(),
+                                         f"\n\nAlready written; import only these names from them:\n{api}")
+            report["consistency_fixes"].append(path)
+        except Exception as e:
+            print(f"⚠️ Consistency fix for {path} failed: {e}")
+
+    # 3. Package markers and requirements follow from the generated code
+    for path in list(sources):
+        parts = path.split("/")[:-1]
+        for depth in range(1, len(parts) + 1):
+            sources.setdefault("/".join(parts[:depth] + ["__init__.py"]), "")
+    sources["requirements.txt"] = requirements_for(sources)
+
+    report["failed"] = sorted(p for p, r in report["files"].items() if not r["ok"])
+    report["wall_s"] = round(time.perf_counter() - start, 2)
+    answer = "\n\n".join(f"{MARKER} {path} ---\n{content}" for path, content in sources.items())
+    return answer, report
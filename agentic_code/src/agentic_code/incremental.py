@@ -0,0 +1,158 @@
+import difflib
+import os
+import re
+from datetime import datetime
+
+from agentic_code.checkpoint import RunCheckpoint
+from agentic_code.markers import iter_file_blocks
+from agentic_code.tracing import RunTracer
+
+# Generated or bookkeeping content that is never sent back to the coder
+SKIP_DIRS = {"data", ".history", "__pycache__"}
+SKIP_FILES = {"metrics.json", "validation.json", "profile.folded"}
+
+MAX_CONTEXT_FILES = 4
+MAX_CONTEXT_BYTES = 24000
+
+
+def list_project_files(project_dir):
+    """Relative paths of the project's source files."""
+    files = []
+    for root, dirs, names in os.walk(project_dir):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith("."))
+        for name in sorted(names):
+            rel_path = os.path.relpath(os.path.join(root, name), project_dir).replace(os.sep, "/")
+            if name not in SKIP_FILES and not name.startswith("."):
+                files.append(rel_path)
+    return files
+
+
+def _words(text):
+    return set(re.findall(r"[a-zA-Z_][a-zA-Z0-9_]{2,}", text.lower()))
+
+
+def select_relevant_files(project_dir, change_request, max_files=MAX_CONTEXT_FILES,
+                          max_bytes=MAX_CONTEXT_BYTES):
+    """
+    Picks the files the change request is about.
+
+    Files named in the request (by path or file name) win; otherwise files are
+    ranked by word overlap with the request. The total size is capped so the
+    prompt stays small on CPU inference.
+    """
+    files = list_project_files(project_dir)
+    mentioned = [f for f in files if f in change_request or os.path.basename(f) in change_request]
+    if mentioned:
+        ranked = mentioned
+    else:
+        request_words = _words(change_request)
+        scored = []
+        for rel_path in files:
+            with open(os.path.join(project_dir, rel_path), "r", encoding="utf-8", errors="replace") as f:
+                overlap = len(request_words & _words(rel_path + " " + f.read()))
+            if overlap:
+                scored.append((-overlap, rel_path))
+        ranked = [rel_path for _, rel_path in sorted(scored)]
+
+    selected, total = {}, 0
+    for rel_path in ranked[:max_files]:
+        with open(os.path.join(project_dir, rel_path), "r", encoding="utf-8", errors="replace") as f:
+            content = f.read()
+        if selected and total + len(content) > max_bytes:
+            break
+        selected[rel_path] = content
+        total += len(content)
+    return selected
+
+
+def previous_design(project_dir):
+    """The coding_task design document checkpointed for this project, if any."""
+    checkpoint = RunCheckpoint.load(os.path.basename(os.path.normpath(project_dir)))
+    if checkpoint is not None:
+        design = checkpoint.completed().get("coding_task")
+        if design:
+            return design
+    return "No previous design document is available; infer it from the files."
+
+
+def render_files(files):
+    return "\n\n".join(f"--- FILE: {rel_path} ---\n{content}" for rel_path, content in files.items())
+
+
+def apply_update(project_dir, output_text):
+    """
+    Writes only the files whose content changed, each via an atomic replace.
+    Returns (changed paths, unified diff text).
+    """
+    project_root = os.path.abspath(project_dir)
+    changed, diff_parts = [], []
+    for rel_path, content in iter_file_blocks(output_text):
+        full_path = os.path.abspath(os.path.join(project_root, rel_path))
+        if os.path.commonpath([project_root, full_path]) != project_root:
+            print(f"❌ Skipped {rel_path}: outside the project")
+            continue
+
+        old = ""
+        if os.path.exists(full_path):
+            with open(full_path, "r", encoding="utf-8", errors="replace") as f:
+                old = f.read()
+        # Extracted files are stored stripped, so compare the same way
+        if old.strip() == content.strip():
+            print(f"➖ Unchanged: {rel_path}")
+            continue
+
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        tmp_path = full_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, full_path)
+        changed.append(rel_path)
+        diff_parts.extend(difflib.unified_diff(
+            old.splitlines(), content.splitlines(),
+            fromfile=f"a/{rel_path}", tofile=f"b/{rel_path}", lineterm=""))
+        print(f"✏️ Updated: {rel_path}")
+    return changed, "\n".join(diff_parts) + ("\n" if diff_parts else "")
+
+
+def update_project(project_dir, change_request, files=None):
+    """
+    Regenerates only the parts of an existing Results project that the change
+    request touches. The update's request, diff and metrics are kept in
+    <project>/.history/update_<timestamp>/.
+    `files` ({rel_path: content}) overrides the automatic context selection.
+    """
+    if files is None:
+        files = select_relevant_files(project_dir, change_request)
+    if files:
+        existing_files = render_files(files)
+    else:
+        # Nothing matched: show the layout only, the coder creates what it needs
+        existing_files = "Project files: " + ", ".join(list_project_files(project_dir))
+    print(f"📎 Context files: {', '.join(files) or 'none'}")
+
+    tracer = RunTracer(change_request, task_names=("update_task",))
+    with tracer.step("crew_setup"):
+        from agentic_code.crew_pool import get_crew_factory
+
+        crew_instance = get_crew_factory().new_base().update_crew()
+    crew_instance.task_callback = tracer.task_completed
+    with tracer.activate():
+        result = crew_instance.kickoff(inputs={
+            "topic": change_request,
+            "design": previous_design(project_dir),
+            "existing_files": existing_files,
+        })
+
+    with tracer.step("apply"):
+        changed, diff_text = apply_update(project_dir, str(result))
+
+    history_dir = os.path.join(project_dir, ".history", datetime.now().strftime("update_%Y%m%d_%H%M%S"))
+    os.makedirs(history_dir, exist_ok=True)
+    with open(os.path.join(history_dir, "request.txt"), "w", encoding="utf-8") as f:
+        f.write(change_request)
+    with open(os.path.join(history_dir, "changes.diff"), "w", encoding="utf-8") as f:
+        f.write(diff_text)
+    tracer.extra["context_files"] = list(files)
+    tracer.extra["changed_files"] = changed
+    tracer.write(history_dir)
+    return changed
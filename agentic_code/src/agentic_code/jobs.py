@@ -0,0 +1,142 @@
+import queue
+import threading
+import time
+import uuid
+
+from agentic_code.live import TokenBuffer
+
+# Sequential order of the crew's tasks (see config/tasks.yaml)
+TASK_ORDER = ("coding_task", "review_task")
+
+
+class QueueFull(Exception):
+    """Raised by JobManager.submit when max_queue jobs are already waiting."""
+
+
+class Job:
+    """One queued crew run and its live per-task state."""
+
+    def __init__(self, prompt, project_dir, priority="interactive", profile=False):
+        self.id = uuid.uuid4().hex[:12]
+        self.prompt = prompt
+        self.project_dir = project_dir
+        self.priority = priority        # class at the LLM scheduler: interactive | batch
+        self.profile = profile          # sample where the run's time goes (agentic_code.profiling)
+        self.status = "queued"          # queued -> running -> done | failed
+        self.tasks = {name: "pending" for name in TASK_ORDER}
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.error = None
+        self.live = TokenBuffer()
+        self._next_task = 0
+
+    def task_completed(self, _output=None):
+        """Crew task_callback: marks the current task done and the next one running."""
+        if self._next_task < len(TASK_ORDER):
+            self.tasks[TASK_ORDER[self._next_task]] = "done"
+            self._next_task += 1
+        if self._next_task < len(TASK_ORDER):
+            self.tasks[TASK_ORDER[self._next_task]] = "running"
+
+    def snapshot(self):
+        return {
+            "id": self.id,
+            "prompt": self.prompt,
+            "project_dir": self.project_dir,
+            "priority": self.priority,
+            "profile": self.profile,
+            "status": self.status,
+            "tasks": dict(self.tasks),
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    Process-wide background runner for the Streamlit hub.
+
+    Jobs are queued and executed by daemon worker threads, so a script rerun
+    or a browser refresh never interrupts them; the UI only polls snapshots.
+    `run_job(job)` does the actual work and may call job.task_completed.
+    """
+
+    def __init__(self, run_job, workers=1, max_history=200, max_queue=0):
+        self._run_job = run_job
+        self._queue = queue.Queue(maxsize=max_queue)
+        self.workers = max(1, workers)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._max_history = max_history
+        for i in range(self.workers):
+            threading.Thread(target=self._worker, name=f"crew-job-{i}", daemon=True).start()
+
+    def submit(self, prompt, project_dir, priority="interactive", profile=False):
+        """
+        Queues a run and returns its job id immediately.
+        Raises QueueFull when the queue is bounded and full (backpressure).
+        """
+        job = Job(prompt, project_dir, priority, profile)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim_history()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            raise QueueFull(f"{self._queue.maxsize} jobs already queued") from None
+        return job.id
+
+    def get(self, job_id):
+        """Returns a status snapshot for `job_id`, or None if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.snapshot() if job else None
+
+    def list_jobs(self):
+        """Snapshots of all known jobs, newest first."""
+        with self._lock:
+            jobs = sorted(self._jobs.values(), key=lambda j: j.created, reverse=True)
+            return [job.snapshot() for job in jobs]
+
+    def live(self, job_id):
+        """Live token tail and per-agent rates of `job_id`, or None if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return job.live.snapshot() if job else None
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            job.status = "running"
+            job.started = time.time()
+            job.tasks[TASK_ORDER[0]] = "running"
+            try:
+                with job.live.activate():
+                    self._run_job(job)
+                job.status = "done"
+                # Cache hits finish without task callbacks
+                for name in TASK_ORDER:
+                    job.tasks[name] = "done"
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)
+                for name, state in job.tasks.items():
+                    if state == "running":
+                        job.tasks[name] = "failed"
+            finally:
+                job.finished = time.time()
+                self._queue.task_done()
+
+    def _trim_history(self):
+        finished = [j for j in self._jobs.values() if j.finished is not None]
+        finished.sort(key=lambda j: j.finished)
+        while len(self._jobs) > self._max_history and finished:
+            self._jobs.pop(finished.pop(0).id)
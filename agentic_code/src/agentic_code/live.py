@@ -0,0 +1,111 @@
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+_current = contextvars.ContextVar("agentic_token_buffer", default=None)
+
+
+def current_buffer():
+    """The TokenBuffer of the run executing in this context, if any."""
+    return _current.get()
+
+
+class TokenBuffer:
+    """
+    Bounded tail of the tokens a run is generating, plus live per-agent rates.
+
+    The LLM adapter feeds it from the worker thread; the UI reads snapshots
+    at its own pace. Only the last `max_chars` characters are kept, so a long
+    generation never grows memory or the rendered panel.
+    """
+
+    def __init__(self, max_chars=6000):
+        self.max_chars = max_chars
+        self._chunks = deque()
+        self._chars = 0
+        self._agents = {}
+        self._lock = threading.Lock()
+        self.version = 0
+        self.total_chars = 0
+
+    @contextmanager
+    def activate(self):
+        """Makes this buffer receive the tokens of LLM calls made inside the block."""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    # --- PRODUCER SIDE (LLM adapter) ---
+
+    def call_started(self, agent):
+        with self._lock:
+            stats = self._agents.setdefault(agent, {"tokens": 0, "calls": 0, "first_token_s": None,
+                                                    "active_s": 0.0})
+            stats["calls"] += 1
+            stats["state"] = "prefill"
+            stats["_call_start"] = time.perf_counter()
+            stats["_first_token"] = None
+            stats["_call_tokens"] = 0
+
+    def feed(self, agent, text):
+        now = time.perf_counter()
+        with self._lock:
+            stats = self._agents.get(agent)
+            if stats is not None:
+                if stats["_first_token"] is None:
+                    stats["_first_token"] = now
+                    stats["first_token_s"] = round(now - stats["_call_start"], 3)
+                    stats["state"] = "generating"
+                stats["tokens"] += 1
+                stats["_call_tokens"] += 1
+                stats["_last_token"] = now
+            self._chunks.append(text)
+            self._chars += len(text)
+            self.total_chars += len(text)
+            while self._chars > self.max_chars and len(self._chunks) > 1:
+                self._chars -= len(self._chunks.popleft())
+            self.version += 1
+
+    def call_finished(self, agent, completion_tokens=None):
+        with self._lock:
+            stats = self._agents.get(agent)
+            if stats is None:
+                return
+            if stats["_first_token"] is not None:
+                stats["active_s"] += stats.get("_last_token", stats["_first_token"]) - stats["_first_token"]
+            if completion_tokens:
+                # Ollama's own count replaces the chunk count for finished calls
+                stats["tokens"] += completion_tokens - stats["_call_tokens"]
+            stats["state"] = "idle"
+            self._chunks.append("\n")
+            self._chars += 1
+            self.total_chars += 1
+            self.version += 1
+
+    # --- CONSUMER SIDE (UI) ---
+
+    def snapshot(self):
+        """
+        {'text': tail, 'version': n, 'total_chars': n, 'agents': {agent: stats}}
+        with live tokens/sec. total_chars lets readers send only what is new.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            agents = {}
+            for agent, stats in self._agents.items():
+                active_s = stats["active_s"]
+                if stats.get("state") == "generating" and stats["_first_token"] is not None:
+                    active_s += now - stats["_first_token"]
+                agents[agent] = {
+                    "state": stats.get("state", "idle"),
+                    "calls": stats["calls"],
+                    "tokens": stats["tokens"],
+                    "first_token_s": stats["first_token_s"],
+                    "tokens_per_s": round(stats["tokens"] / active_s, 2) if active_s > 0 else None,
+                }
+            return {"text": "".join(self._chunks), "version": self.version,
+                    "total_chars": self.total_chars, "agents": agents}
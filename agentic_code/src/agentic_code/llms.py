@@ -0,0 +1,142 @@
+import os
+import threading
+import time
+
+# Native Ollama endpoint (ChatOllama talks to /api/chat, not the OpenAI /v1 shim)
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+
+# Using the exact names from your 'ollama list'
+CODER_MODEL = "qwen2.5-coder:7b"
+REVIEWER_MODEL = "llama3.2:latest"
+
+# High timeout for CPU-only inference on an i5-1235U
+LLM_TIMEOUT = 300
+
+# How long Ollama keeps a model resident after the last request
+KEEP_ALIVE = os.environ.get("AGENTIC_KEEP_ALIVE", "30m")
+
+_clients = {}
+_llms = {}
+_stats = {}
+_lock = threading.Lock()
+
+
+def model_names():
+    """Models behind the coder and reviewer agents, without importing any LLM client."""
+    return (CODER_MODEL, REVIEWER_MODEL)
+
+
+def get_client(model):
+    """
+    Returns the process-wide ChatOllama client for `model`, constructing it on first use.
+
+    Sharing one client per model keeps its HTTP connection pool alive across
+    crews and Streamlit reruns. langchain_ollama is only imported here, so
+    commands that never build a crew do not pay for it.
+    """
+    with _lock:
+        client = _clients.get(model)
+        if client is None:
+            from agentic_code.cassette import get_cassette
+
+            # Record/replay (AGENTIC_LLM_MODE): a replayed client never touches the network
+            cassette = get_cassette()
+            if cassette is not None and cassette.mode == "replay":
+                client = cassette.client(model)
+            else:
+                from langchain_ollama import ChatOllama
+
+                client = ChatOllama(
+                    model=model,
+                    base_url=OLLAMA_BASE_URL,
+                    keep_alive=KEEP_ALIVE,
+                    client_kwargs={"timeout": LLM_TIMEOUT},
+                )
+                if cassette is not None:
+                    client = cassette.client(model, client)
+            _clients[model] = client
+        return client
+
+
+def get_llm(model):
+    """Returns the shared CrewAI-facing LLM for `model` (see agentic_code.ollama_llm)."""
+    with _lock:
+        llm = _llms.get(model)
+        if llm is None:
+            from agentic_code.ollama_llm import OllamaLLM
+
+            llm = OllamaLLM(model)
+            _llms[model] = llm
+        return llm
+
+
+# --- PRE-WARMING ---
+
+def prewarm(models=None, keep_alive=KEEP_ALIVE):
+    """
+    Loads `models` into Ollama memory with an empty generate request.
+    Returns {model: seconds spent loading}; failures are reported, not raised.
+    """
+    from agentic_code.cassette import get_cassette
+
+    cassette = get_cassette()
+    if cassette is not None and cassette.mode == "replay":
+        return {}
+    from ollama import Client
+
+    client = Client(host=OLLAMA_BASE_URL, timeout=LLM_TIMEOUT)
+    loaded = {}
+    for model in models or model_names():
+        start = time.perf_counter()
+        try:
+            response = client.generate(model=model, prompt="", keep_alive=keep_alive)
+        except Exception as e:
+            print(f"⚠️ Pre-warm failed for {model}: {e}")
+            continue
+        load_s = (response.get("load_duration") or 0) / 1e9
+        loaded[model] = load_s
+        with _lock:
+            _stats.setdefault(model, _new_stats())["prewarm_load_s"] = round(load_s, 3)
+        print(f"🔥 Pre-warmed {model} in {time.perf_counter() - start:.1f}s (load {load_s:.1f}s)")
+    return loaded
+
+
+def prewarm_async(models=None, keep_alive=KEEP_ALIVE):
+    """Runs prewarm on a daemon thread so it overlaps with crew construction."""
+    thread = threading.Thread(target=prewarm, args=(models, keep_alive), name="ollama-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+# --- TIMINGS ---
+
+def _new_stats():
+    return {"requests": 0, "prewarm_load_s": None, "first_request": None}
+
+
+def record_timings(model, metadata, wall_s):
+    """
+    Records Ollama's server-side durations (nanoseconds) for one request.
+    The first request per process is kept separately: that is where a cold
+    model pays its load time.
+    """
+    timings = {
+        "wall_s": round(wall_s, 3),
+        "load_s": round((metadata.get("load_duration") or 0) / 1e9, 3),
+        "prompt_eval_s": round((metadata.get("prompt_eval_duration") or 0) / 1e9, 3),
+        "generation_s": round((metadata.get("eval_duration") or 0) / 1e9, 3),
+    }
+    with _lock:
+        stats = _stats.setdefault(model, _new_stats())
+        stats["requests"] += 1
+        if stats["first_request"] is None:
+            stats["first_request"] = timings
+            print(f"⏱️ {model} first request: load {timings['load_s']}s, "
+                  f"prompt {timings['prompt_eval_s']}s, generation {timings['generation_s']}s")
+    return timings
+
+
+def llm_stats():
+    """Per-model request counts, pre-warm load time and first-request breakdown."""
+    with _lock:
+        return {model: dict(stats) for model, stats in _stats.items()}
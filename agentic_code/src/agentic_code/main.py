@@ -1,57 +1,70 @@
 import os
-import re
+import sys
 from datetime import datetime
 from pathlib import Path
-from agentic_code.crew import AgenticCodeCrew
+from agentic_code.archive import index_project
+from agentic_code.batch import load_prompts, run_batch
+from agentic_code.blobs import absorb_project, save_raw_output
+from agentic_code.cache import ResultCache, make_cache_key
+from agentic_code.checkpoint import RunCheckpoint, list_runs
+from agentic_code.crew_pool import get_crew_factory
+from agentic_code.fanout import GENERATION_MODE, generate_files
+from agentic_code.incremental import update_project
+from agentic_code.jobs import TASK_ORDER
+from agentic_code.llms import model_names, prewarm_async
+from agentic_code.markers import iter_file_blocks
+from agentic_code.profiling import SamplingProfiler, print_report
+from agentic_code.retrieval import build_context
+from agentic_code.scheduler import request_context
+from agentic_code.storage import ProjectWriter, remove_stale_staging
+from agentic_code.streaming import stream_files_to
+from agentic_code.tracing import RunTracer
+from agentic_code.validation import validate_and_repair, validate_project
 
-def extract_and_save_files(result_text, project_name):
+def extract_and_save_files(result_text, project_name, durability=None):
     """
     Robust extraction engine to parse agent output and rebuild project structure.
+    `durability` is one of storage.DURABILITY_MODES (default: AGENTIC_DURABILITY).
     """
     # 1. Setup Base Path
     results_base = os.path.join("Results", project_name)
-    os.makedirs(results_base, exist_ok=True)
     
     # 2. Extract content starting from the first valid marker
     start_index = result_text.find("--- FILE:")
     if start_index == -1:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filepath = os.path.join("Results", f"raw_output_{timestamp}.txt")
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(result_text)
+        os.makedirs(results_base, exist_ok=True)
+        filepath = save_raw_output("Results", result_text)
         print(f"⚠️ No markers found. Saved raw text to: {filepath}")
         return
 
     clean_text = result_text[start_index:]
 
-    # 3. Universal Regex: Captures filename and code content up to the next marker
-    #
-    pattern = r'--- FILE:\s*(.*?)\s*---\s*(.*?)(?=\s*--- FILE:|$)'
-    matches = re.findall(pattern, clean_text, re.DOTALL)
+    # 3. Stage the whole project next to its final folder
+    writer = ProjectWriter(results_base, durability)
+    try:
+        # 4. Single-pass scanner: captures filename and cleaned code content up to the next marker
+        for rel_path, clean_content in iter_file_blocks(clean_text):
+            try:
+                writer.write(rel_path, clean_content)
+                print(f"✅ Created: {rel_path}")
+            except Exception as e:
+                print(f"❌ Error writing {rel_path}: {e}")
 
-    for rel_path, content in matches:
-        # Normalize paths for Windows/Linux compatibility
-        rel_path = rel_path.strip().replace('\\', '/')
-        
-        # 4. Content Cleaning (Removes markdown artifacts)
-        clean_content = content.strip()
-        if clean_content.startswith("```"):
-            clean_content = re.sub(r'^```[a-zA-Z0-9]*\n', '', clean_content)
-            clean_content = re.sub(r'```$', '', clean_content)
-
-        # 5. Atomic Write to Disk
-        full_path = os.path.join(results_base, rel_path)
-        os.makedirs(os.path.dirname(full_path), exist_ok=True)
-        
-        try:
-            with open(full_path, "w", encoding="utf-8") as f:
-                f.write(clean_content.strip())
-                f.flush()
-                os.fsync(f.fileno()) # Force write to D: drive immediately
-            print(f"✅ Created: {rel_path}")
-        except Exception as e:
-            print(f"❌ Error writing {rel_path}: {e}")
+        stabilize_project(writer.root)
 
+        # 5. Content-addressed storage: repeated files become links to one stored copy
+        absorb_project(writer.root)
+
+        # 6. Atomic Commit: one flush, then a single rename into Results/
+        writer.commit()
+    except BaseException:
+        writer.abort()
+        raise
+
+def stabilize_project(results_base):
+    """
+    Post-extraction fixes shared by the one-shot and streaming extractors.
+    """
     # --- AUTO-STABILIZATION ---
     # Ensure src is a valid Python package
     src_dir = os.path.join(results_base, "src")
@@ -71,7 +84,203 @@ def extract_and_save_files(result_text, project_name):
             f.write("pandas\nstreamlit\nplotly\nmatplotlib\n")
         print("🛠️ Environment Fix: Added fallback requirements.txt")
 
+def run_topic(topic, results_base, cache=None, stream=True, task_callback=None, checkpoint=None,
+              priority="interactive", profile=False, fanout=None):
+    """
+    Runs the crew for one topic and unpacks the files into `results_base`.
+    Returns the raw crew output. Repeated topics are served from `cache`.
+    Concurrent callers pass stream=False: stream chunks are not tagged per run.
+    `task_callback` is called with each TaskOutput as the crew's tasks finish.
+    With a RunCheckpoint, finished task outputs are saved and reused on resume.
+    `priority` ("interactive" or "batch") is the run's class at the LLM scheduler.
+    Timings are written to `results_base`/metrics.json; with `profile`, a
+    sampling profile splits them into LLM wait and host time per phase.
+    `fanout` generates the files one crew per file after the design
+    (default: AGENTIC_GENERATION=fanout).
+    """
+    # extract_and_save_files only prefixes Results/ onto relative names
+    results_base = os.path.abspath(results_base)
+    if fanout is None:
+        fanout = GENERATION_MODE == "fanout"
+    profiler = SamplingProfiler().start() if profile else None
+    try:
+        with request_context(os.path.basename(results_base), priority):
+            return _run_topic(topic, results_base, cache, stream, task_callback, checkpoint, profiler, fanout)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+
+def _finish_run(tracer, results_base, profiler):
+    """Writes metrics.json (with the profile, if any) and indexes the project."""
+    tracer.extra["models"] = list(model_names())
+    if profiler is not None:
+        profiler.stop()
+        tracer.extra["profile"] = profiler.write(results_base)
+        print_report(tracer.extra["profile"])
+    tracer.write(results_base)
+    index_project(results_base)
+
+def _run_topic(topic, results_base, cache, stream, task_callback, checkpoint, profiler, fanout):
+    completed = checkpoint.completed() if checkpoint is not None else {}
+    remaining = [name for name in TASK_ORDER if name not in completed]
+    tracer = RunTracer(topic, task_names=remaining)
+    tracer.extra["resumed_tasks"] = list(completed)
+    if profiler is not None:
+        profiler.tracer = tracer
+
+    key = None
+    if cache is not None:
+        # Retrieval context is left out: it indexes earlier Results/ projects,
+        # so a repeated topic would never hit
+        key = make_cache_key(topic, model_names(), "fanout" if fanout else "single")
+        cached = cache.get(key)
+        if cached is not None:
+            print("⚡ Cache hit: reusing a previous crew output")
+            with tracer.step("extraction"):
+                extract_and_save_files(cached, results_base)
+            with tracer.step("validation"):
+                tracer.extra["validation"] = _validation_summary(validate_and_repair(results_base))
+            tracer.extra["blobs"] = absorb_project(results_base)
+            tracer.extra["cache_hit"] = True
+            _finish_run(tracer, results_base, profiler)
+            if checkpoint is not None:
+                checkpoint.update(status="done")
+            return cached
+
+    extractor = None
+    try:
+        if remaining:
+            result_text, extractor = _kickoff(topic, results_base, tracer, completed,
+                                              stream, task_callback, checkpoint, fanout)
+        else:
+            # Every task is checkpointed: the last output is the final answer
+            result_text, extractor = completed[TASK_ORDER[-1]], None
+
+        print("\n[📦] Unpacking code structure...")
+        with tracer.step("extraction"):
+            if extractor is not None and extractor.found_markers and extractor.matches(result_text):
+                # Streamed into staging: same fixes, dedupe and atomic rename as extract_and_save_files
+                stabilize_project(extractor.root)
+                absorb_project(extractor.root)
+                extractor.commit()
+            else:
+                if extractor is not None:
+                    if extractor.found_markers:
+                        print("⚠️ Streamed files differ from the final answer: extracting it again")
+                    extractor.abort()
+                # Model did not stream (or streamed other iterations); parse the final answer
+                extract_and_save_files(result_text, results_base)
+        with tracer.step("validation"):
+            report = validate_and_repair(results_base)
+            tracer.extra["validation"] = _validation_summary(report)
+        # Repaired files are deduped here; extracted ones already were
+        tracer.extra["blobs"] = absorb_project(results_base)
+    except Exception as e:
+        if extractor is not None:
+            # Drops the staging folder of a stream that never got committed
+            extractor.abort()
+        if checkpoint is not None:
+            checkpoint.update(status="failed", error=str(e))
+            print(f"💾 Progress kept. Resume with: replay {checkpoint.run_id}")
+        raise
+
+    # Only output that validated as generated is cached; a repaired or broken
+    # project would be served (and repaired again) on every repeat
+    if cache is not None and report["ok"] and not report["repair_passes"]:
+        cache.put(key, result_text)
+    if checkpoint is not None:
+        checkpoint.update(status="done", error=None)
+    _finish_run(tracer, results_base, profiler)
+    return result_text
+
+def _validation_summary(report):
+    return {"ok": report["ok"], "failing": report["failing"], "files": len(report["files"])}
+
+def _kickoff(topic, results_base, tracer, completed, stream, task_callback, checkpoint, fanout=False):
+    """Builds the crew (skipping checkpointed tasks) and runs it. Returns (raw output, extractor)."""
+    # Relevant notes and snippets from knowledge/ and earlier projects
+    with tracer.step("retrieval"):
+        try:
+            context, tracer.extra["retrieval"] = build_context(topic, results_base)
+        except Exception as e:
+            print(f"⚠️ Retrieval skipped: {e}")
+            context = ""
+    inputs = {'topic': topic, 'context': context or "No related notes."}
+
+    def _on_task_done(output):
+        tracer.task_completed(output)
+        if checkpoint is not None:
+            checkpoint.task_completed(output)
+        if task_callback is not None:
+            task_callback(output)
+
+    if fanout:
+        return _kickoff_fanout(inputs, tracer, completed, _on_task_done), None
+
+    # Trigger CrewAI, writing files as the coder agent streams them. Fresh
+    # runs borrow a pre-built crew from the pool; the framework is only
+    # imported when the first crew is built.
+    factory = get_crew_factory()
+    with tracer.step("crew_setup"):
+        if completed:
+            crew_instance, generation = factory.new_base().resume_crew(completed), None
+        else:
+            crew_instance, generation = factory.acquire()
+    tracer.extra["crew_pool"] = factory.stats()
+
+    crew_instance.task_callback = _on_task_done
+    with tracer.activate():
+        if stream:
+            with stream_files_to(results_base) as extractor:
+                result = crew_instance.kickoff(inputs=inputs)
+        else:
+            extractor = None
+            result = crew_instance.kickoff(inputs=inputs)
+    # A crew that raised is dropped rather than pooled
+    if generation is not None:
+        factory.release(crew_instance, generation)
+    return str(result), extractor
+
+def _kickoff_fanout(inputs, tracer, completed, on_task_done):
+    """
+    Fan-out mode: the design task runs as usual, then every file is generated
+    by its own crew concurrently (agentic_code.fanout). Returns the merged output.
+    """
+    from types import SimpleNamespace
+
+    factory = get_crew_factory()
+    with tracer.activate():
+        design = completed.get("coding_task")
+        if design is None:
+            with tracer.step("crew_setup"):
+                design_crew = factory.new_base().design_crew()
+            design_crew.task_callback = on_task_done
+            design = str(design_crew.kickoff(inputs=inputs))
+        result_text, tracer.extra["fanout"] = generate_files(
+            inputs["topic"], design, lambda: factory.new_base().file_crew(design))
+    # The merged files stand in for review_task's output (checkpoint, job state)
+    on_task_done(SimpleNamespace(name="review_task", raw=result_text))
+    return result_text
+
+def job_runner(root_path, cache=None):
+    """
+    run_job callable for a JobManager (hub and HTTP service): runs the job's
+    prompt into its project folder with a checkpoint under `root_path`.
+    """
+    def run_job(job):
+        checkpoint = RunCheckpoint.start(job.prompt, job.project_dir, os.path.join(root_path, ".checkpoints"))
+        return run_topic(job.prompt, job.project_dir, cache=cache, stream=False,
+                         task_callback=job.task_completed, checkpoint=checkpoint, priority=job.priority,
+                         profile=job.profile)
+    return run_job
+
 def run():
+    """
+    Runs task_input.txt once: `run [--profile] [--fanout]`.
+    --profile samples where the time goes; --fanout generates the files in parallel.
+    """
+    profile = "--profile" in sys.argv[1:]
+    fanout = True if "--fanout" in sys.argv[1:] else None
     print("\n" + "="*40)
     print("🚀 UNIVERSAL AGENTIC ENGINE STANDBY")
     print("="*40)
@@ -89,21 +298,421 @@ def run():
         return
 
     print(f"\n[Running Task]: {user_task}")
+
+    # Load both models into Ollama while the crew is being assembled
+    prewarm_async()
+    remove_stale_staging("Results")
     
     try:
-        # Trigger CrewAI
-        crew_instance = AgenticCodeCrew().crew()
-        result = crew_instance.kickoff(inputs={'topic': user_task})
-        
         # Generate unique folder
         project_id = datetime.now().strftime("Project_%Y%m%d_%H%M%S")
-        
-        print("\n[📦] Unpacking code structure...")
-        extract_and_save_files(str(result), project_id)
+        results_base = os.path.join("Results", project_id)
+
+        checkpoint = RunCheckpoint.start(user_task, results_base)
+        run_topic(user_task, results_base, cache=ResultCache(), checkpoint=checkpoint, profile=profile,
+                  fanout=fanout)
         print(f"\n🏁 Project Complete! Path: Results/{project_id}")
         
     except Exception as e:
         print(f"❌ Critical Failure in Crew Execution: {e}")
 
+def batch():
+    """
+    Runs many prompts concurrently: `batch <file-or-dir> [--workers N] [--timeout S]`.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="batch", description="Run a queue of prompts through the crew.")
+    parser.add_argument("source", help="File with one prompt per line, or a directory of *.txt prompts")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("AGENTIC_BATCH_WORKERS", "2")))
+    parser.add_argument("--timeout", type=float, default=None, help="Per-job timeout in seconds")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the crew")
+    args = parser.parse_args(sys.argv[1:])
+
+    if not os.path.exists(args.source):
+        print(f"[!] Missing {args.source}.")
+        return
+
+    prompts = load_prompts(args.source)
+    if not prompts:
+        print(f"[!] No prompts found in {args.source}.")
+        return
+
+    cache = None if args.no_cache else ResultCache()
+    prewarm_async()
+    print(f"\n🚀 Batch: {len(prompts)} prompts on {args.workers} workers")
+    return run_batch(
+        prompts,
+        lambda prompt, results_base: run_topic(prompt, results_base, cache=cache, stream=False,
+                                               checkpoint=RunCheckpoint.start(prompt, results_base),
+                                               priority="batch"),
+        workers=args.workers,
+        timeout=args.timeout,
+    )
+
+def train():
+    """
+    Trains the crew with human feedback: `train <n_iterations> <filename> [topic]`.
+    The topic defaults to task_input.txt.
+    """
+    if len(sys.argv) < 3 or not sys.argv[1].isdigit():
+        print("[!] Usage: train <n_iterations> <filename> [topic]")
+        return
+    topic = " ".join(sys.argv[3:]).strip()
+    if not topic and os.path.exists("task_input.txt"):
+        with open("task_input.txt", "r", encoding="utf-8") as f:
+            topic = f.read().strip()
+    if not topic:
+        print("[!] No topic given and task_input.txt is empty.")
+        return
+
+    from agentic_code.crew import AgenticCodeCrew
+
+    try:
+        AgenticCodeCrew().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2],
+                                       inputs={"topic": topic, "context": "No related notes."})
+    except Exception as e:
+        print(f"❌ An error occurred while training the crew: {e}")
+
+def replay():
+    """
+    Resumes a checkpointed run from its first incomplete task: `replay [run_id]`.
+    Without a run id the newest unfinished run is resumed; `replay --list` shows all runs.
+    """
+    args = sys.argv[1:]
+    if args and args[0] == "--list":
+        for meta in list_runs():
+            done = ", ".join(meta["completed"]) or "-"
+            print(f"{meta['run_id']:<28} {meta['status']:<8} done: {done:<26} {meta['topic'][:40]}")
+        return
+
+    if args:
+        checkpoint = RunCheckpoint.load(args[0])
+        if checkpoint is None:
+            print(f"[!] Unknown run {args[0]}. Use 'replay --list' to see checkpointed runs.")
+            return
+    else:
+        unfinished = [meta for meta in list_runs() if meta["status"] != "done"]
+        if not unfinished:
+            print("[!] No unfinished runs to replay.")
+            return
+        checkpoint = RunCheckpoint.load(unfinished[0]["run_id"])
+
+    meta = checkpoint.meta()
+    reused = list(checkpoint.completed())
+    print(f"\n[Replaying {checkpoint.run_id}]: {meta['topic']}")
+    print(f"♻️ Reusing checkpointed tasks: {', '.join(reused) or 'none'}")
+
+    prewarm_async()
+    try:
+        run_topic(meta["topic"], meta["results_base"], cache=ResultCache(), checkpoint=checkpoint)
+        print(f"\n🏁 Project Complete! Path: {meta['results_base']}")
+    except Exception as e:
+        print(f"❌ Critical Failure in Crew Execution: {e}")
+
+def update():
+    """
+    Applies a change request to an existing project: `agentic_update <project> [request]`.
+    The request defaults to the contents of task_input.txt.
+    """
+    args = sys.argv[1:]
+    if not args:
+        print("[!] Usage: agentic_update <Results/Project_...> [change request]")
+        return
+
+    project_dir = args[0]
+    if not os.path.isdir(project_dir):
+        project_dir = os.path.join("Results", args[0])
+    if not os.path.isdir(project_dir):
+        print(f"[!] Unknown project {args[0]}.")
+        return
+
+    change_request = " ".join(args[1:]).strip()
+    if not change_request and os.path.exists('task_input.txt'):
+        with open('task_input.txt', 'r', encoding="utf-8") as f:
+            change_request = f.read().strip()
+    if not change_request:
+        print("[!] No change request given.")
+        return
+
+    print(f"\n[Updating {project_dir}]: {change_request}")
+    prewarm_async()
+    try:
+        changed = update_project(project_dir, change_request)
+        absorb_project(project_dir)
+        index_project(project_dir)
+        print(f"\n🏁 Update Complete! {len(changed)} file(s) changed in {project_dir}")
+    except Exception as e:
+        print(f"❌ Critical Failure in Crew Execution: {e}")
+
+def validate():
+    """
+    Validates an existing project: `agentic_validate <project> [--repair]`.
+    Only --repair calls the model, and only for the failing files.
+    """
+    args = [a for a in sys.argv[1:] if a != "--repair"]
+    if not args:
+        print("[!] Usage: agentic_validate <Results/Project_...> [--repair]")
+        return
+
+    project_dir = args[0]
+    if not os.path.isdir(project_dir):
+        project_dir = os.path.join("Results", args[0])
+    if not os.path.isdir(project_dir):
+        print(f"[!] Unknown project {args[0]}.")
+        return
+
+    if "--repair" in sys.argv:
+        prewarm_async()
+        report = validate_and_repair(project_dir)
+        absorb_project(project_dir)
+    else:
+        report = validate_project(project_dir)
+    index_project(project_dir)
+    print("✅ All files passed." if report["ok"] else f"❌ Failing: {', '.join(report['failing'])}")
+    sys.exit(0 if report["ok"] else 1)
+
+def serve():
+    """
+    Starts the local HTTP job service: `agentic_serve [--host H] [--port P] [--workers N] [--max-queue Q]`.
+    Workers cap concurrent crews (and so Ollama load); a full queue answers 429.
+    """
+    import argparse
+    import asyncio
+
+    from agentic_code.jobs import JobManager
+    from agentic_code.service import JobService, serve as serve_http
+
+    parser = argparse.ArgumentParser(prog="agentic_serve", description="Serve the crew over a local HTTP API.")
+    parser.add_argument("--host", default=os.environ.get("AGENTIC_SERVICE_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("AGENTIC_SERVICE_PORT", "8765")))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("AGENTIC_SERVICE_WORKERS", "1")))
+    parser.add_argument("--max-queue", type=int, default=int(os.environ.get("AGENTIC_SERVICE_MAX_QUEUE", "8")))
+    args = parser.parse_args(sys.argv[1:])
+
+    prewarm_async()
+    remove_stale_staging("Results")
+    root_path = os.getcwd()
+    manager = JobManager(job_runner(root_path, ResultCache()), workers=args.workers, max_queue=args.max_queue)
+    service = JobService(manager, os.path.join(root_path, "Results"), max_queue=args.max_queue)
+    try:
+        asyncio.run(serve_http(service, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n🏁 Service stopped.")
+
+def gc():
+    """
+    Reclaims Results/ space: `agentic_gc [--dry-run] [--min-age S]`.
+    Dedupes projects into the blob store, gzips old raw outputs, deletes
+    blobs no project uses any more and stale staging folders.
+    """
+    import argparse
+
+    from agentic_code.blobs import GC_MIN_AGE_S, BlobStore, compress_raw_outputs
+
+    parser = argparse.ArgumentParser(prog="agentic_gc", description="Deduplicate and clean up Results/.")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be removed.")
+    parser.add_argument("--min-age", type=float, default=GC_MIN_AGE_S,
+                        help="Keep unused blobs younger than this many seconds.")
+    parser.add_argument("--results", default="Results")
+    args = parser.parse_args(sys.argv[1:])
+    if not os.path.isdir(args.results):
+        print(f"[!] No {args.results} folder.")
+        return
+
+    store = BlobStore(args.results)
+    # 1. Dedupe projects written before the store existed (already linked files are only hashed)
+    linked = saved = 0
+    if not args.dry_run:
+        for name in sorted(os.listdir(args.results)):
+            project_dir = os.path.join(args.results, name)
+            if name.startswith("Project_") and os.path.isdir(project_dir):
+                stats = store.absorb(project_dir)
+                linked += stats["linked"]
+                saved += stats["saved_bytes"]
+        print(f"🔗 Deduped {linked} file(s), {saved / 1024:.1f} KB saved")
+
+    # 2. Compress raw fallback dumps
+    count, size = compress_raw_outputs(args.results, dry_run=args.dry_run)
+    print(f"🗜️ {'Would compress' if args.dry_run else 'Compressed'} {count} raw output(s) ({size / 1024:.1f} KB)")
+
+    # 3. Sweep unreferenced blobs and crashed staging folders
+    swept = store.gc(dry_run=args.dry_run, min_age_s=args.min_age)
+    verb = "Would remove" if args.dry_run else "Removed"
+    print(f"🧹 {verb} {swept['removed']} of {swept['blobs']} blob(s), {swept['freed_bytes'] / 1024:.1f} KB")
+    if not args.dry_run:
+        for name in remove_stale_staging(args.results):
+            print(f"🧹 Removed stale staging folder {name}")
+    stats = store.stats()
+    print(f"💾 Blob store ({stats['mode']}): {stats['blobs']} unique file(s), {stats['bytes'] / 1024:.1f} KB")
+
+FAKE_TOPIC = "Build a unit converter"
+
+
+def _fake_ollama():
+    """tests/fake_ollama.py of a source checkout, or None in an installed package."""
+    import importlib.util
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "tests", "fake_ollama.py")
+    if not os.path.exists(path):
+        return None
+    spec = importlib.util.spec_from_file_location("fake_ollama", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _test_runs(cassette, topic, runs, fanout):
+    """Runs the pipeline `runs` times through `cassette`. Returns [(digest, {path: sha256})]."""
+    import shutil
+    import tempfile
+    import time
+
+    from agentic_code.budget import estimator
+    from agentic_code.cassette import project_digest
+
+    workdir = tempfile.mkdtemp(prefix="agentic-test-")
+    digests = []
+    try:
+        for i in range(runs):
+            # Every run starts from the same state: its own Results root, knowledge
+            # dir and retrieval index (so earlier runs are never retrieved as
+            # context), the first recorded answers and an uncalibrated estimator
+            run_dir = os.path.join(workdir, f"run_{i + 1:02d}")
+            os.environ["AGENTIC_KNOWLEDGE_DIR"] = os.path.join(run_dir, "knowledge")
+            os.environ["AGENTIC_RETRIEVAL_DB"] = os.path.join(run_dir, ".cache", "retrieval.sqlite")
+            cassette.rewind()
+            estimator.reset()
+            results_base = os.path.join(run_dir, "Results", "Project_test")
+            stream = i % 2 == 0
+            start = time.perf_counter()
+            run_topic(topic, results_base, cache=None, stream=stream, fanout=fanout)
+            digest, files = project_digest(results_base)
+            digests.append((digest, files))
+            print(f"🔎 Run {i + 1}/{runs} ({'streaming' if stream else 'one-shot'} extraction): "
+                  f"{len(files)} file(s) in {time.perf_counter() - start:.2f}s, digest {digest[:12]}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return digests
+
+
+def test():
+    """
+    Offline pipeline test on recorded LLM answers:
+    `test [--record] [--fake] [--cassette PATH] [--runs N] [topic]`.
+    --record runs the topic once and saves every LLM call, against Ollama or
+    (--fake) tests/fake_ollama.py. Without it the cassette is replayed with no
+    network, alternating the streaming and one-shot extractors, and every run
+    must produce the same files as the recording. A missing cassette is first
+    recorded against the fake server.
+    """
+    import argparse
+
+    from agentic_code import llms
+    from agentic_code.cassette import DEFAULT_CASSETTE, Cassette, use_cassette
+
+    parser = argparse.ArgumentParser(prog="test", description="Record or replay the pipeline offline.")
+    parser.add_argument("topic", nargs="*", help="Topic to record (default: task_input.txt).")
+    parser.add_argument("--record", action="store_true", help="Call the LLM server and (re)write the cassette.")
+    parser.add_argument("--fake", action="store_true", help="Record against tests/fake_ollama.py instead of Ollama.")
+    parser.add_argument("--cassette", default=DEFAULT_CASSETTE)
+    parser.add_argument("--runs", type=int, default=2, help="Replayed runs to compare.")
+    args = parser.parse_args(sys.argv[1:])
+
+    topic = " ".join(args.topic).strip()
+    if topic and not args.record:
+        print("[!] A topic is only used when recording: test --record [--fake] <topic>")
+        sys.exit(1)
+    if not args.record and not os.path.exists(args.cassette):
+        print(f"📼 No cassette at {args.cassette}: recording one against the fake Ollama server first")
+        args.record = args.fake = True
+    if args.record and not topic:
+        if args.fake:
+            topic = FAKE_TOPIC
+        elif os.path.exists("task_input.txt"):
+            with open("task_input.txt", "r", encoding="utf-8") as f:
+                topic = f.read().strip()
+    if args.record and not topic:
+        print("[!] Usage: test --record <topic> (or fill task_input.txt)")
+        sys.exit(1)
+
+    # 1. Same prompts on every host: no workspace tools, fresh knowledge and Results per run
+    os.environ["AGENTIC_AGENT_TOOLS"] = "0"
+    cassette = Cassette(args.cassette, mode="record" if args.record else "replay", reset=args.record)
+    use_cassette(cassette)
+    fanout = cassette.meta.get("generation", GENERATION_MODE) == "fanout"
+
+    # 2. Recording: one live run, its project digest is what replays must match
+    if args.record:
+        fake = None
+        if args.fake:
+            fake_ollama = _fake_ollama()
+            if fake_ollama is None:
+                print("[!] tests/fake_ollama.py not found; record against Ollama with: test --record <topic>")
+                sys.exit(1)
+            fake = fake_ollama.FakeOllamaServer(tokens_per_second=0).start()
+            llms.OLLAMA_BASE_URL = fake.base_url
+        try:
+            digest, files = _test_runs(cassette, topic, 1, fanout)[0]
+        finally:
+            if fake is not None:
+                fake.stop()
+        cassette.meta = {"topic": topic, "digest": digest, "files": files, "models": list(model_names()),
+                         "generation": "fanout" if fanout else "single", "server": "fake" if fake else "ollama",
+                         "recorded_at": datetime.now().isoformat(timespec="seconds")}
+        cassette.save()
+        print(f"💾 Recorded {cassette.recorded} LLM call(s) to {args.cassette}")
+        if fake is None:
+            return
+        # A fake recording is replayed right away; the clients built while
+        # recording serve from the same cassette from here on
+        cassette.mode = "replay"
+
+    # 3. Determinism: every replay matches the recording file by file
+    runs = max(1, args.runs)
+    digests = _test_runs(cassette, cassette.meta.get("topic", ""), runs, fanout)
+    expected = cassette.meta.get("files", {})
+    failures = 0
+    for i, (digest, files) in enumerate(digests, start=1):
+        if digest == cassette.meta.get("digest"):
+            continue
+        failures += 1
+        changed = sorted(p for p in set(files) | set(expected) if files.get(p) != expected.get(p))
+        print(f"❌ Run {i} differs from the recording: {', '.join(changed)}")
+    if failures:
+        sys.exit(1)
+    print(f"✅ {runs} replayed run(s) match the recording ({cassette.hits} LLM call(s) served offline)")
+
+def run_with_trigger():
+    """
+    Runs the crew once from a JSON trigger payload: `run_with_trigger '{"topic": "..."}'`.
+    "prompt" is accepted as well as "topic".
+    """
+    import json
+
+    if len(sys.argv) < 2:
+        print("[!] Usage: run_with_trigger '{\"topic\": \"...\"}'")
+        return
+    try:
+        payload = json.loads(sys.argv[1])
+    except ValueError as e:
+        print(f"[!] Trigger payload is not valid JSON: {e}")
+        return
+    topic = str(payload.get("topic") or payload.get("prompt") or "").strip() if isinstance(payload, dict) else ""
+    if not topic:
+        print("[!] Trigger payload has no 'topic'.")
+        return
+
+    print(f"\n[Running Triggered Task]: {topic}")
+    prewarm_async()
+    project_id = datetime.now().strftime("Project_%Y%m%d_%H%M%S")
+    results_base = os.path.join("Results", project_id)
+    try:
+        run_topic(topic, results_base, cache=ResultCache(),
+                  checkpoint=RunCheckpoint.start(topic, results_base))
+        print(f"\n🏁 Project Complete! Path: Results/{project_id}")
+    except Exception as e:
+        print(f"❌ Critical Failure in Crew Execution: {e}")
+
 if __name__ == "__main__":
     run()
\ No newline at end of file
@@ -0,0 +1,48 @@
+import re
+
+MARKER = "--- FILE:"
+HEADER_END = "---"
+FENCE = "```"
+
+_LANG_TAG = re.compile(r'[a-zA-Z0-9]*')
+
+
+def clean_block_content(content):
+    """
+    Removes markdown artifacts from one file block: surrounding whitespace,
+    an opening ```lang line and a closing ``` fence.
+    """
+    clean_content = content.strip()
+    if clean_content.startswith(FENCE):
+        tag_end = _LANG_TAG.match(clean_content, len(FENCE)).end()
+        if clean_content[tag_end:tag_end + 1] == "\n":
+            clean_content = clean_content[tag_end + 1:]
+        if clean_content.endswith(FENCE):
+            clean_content = clean_content[:-len(FENCE)]
+    return clean_content.strip()
+
+
+def iter_file_blocks(text):
+    """
+    Single-pass scanner for '--- FILE: path ---' blocks.
+
+    Yields (rel_path, clean_content) in order of appearance, exactly like the
+    former `--- FILE:\\s*(.*?)\\s*---\\s*(.*?)(?=\\s*--- FILE:|$)` DOTALL regex:
+    a header runs to the first '---' after the marker and a body runs to the
+    next marker. Every position is visited a bounded number of times, so the
+    cost is linear in len(text) however dense or malformed the markers are.
+    Duplicate paths are yielded again; the last one wins on disk.
+    """
+    pos = text.find(MARKER)
+    while pos != -1:
+        name_start = pos + len(MARKER)
+        name_end = text.find(HEADER_END, name_start)
+        if name_end == -1:
+            return
+        body_start = name_end + len(HEADER_END)
+        next_pos = text.find(MARKER, body_start)
+        body = text[body_start:] if next_pos == -1 else text[body_start:next_pos]
+        # Normalize paths for Windows/Linux compatibility
+        rel_path = text[name_start:name_end].strip().replace('\\', '/')
+        yield rel_path, clean_block_content(body)
+        pos = next_pos
@@ -0,0 +1,87 @@
+import time
+
+from crewai import BaseLLM
+from crewai.events import LLMStreamChunkEvent, crewai_event_bus
+
+from agentic_code.budget import estimator, fit_messages
+from agentic_code.live import current_buffer
+from agentic_code.llms import get_client, record_timings
+from agentic_code.profiling import tag_blocking
+from agentic_code.scheduler import get_scheduler
+from agentic_code.streaming import stream_requested
+from agentic_code.tracing import current_tracer
+
+
+class OllamaLLM(BaseLLM):
+    """
+    CrewAI LLM backed by the shared ChatOllama client for one model.
+
+    CrewAI would otherwise turn a ChatOllama into its own LiteLLM client and
+    reconnect per crew. Routing calls through agentic_code.llms keeps the
+    connection pool and the model keep-alive, and exposes Ollama's
+    load/prompt/generation timings.
+    """
+
+    def __init__(self, model, temperature=None, stream=False):
+        super().__init__(model=model, temperature=temperature)
+        self.stream = stream
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, **kwargs):
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+
+        task_name = getattr(from_task, "name", None)
+        messages, budget = fit_messages(messages, task_name, self.model)
+
+        # Every call waits for its turn at the scheduler (per-model limits, priorities)
+        with get_scheduler().slot(self.model) as scheduler_wait_s:
+            # Live token view for the hub: one bounded buffer per job
+            live = current_buffer()
+            agent_name = (getattr(from_agent, "role", None) or self.model).strip()
+            if live is not None:
+                live.call_started(agent_name)
+
+            client = get_client(self.model)
+            parts = []
+            metadata = {}
+            first_token_s = None
+            start = time.perf_counter()
+            try:
+                # Time blocked on the HTTP stream is LLM wait, not host overhead, for the profiler
+                for chunk in tag_blocking(client.stream(messages, stop=self.stop or None)):
+                    text = chunk.content if isinstance(chunk.content, str) else ""
+                    if text:
+                        if first_token_s is None:
+                            first_token_s = time.perf_counter() - start
+                        parts.append(text)
+                        if live is not None:
+                            live.feed(agent_name, text)
+                        # Per run, not per instance: this LLM is shared by every crew of the model
+                        if self.stream or stream_requested():
+                            crewai_event_bus.emit(
+                                self,
+                                event=LLMStreamChunkEvent(chunk=text, from_task=from_task, from_agent=from_agent),
+                            )
+                    if chunk.response_metadata.get("done"):
+                        metadata = chunk.response_metadata
+            finally:
+                if live is not None:
+                    live.call_finished(agent_name, metadata.get("eval_count"))
+            wall_s = time.perf_counter() - start
+        record_timings(self.model, metadata, wall_s)
+        estimator.observe(self.model, sum(len(m.get("content") or "") for m in messages),
+                          metadata.get("prompt_eval_count"))
+        tracer = current_tracer()
+        if tracer is not None:
+            tracer.llm_call(self.model, task_name, wall_s, metadata, first_token_s, budget, scheduler_wait_s)
+        return "".join(parts)
+
+    def supports_function_calling(self):
+        return False
+
+    def supports_stop_words(self):
+        return True
+
+    def get_context_window_size(self):
+        return 8192
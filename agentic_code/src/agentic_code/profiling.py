@@ -0,0 +1,176 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+PROFILE_INTERVAL_MS = float(os.environ.get("AGENTIC_PROFILE_INTERVAL_MS", "10"))
+FOLDED_FILE = "profile.folded"
+MAX_DEPTH = 200
+TOP_FUNCTIONS = 15
+
+# Threads currently blocked on an LLM response, written by the threads themselves
+_blocked = {}
+
+
+def tag_blocking(iterable, tag="llm_wait"):
+    """
+    Yields from `iterable`, marking this thread as `tag` while it waits for
+    the next item. Wrap a streaming HTTP response with it so samples taken
+    while waiting on the server are not counted as host time.
+    """
+    ident = threading.get_ident()
+    iterator = iter(iterable)
+    while True:
+        _blocked[ident] = tag
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _blocked.pop(ident, None)
+        yield item
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _stack(frame):
+    """Labels from the outermost frame to the innermost."""
+    labels = []
+    while frame is not None and len(labels) < MAX_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for one run, in pure Python.
+
+    A daemon thread samples the run's thread (and any thread executing CrewAI
+    code) every `interval_ms`. Each sample is filed under the tracer's current
+    phase and one category:
+
+        llm_wait   blocked on the Ollama HTTP stream (see tag_blocking)
+        llm_queue  waiting for a slot at agentic_code.scheduler
+        host       everything else: CrewAI orchestration, prompt rendering,
+                   extraction, validation, disk I/O
+
+    `write()` emits the stacks in folded format (flamegraph.pl, speedscope,
+    inferno) and returns the per-phase breakdown for metrics.json. Crews of
+    other hub jobs running at the same time are sampled as well.
+    """
+
+    def __init__(self, tracer=None, interval_ms=PROFILE_INTERVAL_MS, thread_id=None):
+        self.tracer = tracer
+        self.interval_s = max(0.001, interval_ms / 1000)
+        self.thread_id = thread_id or threading.get_ident()
+        self._samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+        self._ticks = 0
+        self._overhead_s = 0.0
+        self._start = self._end = None
+
+    def start(self):
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="agentic-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self._end = time.perf_counter()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            tick = time.perf_counter()
+            tracer = self.tracer
+            phase = tracer.current_phase() if tracer is not None else "host"
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = _stack(frame)
+                if ident != self.thread_id and not any(label.startswith("crewai.") for label in stack):
+                    continue
+                category = _blocked.get(ident)
+                if category is None:
+                    in_scheduler = any(label.startswith("agentic_code.scheduler.") for label in stack)
+                    category = "llm_queue" if in_scheduler else "host"
+                self._samples[(phase, category, stack)] += 1
+            self._ticks += 1
+            self._overhead_s += time.perf_counter() - tick
+
+    # --- REPORT ---
+
+    def report(self):
+        """Seconds per phase and category, plus the host functions that used the most time."""
+        wall_s = (self._end or time.perf_counter()) - self._start
+        sample_s = wall_s / self._ticks if self._ticks else self.interval_s
+        totals = Counter()
+        phases = {}
+        self_time = Counter()
+        inclusive = Counter()
+        for (phase, category, stack), count in self._samples.items():
+            seconds = count * sample_s
+            totals[category] += seconds
+            by_category = phases.setdefault(phase, Counter())
+            by_category[category] += seconds
+            if category != "host" or not stack:
+                continue
+            self_time[stack[-1]] += seconds
+            # Our own functions, counted once per sample however deep the recursion
+            for label in set(stack):
+                if label.startswith("agentic_code."):
+                    inclusive[label] += seconds
+
+        def _rounded(counter):
+            return {name: round(counter.get(name, 0.0), 3) for name in ("llm_wait", "llm_queue", "host")}
+
+        return {
+            "interval_ms": round(self.interval_s * 1000, 2),
+            "wall_s": round(wall_s, 3),
+            "samples": sum(self._samples.values()),
+            "sampler_overhead_s": round(self._overhead_s, 3),
+            "totals_s": _rounded(totals),
+            "phases_s": {phase: _rounded(counter) for phase, counter in phases.items()},
+            "host_self_s": [{"function": name, "seconds": round(s, 3)}
+                            for name, s in self_time.most_common(TOP_FUNCTIONS)],
+            "host_agentic_code_s": [{"function": name, "seconds": round(s, 3)}
+                                    for name, s in inclusive.most_common(TOP_FUNCTIONS)],
+        }
+
+    def write(self, results_base):
+        """Writes <results_base>/profile.folded and returns report() with its file name."""
+        lines = [f"{phase};[{category}];" + ";".join(stack) + f" {count}"
+                 for (phase, category, stack), count in sorted(self._samples.items(),
+                                                                key=lambda item: -item[1])]
+        os.makedirs(results_base, exist_ok=True)
+        with open(os.path.join(results_base, FOLDED_FILE), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + ("\n" if lines else ""))
+        report = self.report()
+        report["flamegraph"] = FOLDED_FILE
+        return report
+
+
+def print_report(report):
+    """Console summary of a SamplingProfiler report."""
+    totals = report["totals_s"]
+    print(f"\n🔎 Profile ({report['samples']} samples every {report['interval_ms']}ms): "
+          f"LLM wait {totals['llm_wait']:.1f}s · scheduler queue {totals['llm_queue']:.1f}s · "
+          f"host {totals['host']:.1f}s")
+    for phase, seconds in report["phases_s"].items():
+        print(f"   {phase:<14} llm {seconds['llm_wait']:>8.2f}s  queue {seconds['llm_queue']:>8.2f}s  "
+              f"host {seconds['host']:>8.2f}s")
+    for entry in report["host_agentic_code_s"][:5]:
+        print(f"   🔥 {entry['function']}: {entry['seconds']:.2f}s host")
+    print(f"   Flamegraph input: {report['flamegraph']} (flamegraph.pl, speedscope or inferno)")
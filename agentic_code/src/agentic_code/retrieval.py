@@ -0,0 +1,240 @@
+import math
+import os
+import re
+import sqlite3
+from collections import Counter
+
+from agentic_code.incremental import list_project_files
+
+CONTEXT_TOKENS = int(os.environ.get("AGENTIC_CONTEXT_TOKENS", "600"))
+
+INDEXED_EXTENSIONS = {".py", ".md", ".txt", ".yaml", ".yml", ".toml"}
+MAX_FILE_BYTES = 200_000
+CHUNK_LINES = 40
+MIN_CHUNK_LINES = 8
+
+# BM25 parameters and the weight of hand-written notes over generated code
+K1 = 1.2
+B = 0.75
+SOURCE_BOOST = {"knowledge": 1.5, "results": 1.0}
+
+STOPWORDS = {
+    "in", "is", "of", "to", "an", "on", "by", "as", "it", "be", "or", "at", "if", "we", "do", "no",
+    "the", "and", "for", "with", "that", "this", "from", "import", "return", "def", "class",
+    "self", "none", "true", "false", "are", "not", "you", "use", "using", "into", "your",
+    "will", "can", "all", "its", "has", "have", "was", "but", "our", "out", "get", "set",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path    TEXT PRIMARY KEY,
+    source  TEXT NOT NULL,
+    mtime   REAL NOT NULL,
+    size    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    chunk_id   INTEGER PRIMARY KEY,
+    path       TEXT NOT NULL,
+    first_line INTEGER NOT NULL,
+    text       TEXT NOT NULL,
+    length     INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term     TEXT NOT NULL,
+    chunk_id INTEGER NOT NULL,
+    tf       INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS postings_term ON postings (term);
+CREATE INDEX IF NOT EXISTS postings_chunk ON postings (chunk_id);
+CREATE INDEX IF NOT EXISTS chunks_path ON chunks (path);
+"""
+
+
+def tokenize(text):
+    """Lower-cased words and identifiers; snake_case names also yield their parts."""
+    terms = []
+    for word in re.findall(r"[a-z0-9_]{2,}", text.lower()):
+        parts = [p for p in word.split("_") if len(p) > 1]
+        for term in ([word] + parts if len(parts) > 1 else parts):
+            if term not in STOPWORDS and not term.isdigit():
+                terms.append(term)
+    return terms
+
+
+def estimate_tokens(text):
+    """Rough token count (about 4 characters per token) without loading a tokenizer."""
+    return len(text) // 4 + 1
+
+
+def chunk_lines(text):
+    """Splits a file into (first_line, text) chunks at blank lines or top-level definitions."""
+    chunks, current, first = [], [], 1
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        boundary = len(current) >= CHUNK_LINES or (
+            len(current) >= MIN_CHUNK_LINES
+            and (not line.strip() or line.startswith(("def ", "class ", "@", "#"))))
+        if boundary and "".join(current).strip():
+            chunks.append((first, "\n".join(current).strip()))
+            current, first = [], line_no
+        current.append(line)
+    if "".join(current).strip():
+        chunks.append((first, "\n".join(current).strip()))
+    return chunks
+
+
+class RetrievalIndex:
+    """
+    On-disk BM25 index (SQLite inverted index) over knowledge/ notes and past
+    Results/ projects. `refresh()` only re-reads files whose mtime or size
+    changed, so keeping it current costs one stat per file.
+    """
+
+    def __init__(self, db_path, knowledge_dir, results_root):
+        self.db_path = db_path
+        self.sources = {"knowledge": os.path.abspath(knowledge_dir),
+                        "results": os.path.abspath(results_root)}
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    # --- BUILDING ---
+
+    def _source_files(self):
+        """{abs path: source label} of every indexable file on disk."""
+        found = {}
+        knowledge = self.sources["knowledge"]
+        if os.path.isdir(knowledge):
+            for rel_path in list_project_files(knowledge):
+                found[os.path.join(knowledge, rel_path)] = "knowledge"
+        results = self.sources["results"]
+        if os.path.isdir(results):
+            for name in sorted(os.listdir(results)):
+                project_dir = os.path.join(results, name)
+                if name.startswith(".") or not os.path.isdir(project_dir):
+                    continue
+                for rel_path in list_project_files(project_dir):
+                    found[os.path.join(project_dir, rel_path)] = "results"
+        return {path: source for path, source in found.items()
+                if os.path.splitext(path)[1].lower() in INDEXED_EXTENSIONS}
+
+    def _remove(self, conn, path):
+        conn.execute("DELETE FROM postings WHERE chunk_id IN (SELECT chunk_id FROM chunks WHERE path = ?)", (path,))
+        conn.execute("DELETE FROM chunks WHERE path = ?", (path,))
+        conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def refresh(self):
+        """Indexes new and changed files and drops deleted ones. Returns (updated, removed)."""
+        on_disk = self._source_files()
+        with self._connect() as conn:
+            known = {path: (mtime, size) for path, mtime, size in conn.execute("SELECT path, mtime, size FROM files")}
+            updated = 0
+            for path, source in on_disk.items():
+                stat = os.stat(path)
+                if known.get(path) == (stat.st_mtime, stat.st_size):
+                    continue
+                self._remove(conn, path)
+                conn.execute("INSERT INTO files (path, source, mtime, size) VALUES (?, ?, ?, ?)",
+                             (path, source, stat.st_mtime, stat.st_size))
+                updated += 1
+                if stat.st_size > MAX_FILE_BYTES:
+                    continue
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    text = f.read()
+                for first_line, chunk in chunk_lines(text):
+                    terms = Counter(tokenize(chunk))
+                    if not terms:
+                        continue
+                    chunk_id = conn.execute(
+                        "INSERT INTO chunks (path, first_line, text, length) VALUES (?, ?, ?, ?)",
+                        (path, first_line, chunk, sum(terms.values()))).lastrowid
+                    conn.executemany("INSERT INTO postings (term, chunk_id, tf) VALUES (?, ?, ?)",
+                                     [(term, chunk_id, tf) for term, tf in terms.items()])
+            removed = [path for path in known if path not in on_disk]
+            for path in removed:
+                self._remove(conn, path)
+        return updated, len(removed)
+
+    # --- QUERYING ---
+
+    def search(self, query, limit=20, exclude_prefix=None):
+        """Top chunks for `query` by BM25: [(score, path, source, first_line, text)]."""
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+        with self._connect() as conn:
+            total, avg_length = conn.execute("SELECT COUNT(*), AVG(length) FROM chunks").fetchone()
+            if not total:
+                return []
+            postings = conn.execute(
+                f"SELECT term, chunk_id, tf FROM postings WHERE term IN ({', '.join('?' * len(terms))})",
+                terms).fetchall()
+            doc_freq = Counter(term for term, _, _ in postings)
+            chunk_ids = sorted({chunk_id for _, chunk_id, _ in postings})
+            chunks = {}
+            for start in range(0, len(chunk_ids), 500):
+                batch = chunk_ids[start:start + 500]
+                for row in conn.execute(
+                        "SELECT c.chunk_id, c.path, f.source, c.first_line, c.text, c.length "
+                        "FROM chunks c JOIN files f ON f.path = c.path "
+                        f"WHERE c.chunk_id IN ({', '.join('?' * len(batch))})", batch):
+                    chunks[row[0]] = row[1:]
+
+        scores = Counter()
+        for term, chunk_id, tf in postings:
+            length = chunks[chunk_id][4]
+            idf = math.log(1 + (total - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            scores[chunk_id] += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avg_length))
+
+        hits = []
+        for chunk_id, score in scores.items():
+            path, source, first_line, text, _ = chunks[chunk_id]
+            if exclude_prefix and path.startswith(exclude_prefix):
+                continue
+            hits.append((score * SOURCE_BOOST.get(source, 1.0), path, source, first_line, text))
+        hits.sort(key=lambda hit: (-hit[0], hit[1], hit[3]))
+        return hits[:limit]
+
+    def context_for(self, topic, budget_tokens=CONTEXT_TOKENS, exclude_prefix=None):
+        """
+        Best snippets for `topic` that fit in `budget_tokens`, at most one per
+        file, rendered for the prompt. Returns (context text, tokens used).
+        """
+        parts, used, seen_paths = [], 0, set()
+        for _, path, source, first_line, text in self.search(topic, exclude_prefix=exclude_prefix):
+            if path in seen_paths:
+                continue
+            rel_path = os.path.relpath(path, os.path.dirname(self.sources[source])).replace(os.sep, "/")
+            snippet = f"# {rel_path} (line {first_line})\n{text}"
+            cost = estimate_tokens(snippet)
+            if used + cost > budget_tokens:
+                continue
+            parts.append(snippet)
+            used += cost
+            seen_paths.add(path)
+        return "\n\n".join(parts), used
+
+
+def build_context(topic, results_base, budget_tokens=CONTEXT_TOKENS):
+    """
+    Refreshes the index next to the Results folder of `results_base` and
+    returns (context, stats) for the topic. The project being generated is
+    never used as its own context.
+    """
+    results_root = os.path.dirname(os.path.abspath(results_base))
+    project_root = os.path.dirname(results_root)
+    index = RetrievalIndex(
+        os.environ.get("AGENTIC_RETRIEVAL_DB", os.path.join(project_root, ".cache", "retrieval.sqlite")),
+        os.environ.get("AGENTIC_KNOWLEDGE_DIR", os.path.join(project_root, "knowledge")),
+        results_root,
+    )
+    updated, removed = index.refresh() if budget_tokens > 0 else (0, 0)
+    context, used = ("", 0)
+    if budget_tokens > 0:
+        context, used = index.context_for(topic, budget_tokens, exclude_prefix=os.path.abspath(results_base) + os.sep)
+    return context, {"indexed_files": updated, "removed_files": removed,
+                     "context_tokens": used, "budget_tokens": budget_tokens}
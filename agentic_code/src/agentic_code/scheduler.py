@@ -0,0 +1,190 @@
+import contextvars
+import itertools
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+# Lower number is served first
+PRIORITIES = {"interactive": 0, "batch": 1}
+DEFAULT_PRIORITY = "interactive"
+
+MAX_QUEUE_WAIT_S = float(os.environ.get("AGENTIC_MAX_QUEUE_WAIT_S", "900"))
+
+_context = contextvars.ContextVar("agentic_llm_request", default=(None, DEFAULT_PRIORITY))
+
+
+class AdmissionRejected(Exception):
+    """An LLM call was refused because the queue wait would exceed the limit."""
+
+
+def parse_limits(spec):
+    """'1' or 'qwen2.5-coder:7b=1,llama3.2:latest=2' -> (default limit, {model: limit})."""
+    default, per_model = 1, {}
+    for item in spec.split(","):
+        name, sep, value = item.strip().rpartition("=")
+        if not value.strip().isdigit():
+            continue
+        if sep:
+            per_model[name.strip()] = max(1, int(value))
+        else:
+            default = max(1, int(value))
+    return default, per_model
+
+
+@contextmanager
+def request_context(run_id, priority=DEFAULT_PRIORITY):
+    """Tags the LLM calls made inside the block with their run and priority class."""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority '{priority}', expected one of {tuple(PRIORITIES)}")
+    token = _context.set((run_id, priority))
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class LLMScheduler:
+    """
+    Gate in front of the local Ollama server that every LLM call passes.
+
+    - per-model concurrency limits (plus an optional limit across models)
+    - priority classes: interactive requests are granted before batch ones
+    - fair queuing: within a class, the run that has used the least model
+      time so far goes next, so one long run cannot starve the others
+    - admission control: batch calls whose estimated queue wait exceeds
+      `max_wait_s` are rejected up front; interactive calls are deferred
+      behind the running work instead
+    """
+
+    def __init__(self, default_limit=1, model_limits=None, total_limit=None, max_wait_s=MAX_QUEUE_WAIT_S):
+        self.default_limit = default_limit
+        self.model_limits = dict(model_limits or {})
+        self.total_limit = total_limit
+        self.max_wait_s = max_wait_s
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiting = []
+        self._running = Counter()
+        self._running_runs = Counter()
+        self._served = defaultdict(float)
+        self._service_s = {}
+        self._metrics = {name: {"granted": 0, "rejected": 0, "wait_s_total": 0.0, "wait_s_max": 0.0}
+                         for name in PRIORITIES}
+
+    def limit(self, model):
+        return self.model_limits.get(model, self.default_limit)
+
+    # --- SCHEDULING (called with the condition held) ---
+
+    def _can_run(self, model):
+        if self._running[model] >= self.limit(model):
+            return False
+        return self.total_limit is None or sum(self._running.values()) < self.total_limit
+
+    def _next(self):
+        eligible = [r for r in self._waiting if self._can_run(r["model"])]
+        if not eligible:
+            return None
+        return min(eligible, key=lambda r: (PRIORITIES[r["priority"]], self._served[r["run_id"]], r["seq"]))
+
+    def estimated_wait(self, model, priority):
+        """Seconds a new `priority` call for `model` would likely queue, from average call time."""
+        ahead = self._running[model] + sum(
+            1 for r in self._waiting
+            if r["model"] == model and PRIORITIES[r["priority"]] <= PRIORITIES[priority])
+        slots_busy = ahead - self.limit(model) + 1
+        if slots_busy <= 0:
+            return 0.0
+        return slots_busy * self._service_s.get(model, 0.0) / self.limit(model)
+
+    # --- PUBLIC API ---
+
+    @contextmanager
+    def slot(self, model):
+        """
+        Blocks until `model` may be called by this run, then holds the slot for
+        the block. Yields the seconds spent queued.
+        """
+        run_id, priority = _context.get()
+        request = {"model": model, "priority": priority, "run_id": run_id, "seq": next(self._seq)}
+        start = time.perf_counter()
+        with self._cond:
+            estimate = self.estimated_wait(model, priority)
+            if priority != "interactive" and estimate > self.max_wait_s:
+                self._metrics[priority]["rejected"] += 1
+                raise AdmissionRejected(
+                    f"{model}: estimated queue wait {estimate:.0f}s exceeds {self.max_wait_s:.0f}s")
+            self._waiting.append(request)
+            while self._next() is not request:
+                self._cond.wait()
+            self._waiting.remove(request)
+            self._running[model] += 1
+            self._running_runs[run_id] += 1
+            wait_s = time.perf_counter() - start
+            metrics = self._metrics[priority]
+            metrics["granted"] += 1
+            metrics["wait_s_total"] += wait_s
+            metrics["wait_s_max"] = max(metrics["wait_s_max"], wait_s)
+
+        call_start = time.perf_counter()
+        try:
+            yield wait_s
+        finally:
+            elapsed = time.perf_counter() - call_start
+            with self._cond:
+                self._running[model] -= 1
+                self._running_runs[run_id] -= 1
+                self._served[run_id] += elapsed
+                previous = self._service_s.get(model)
+                self._service_s[model] = elapsed if previous is None else 0.7 * previous + 0.3 * elapsed
+                self._forget_idle_runs()
+                self._cond.notify_all()
+
+    def _forget_idle_runs(self):
+        if len(self._served) < 256:
+            return
+        active = {r["run_id"] for r in self._waiting} | {run for run, n in self._running_runs.items() if n > 0}
+        self._served = defaultdict(float, {run: s for run, s in self._served.items() if run in active})
+        self._running_runs = Counter({run: n for run, n in self._running_runs.items() if n > 0})
+
+    def stats(self):
+        """Queue depth, running calls and wait times, per model and per priority class."""
+        with self._cond:
+            models = set(self._running) | {r["model"] for r in self._waiting} | set(self._service_s)
+            per_model = {
+                model: {
+                    "limit": self.limit(model),
+                    "running": self._running[model],
+                    "queued": sum(1 for r in self._waiting if r["model"] == model),
+                    "avg_call_s": round(self._service_s.get(model, 0.0), 3),
+                    "estimated_wait_s": round(self.estimated_wait(model, "batch"), 3),
+                }
+                for model in sorted(models)
+            }
+            per_priority = {}
+            for name, m in self._metrics.items():
+                per_priority[name] = {
+                    "queued": sum(1 for r in self._waiting if r["priority"] == name),
+                    "granted": m["granted"],
+                    "rejected": m["rejected"],
+                    "avg_wait_s": round(m["wait_s_total"] / m["granted"], 3) if m["granted"] else None,
+                    "max_wait_s": round(m["wait_s_max"], 3),
+                }
+            return {"queue_depth": len(self._waiting), "models": per_model, "priorities": per_priority}
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """The process-wide scheduler, configured from AGENTIC_MODEL_CONCURRENCY / AGENTIC_OLLAMA_CONCURRENCY."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            default, per_model = parse_limits(os.environ.get("AGENTIC_MODEL_CONCURRENCY", "1"))
+            total = os.environ.get("AGENTIC_OLLAMA_CONCURRENCY")
+            _scheduler = LLMScheduler(default, per_model, int(total) if total else None)
+        return _scheduler
@@ -0,0 +1,216 @@
+import asyncio
+import json
+import os
+import uuid
+from datetime import datetime
+from urllib.parse import unquote, urlsplit
+
+from agentic_code.incremental import list_project_files
+from agentic_code.jobs import QueueFull
+from agentic_code.scheduler import PRIORITIES, get_scheduler
+
+MAX_BODY_BYTES = 64 * 1024
+MAX_FILE_BYTES = 1024 * 1024
+HEADER_TIMEOUT_S = 30
+EVENT_INTERVAL_S = 0.5
+
+STATUS_TEXT = {
+    200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    408: "Request Timeout", 413: "Payload Too Large", 429: "Too Many Requests", 500: "Internal Server Error",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class JobService:
+    """
+    Local HTTP API over a JobManager, served with plain asyncio.
+
+        POST /jobs                  {"prompt": "...", "priority": "interactive"|"batch", "profile": false}
+                                    -> 202 {"id": ...}, 429 when the queue is full
+        GET  /jobs                  all known jobs, newest first
+        GET  /jobs/<id>             status and per-task state
+        GET  /jobs/<id>/events      Server-Sent Events: status, live tokens, done
+        GET  /jobs/<id>/files       extracted file tree with sizes
+        GET  /jobs/<id>/files/<p>   one extracted file
+        GET  /health                workers, queue depth, capacity and LLM scheduler metrics
+
+    The event loop only reads job snapshots; crews run on the manager's
+    worker threads, so the number of workers is the concurrency cap toward Ollama.
+    """
+
+    def __init__(self, manager, results_root="Results", max_queue=0):
+        self.manager = manager
+        self.results_root = os.path.abspath(results_root)
+        self.max_queue = max_queue
+
+    # --- HTTP PLUMBING ---
+
+    async def handle(self, reader, writer):
+        try:
+            try:
+                method, path, body = await asyncio.wait_for(self._read_request(reader), HEADER_TIMEOUT_S)
+            except asyncio.TimeoutError:
+                raise HttpError(408, "Request timed out") from None
+            await self._route(method, path, body, writer)
+        except HttpError as e:
+            await self._send_json(writer, e.status, {"error": str(e)}, e.headers)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            print(f"❌ Service error: {e}")
+            await self._send_json(writer, 500, {"error": str(e)})
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError:
+            raise HttpError(413, "Headers too large") from None
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Malformed request line") from None
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HttpError(400, "Bad Content-Length") from None
+        if length < 0:
+            raise HttpError(400, "Bad Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, f"Body larger than {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), unquote(urlsplit(target).path), body
+
+    async def _send(self, writer, status, body, content_type, headers=None):
+        head = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+                f"Content-Type: {content_type}",
+                f"Content-Length: {len(body)}",
+                "Connection: close"]
+        head += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _send_json(self, writer, status, payload, headers=None):
+        body = json.dumps(payload, indent=2).encode("utf-8")
+        await self._send(writer, status, body, "application/json", headers)
+
+    # --- ROUTES ---
+
+    async def _route(self, method, path, body, writer):
+        parts = [p for p in path.split("/") if p]
+        if parts == ["health"] and method == "GET":
+            return await self._send_json(writer, 200, {
+                "workers": self.manager.workers,
+                "queued": self.manager.queue_depth(),
+                "max_queue": self.max_queue or None,
+                "running": sum(1 for j in self.manager.list_jobs() if j["status"] == "running"),
+                "llm_scheduler": get_scheduler().stats(),
+            })
+        if parts == ["jobs"]:
+            if method == "POST":
+                return await self._submit(body, writer)
+            if method == "GET":
+                return await self._send_json(writer, 200, self.manager.list_jobs())
+            raise HttpError(405, "Use GET or POST")
+        if len(parts) >= 2 and parts[0] == "jobs" and method == "GET":
+            job = self.manager.get(parts[1])
+            if job is None:
+                raise HttpError(404, f"Unknown job {parts[1]}")
+            if len(parts) == 2:
+                return await self._send_json(writer, 200, job)
+            if parts[2:] == ["events"]:
+                return await self._stream_events(job["id"], writer)
+            if parts[2] == "files":
+                return await self._files(job, "/".join(parts[3:]), writer)
+        raise HttpError(404, f"No route for {method} {path}")
+
+    async def _submit(self, body, writer):
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            raise HttpError(400, "Body must be JSON") from None
+        prompt = str(payload.get("prompt") or payload.get("topic") or "").strip() if isinstance(payload, dict) else ""
+        if not prompt:
+            raise HttpError(400, "Missing 'prompt'")
+        priority = payload.get("priority") or "interactive"
+        if priority not in PRIORITIES:
+            raise HttpError(400, f"'priority' must be one of {', '.join(PRIORITIES)}")
+
+        project_id = f"Project_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        try:
+            job_id = self.manager.submit(prompt, os.path.join(self.results_root, project_id), priority,
+                                         profile=bool(payload.get("profile")))
+        except QueueFull as e:
+            # Backpressure: callers retry once a worker has picked something up
+            raise HttpError(429, f"Queue full: {e}", {"Retry-After": "30"}) from None
+        print(f"🛠️ Job {job_id} queued ({project_id})")
+        await self._send_json(writer, 202, self.manager.get(job_id), {"Location": f"/jobs/{job_id}"})
+
+    async def _stream_events(self, job_id, writer):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n")
+        last_state, sent_chars = None, 0
+        while True:
+            job = self.manager.get(job_id)
+            if job is None:
+                return
+            state = (job["status"], tuple(sorted(job["tasks"].items())))
+            if state != last_state:
+                writer.write(_event("status", {k: job[k] for k in ("id", "status", "tasks", "error")}))
+                last_state = state
+            live = self.manager.live(job_id)
+            if live and live["total_chars"] > sent_chars:
+                new_chars = live["total_chars"] - sent_chars
+                text = live["text"][-new_chars:]
+                writer.write(_event("tokens", {"text": text, "skipped": new_chars - len(text),
+                                               "agents": live["agents"]}))
+                sent_chars = live["total_chars"]
+            await writer.drain()
+            if job["status"] in ("done", "failed"):
+                writer.write(_event("done", job))
+                await writer.drain()
+                return
+            await asyncio.sleep(EVENT_INTERVAL_S)
+
+    async def _files(self, job, rel_path, writer):
+        project_dir = job["project_dir"]
+        if not os.path.isdir(project_dir):
+            raise HttpError(404, "No files extracted yet")
+        if not rel_path:
+            tree = [{"path": f, "bytes": os.path.getsize(os.path.join(project_dir, f))}
+                    for f in list_project_files(project_dir)]
+            return await self._send_json(writer, 200, {"project_dir": project_dir, "files": tree})
+
+        root = os.path.abspath(project_dir)
+        full_path = os.path.abspath(os.path.join(root, rel_path))
+        if os.path.commonpath([root, full_path]) != root or not os.path.isfile(full_path):
+            raise HttpError(404, f"No file {rel_path}")
+        if os.path.getsize(full_path) > MAX_FILE_BYTES:
+            raise HttpError(413, f"{rel_path} is larger than {MAX_FILE_BYTES} bytes")
+        with open(full_path, "rb") as f:
+            await self._send(writer, 200, f.read(), "text/plain; charset=utf-8")
+
+
+def _event(name, payload):
+    return f"event: {name}\ndata: {json.dumps(payload)}\n\n".encode("utf-8")
+
+
+async def serve(service, host="127.0.0.1", port=8765):
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"🚀 Agentic service on http://{host}:{port} "
+          f"({service.manager.workers} worker(s), queue limit {service.max_queue or 'none'})")
+    async with server:
+        await server.serve_forever()
@@ -0,0 +1,107 @@
+import os
+import shutil
+import time
+import uuid
+
+# none    -> no fsync at all (fastest, a crash may lose the project)
+# project -> fsync the staged files and directories once, before the rename
+# file    -> fsync every file as it is written (slowest, old behaviour)
+DURABILITY_MODES = ("none", "project", "file")
+DEFAULT_DURABILITY = os.environ.get("AGENTIC_DURABILITY", "project")
+
+STAGING_PREFIX = ".staging-"
+
+
+def _fsync_file(path):
+    # Read-only descriptors can be fsync'd on POSIX (blob-store files are 0444)
+    fd = os.open(path, os.O_RDWR if os.name == "nt" else os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(path):
+    """Persists directory entries (renames); not supported on Windows."""
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class ProjectWriter:
+    """
+    Writes a project into a hidden staging directory next to its final
+    location and renames it into place on commit, so a crash never leaves a
+    half-written Results/<project> behind.
+    """
+
+    def __init__(self, results_base, durability=None):
+        durability = durability or DEFAULT_DURABILITY
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability '{durability}', expected one of {DURABILITY_MODES}")
+        self.results_base = os.path.normpath(results_base)
+        self.durability = durability
+        parent, name = os.path.split(os.path.abspath(self.results_base))
+        os.makedirs(parent, exist_ok=True)
+        self.root = os.path.join(parent, f"{STAGING_PREFIX}{name}-{uuid.uuid4().hex[:8]}")
+        os.makedirs(self.root)
+
+    def path(self, rel_path):
+        """Staging path for `rel_path`."""
+        return os.path.join(self.root, rel_path)
+
+    def write(self, rel_path, content):
+        full_path = self.path(rel_path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w", encoding="utf-8") as f:
+            f.write(content)
+            if self.durability == "file":
+                f.flush()
+                os.fsync(f.fileno())
+
+    def commit(self):
+        """Flushes per the durability mode and moves the project into place."""
+        if self.durability == "project":
+            # Everything in staging, however it got there (write(), a streaming
+            # extractor, stabilization fixes), and nothing else on the host
+            for dirpath, _, filenames in os.walk(self.root):
+                for name in filenames:
+                    _fsync_file(os.path.join(dirpath, name))
+                _fsync_dir(dirpath)
+
+        target = os.path.abspath(self.results_base)
+        previous = None
+        if os.path.exists(target):
+            # Re-extraction into an existing folder: swap, then drop the old copy
+            previous = f"{self.root}.old"
+            os.rename(target, previous)
+        os.rename(self.root, target)
+        if self.durability != "none":
+            _fsync_dir(os.path.dirname(target))
+        if previous:
+            shutil.rmtree(previous, ignore_errors=True)
+        return target
+
+    def abort(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def remove_stale_staging(results_root, max_age_s=6 * 3600):
+    """
+    Deletes staging folders left behind by runs that crashed before commit.
+    Only folders older than `max_age_s` are touched, so live runs are safe.
+    """
+    if not os.path.isdir(results_root):
+        return []
+    removed = []
+    now = time.time()
+    for name in os.listdir(results_root):
+        path = os.path.join(results_root, name)
+        if name.startswith(STAGING_PREFIX) and now - os.path.getmtime(path) > max_age_s:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(name)
+    return removed
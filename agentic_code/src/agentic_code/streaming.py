@@ -0,0 +1,312 @@
+import contextvars
+import os
+import re
+import threading
+from contextlib import contextmanager
+
+from agentic_code.blobs import save_raw_output
+from agentic_code.markers import FENCE, HEADER_END, MARKER, clean_block_content, iter_file_blocks
+from agentic_code.storage import ProjectWriter
+
+_requested = contextvars.ContextVar("agentic_stream_chunks", default=False)
+
+
+def stream_requested():
+    """True inside stream_files_to: LLM calls made in this context emit stream chunk events."""
+    return _requested.get()
+
+
+class StreamingFileExtractor:
+    """
+    Incremental version of extract_and_save_files.
+
+    Feed it the LLM token stream chunk by chunk. Every '--- FILE: path ---'
+    block is written to disk while it is being generated and is moved into
+    place as soon as the next marker (or the end of the stream) closes it.
+    Only the unresolved tail of the stream is held in memory.
+
+    With a storage.ProjectWriter the blocks are written into its staging
+    directory (`root`) instead, and the project only appears in results_base
+    on commit(), so a crash mid-run never leaves a half-written project.
+    """
+
+    def __init__(self, results_base, writer=None):
+        self.results_base = results_base
+        self.writer = writer
+        self.root = writer.root if writer is not None else results_base
+        self.files = []
+        self._lock = threading.Lock()
+        self._buf = ""
+        self._state = "seek"        # seek -> header -> body -> header ...
+        self._spool = None          # Pre-marker text, kept on disk for the raw fallback
+        self._rel_path = None
+        self._handle = None
+        self._part_path = None
+        self._pending = ""
+        self._lead_done = False
+        self._fence_checked = False
+        self._fenced = False
+        self.closed = False
+        os.makedirs(self.root, exist_ok=True)
+
+    @property
+    def found_markers(self):
+        return self._state != "seek"
+
+    # --- STREAM INPUT ---
+
+    def feed(self, chunk):
+        """Consumes one chunk of model output."""
+        if not chunk:
+            return
+        with self._lock:
+            if self.closed:
+                return
+            self._buf += chunk
+            self._drain(final=False)
+
+    def close(self):
+        """Flushes the last block. Returns the list of files written."""
+        with self._lock:
+            if self.closed:
+                return self.files
+            self._drain(final=True)
+            if self._state == "body":
+                self._finish_file()
+            elif self._spool is not None:
+                self._save_raw()
+            self.closed = True
+            return self.files
+
+    def abort(self):
+        """Stops after a failed run: removes the unfinished .part file and the raw spool."""
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+                try:
+                    os.remove(self._part_path)
+                except OSError:
+                    pass
+            self._discard_spool()
+            self.closed = True
+        if self.writer is not None:
+            self.writer.abort()
+
+    def matches(self, answer):
+        """
+        True when the streamed files are exactly the file blocks of `answer`,
+        the task's final output. A ReAct retry or an earlier iteration of the
+        task may have streamed blocks the final answer does not contain.
+        """
+        start = answer.find(MARKER)
+        if start == -1:
+            return False
+        expected = {path.strip().replace('\\', '/'): content
+                    for path, content in iter_file_blocks(answer[start:])}
+        if set(expected) != set(self.files):
+            return False
+        for rel_path, content in expected.items():
+            try:
+                with open(os.path.join(self.root, rel_path), "r", encoding="utf-8") as f:
+                    if f.read() != content:
+                        return False
+            except (OSError, UnicodeDecodeError):
+                return False
+        return True
+
+    def commit(self):
+        """Closes the stream and renames the staged project into results_base. Returns its path."""
+        self.close()
+        if self.writer is None:
+            return os.path.abspath(self.results_base)
+        return self.writer.commit()
+
+    # --- SCANNER ---
+
+    def _drain(self, final):
+        # Keep just enough text back to recognise a marker split across chunks
+        hold = 0 if final else len(MARKER) - 1
+        while True:
+            if self._state == "seek":
+                idx = self._buf.find(MARKER)
+                if idx == -1:
+                    cut = max(0, len(self._buf) - hold)
+                    self._spool_raw(self._buf[:cut])
+                    self._buf = self._buf[cut:]
+                    return
+                self._spool_raw(self._buf[:idx])
+                self._discard_spool()
+                self._buf = self._buf[idx + len(MARKER):]
+                self._state = "header"
+            elif self._state == "header":
+                idx = self._buf.find(HEADER_END)
+                if idx == -1:
+                    if final:
+                        self._buf = ""
+                    return
+                self._open_file(self._buf[:idx])
+                self._buf = self._buf[idx + len(HEADER_END):]
+                self._state = "body"
+            else:
+                idx = self._buf.find(MARKER)
+                if idx == -1:
+                    cut = max(0, len(self._buf) - hold)
+                    self._write_body(self._buf[:cut])
+                    self._buf = self._buf[cut:]
+                    return
+                self._write_body(self._buf[:idx])
+                self._finish_file()
+                self._buf = self._buf[idx + len(MARKER):]
+                self._state = "header"
+
+    # --- FILE BLOCKS ---
+
+    def _open_file(self, header):
+        # Normalize paths for Windows/Linux compatibility
+        self._rel_path = header.strip().replace('\\', '/')
+        self._pending = ""
+        self._lead_done = False
+        self._fence_checked = False
+        self._fenced = False
+        full_path = os.path.join(self.root, self._rel_path)
+        self._part_path = full_path + ".part"
+        try:
+            if not os.path.basename(full_path):
+                raise IsADirectoryError(f"Is a directory: '{full_path}'")
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            self._handle = open(self._part_path, "w", encoding="utf-8")
+        except Exception as e:
+            self._handle = None
+            print(f"❌ Error writing {self._rel_path}: {e}")
+
+    def _write_body(self, text):
+        if self._handle is None or not text:
+            return
+        self._pending += text
+        if not self._lead_done and not self._resolve_lead():
+            return
+
+        # Hold back trailing whitespace and a possible closing fence until the block ends
+        end = len(self._pending.rstrip())
+        cut = max(0, end - len(FENCE))
+        if self._pending[cut:end] == FENCE:
+            cut = len(self._pending[:cut].rstrip())
+        if cut:
+            self._handle.write(self._pending[:cut])
+            self._pending = self._pending[cut:]
+
+    def _resolve_lead(self):
+        """Strips leading whitespace and an opening ```lang fence, mirroring clean_block_content."""
+        if not self._fence_checked:
+            self._pending = self._pending.lstrip()
+            if len(self._pending) < len(FENCE):
+                return False
+            self._fenced = self._pending.startswith(FENCE)
+            if self._fenced:
+                match = re.match(r'```[a-zA-Z0-9]*', self._pending)
+                if match.end() == len(self._pending):
+                    return False
+                if self._pending[match.end()] == "\n":
+                    # The fence line only goes if real content follows it
+                    if not self._pending[match.end():].strip():
+                        return False
+                    self._pending = self._pending[match.end() + 1:]
+            self._fence_checked = True
+        self._pending = self._pending.lstrip()
+        if not self._pending:
+            return False
+        self._lead_done = True
+        return True
+
+    def _finish_file(self):
+        if self._handle is None:
+            return
+        if self._lead_done:
+            tail = self._pending.rstrip()
+            if self._fenced and tail.endswith(FENCE):
+                tail = tail[:-len(FENCE)].rstrip()
+        else:
+            tail = clean_block_content(self._pending)
+        try:
+            self._handle.write(tail)
+            self._handle.flush()
+            if self.writer is not None and self.writer.durability == "file":
+                os.fsync(self._handle.fileno())
+            self._handle.close()
+            os.replace(self._part_path, self._part_path[:-len(".part")])
+            self.files.append(self._rel_path)
+            print(f"✅ Created: {self._rel_path}")
+        except Exception as e:
+            print(f"❌ Error writing {self._rel_path}: {e}")
+        finally:
+            self._handle = None
+            self._pending = ""
+
+    # --- RAW FALLBACK ---
+
+    def _spool_raw(self, text):
+        if not text:
+            return
+        if self._spool is None:
+            spool_path = os.path.join(self.root, ".raw_stream.part")
+            self._spool = open(spool_path, "w+", encoding="utf-8")
+        self._spool.write(text)
+
+    def _discard_spool(self):
+        if self._spool is not None:
+            path = self._spool.name
+            self._spool.close()
+            os.remove(path)
+            self._spool = None
+
+    def _save_raw(self):
+        self._spool.close()
+        filepath = save_raw_output(os.path.dirname(os.path.abspath(self.results_base)),
+                                   source_path=self._spool.name)
+        self._spool = None
+        print(f"⚠️ No markers found. Saved raw text to: {filepath}")
+
+
+@contextmanager
+def stream_files_to(results_base, task_name="review_task", durability=None):
+    """
+    Routes CrewAI stream chunks of `task_name` into a StreamingFileExtractor
+    staging the project for `results_base`, for the duration of the block.
+    Yields the extractor, which is closed when the block ends (call its
+    commit() to move the project into place) or aborted, staging and all,
+    when the block raises. Only the extractor's own handler is added to the
+    event bus, so CrewAI's console listeners keep running. Only LLM calls made
+    inside the block stream; other runs sharing the same LLM do not.
+    """
+    from crewai.events import LLMStreamChunkEvent, crewai_event_bus
+
+    extractor = StreamingFileExtractor(results_base, ProjectWriter(results_base, durability))
+
+    def _on_chunk(source, event):
+        if getattr(event, "task_name", None) in (None, task_name):
+            extractor.feed(event.chunk)
+
+    crewai_event_bus.on(LLMStreamChunkEvent)(_on_chunk)
+    token = _requested.set(True)
+    try:
+        yield extractor
+    except BaseException:
+        extractor.abort()
+        raise
+    finally:
+        _requested.reset(token)
+        _remove_handler(crewai_event_bus, LLMStreamChunkEvent, _on_chunk)
+    extractor.close()
+
+
+def _remove_handler(bus, event_type, handler):
+    """Unregisters a handler added with bus.on(); older event buses have no off()."""
+    off = getattr(bus, "off", None)
+    if off is not None:
+        off(event_type, handler)
+        return
+    for attr in ("_sync_handlers", "_async_handlers", "_handlers"):
+        handlers = getattr(bus, attr, {}).get(event_type)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
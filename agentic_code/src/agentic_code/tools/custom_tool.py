@@ -1,19 +1,215 @@
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Type
+
 from crewai.tools import BaseTool
-from typing import Type
 from pydantic import BaseModel, Field
 
+# Hard limits: a single tool answer must stay small enough for a CPU prompt
+MAX_RESPONSE_CHARS = 4000
+MAX_LINES = 200
+MAX_FILE_BYTES = 50 * 1024 * 1024
+MAX_LIST_ENTRIES = 200
+MMAP_THRESHOLD = 1024 * 1024
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+WORKSPACE_ROOTS = ("Results", "knowledge")
+
+
+class FileContentCache:
+    """
+    LRU of decoded small files keyed by content hash. A (path, mtime, size)
+    lookup maps to the hash, so unchanged files are never reread and equal
+    files (the same module in many projects) share one entry.
+    """
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._by_stat = {}
+        self._content = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, stat):
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            digest = self._by_stat.get(key)
+            if digest in self._content:
+                self._content.move_to_end(digest)
+                self.hits += 1
+                return self._content[digest][0]
+            self.misses += 1
+
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        text = data.decode("utf-8", errors="replace")
+        with self._lock:
+            self._by_stat[key] = digest
+            if digest not in self._content:
+                self._content[digest] = (text, len(data))
+                self._size += len(data)
+            self._content.move_to_end(digest)
+            while self._size > self.max_bytes and len(self._content) > 1:
+                _, (_, evicted_bytes) = self._content.popitem(last=False)
+                self._size -= evicted_bytes
+            if len(self._by_stat) > 4 * len(self._content) + 64:
+                live = set(self._content)
+                self._by_stat = {k: d for k, d in self._by_stat.items() if d in live}
+        return text
+
+
+file_cache = FileContentCache()
+
+
+def resolve_workspace_path(path, base_dir=None):
+    """
+    Maps 'Results/...' or 'knowledge/...' to an absolute path inside that root.
+    Raises ValueError for anything outside the workspace.
+    """
+    base_dir = os.path.abspath(base_dir or os.environ.get("AGENTIC_WORKSPACE", os.getcwd()))
+    rel_path = (path or "").strip().strip("'\"").replace("\\", "/").lstrip("./")
+    root_name = rel_path.split("/", 1)[0]
+    if root_name not in WORKSPACE_ROOTS:
+        raise ValueError(f"Path must start with one of: {', '.join(r + '/' for r in WORKSPACE_ROOTS)}")
+    root = os.path.join(base_dir, root_name)
+    full_path = os.path.abspath(os.path.join(base_dir, rel_path))
+    if os.path.commonpath([root, full_path]) != root:
+        raise ValueError(f"'{path}' is outside {root_name}/")
+    return full_path
+
+
+def _clip(text):
+    if len(text) <= MAX_RESPONSE_CHARS:
+        return text
+    return text[:MAX_RESPONSE_CHARS] + f"\n[... truncated at {MAX_RESPONSE_CHARS} characters; request a smaller range]"
+
+
+def _mmap_lines(path, start_line, end_line):
+    """Lines start..end (1-based, inclusive) of a large file without reading all of it."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        offset, line_no = 0, 1
+        while line_no < start_line:
+            offset = mm.find(b"\n", offset) + 1
+            if offset == 0:
+                return []
+            line_no += 1
+        lines = []
+        while line_no <= end_line and offset < len(mm):
+            end = mm.find(b"\n", offset)
+            end = len(mm) if end == -1 else end
+            lines.append(mm[offset:end].decode("utf-8", errors="replace"))
+            offset, line_no = end + 1, line_no + 1
+        return lines
+
+
+def read_workspace_file(path, start_line=None, end_line=None, byte_offset=None, byte_length=None,
+                        base_dir=None):
+    """Bounded read of one workspace file by line range or byte range."""
+    full_path = resolve_workspace_path(path, base_dir)
+    if not os.path.isfile(full_path):
+        return f"Error: {path} is not a file. Use the workspace list tool to see what exists."
+    stat = os.stat(full_path)
+    if stat.st_size > MAX_FILE_BYTES:
+        return f"Error: {path} is {stat.st_size} bytes, above the {MAX_FILE_BYTES} byte limit."
 
-class MyCustomToolInput(BaseModel):
-    """Input schema for MyCustomTool."""
-    argument: str = Field(..., description="Description of the argument.")
+    if byte_offset is not None or byte_length is not None:
+        offset = max(0, byte_offset or 0)
+        length = min(byte_length or MAX_RESPONSE_CHARS, MAX_RESPONSE_CHARS)
+        if stat.st_size == 0:
+            return f"{path} is empty."
+        with open(full_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = mm[offset:offset + length]
+        return (f"{path} bytes {offset}-{offset + len(data)} of {stat.st_size}:\n"
+                + data.decode("utf-8", errors="replace"))
 
-class MyCustomTool(BaseTool):
-    name: str = "Name of my tool"
+    start = max(1, start_line or 1)
+    end = min(end_line or start + MAX_LINES - 1, start + MAX_LINES - 1)
+    if stat.st_size > MMAP_THRESHOLD:
+        lines, total = _mmap_lines(full_path, start, end), "?"
+    else:
+        all_lines = file_cache.get(full_path, stat).splitlines()
+        lines, total = all_lines[start - 1:end], len(all_lines)
+    if not lines:
+        return f"{path} has no lines in range {start}-{end} (total lines: {total})."
+    numbered = "\n".join(f"{start + i:>5}| {line}" for i, line in enumerate(lines))
+    return _clip(f"{path} lines {start}-{start + len(lines) - 1} of {total}:\n{numbered}")
+
+
+def list_workspace(path="Results", base_dir=None):
+    """Directory listing with sizes, newest first, capped at MAX_LIST_ENTRIES."""
+    full_path = resolve_workspace_path(path or "Results", base_dir)
+    if not os.path.isdir(full_path):
+        return f"Error: {path} is not a directory."
+    with os.scandir(full_path) as entries:
+        entries = [e for e in entries if not e.name.startswith(".")]
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    lines = []
+    for entry in entries[:MAX_LIST_ENTRIES]:
+        if entry.is_dir():
+            lines.append(f"{entry.name}/")
+        else:
+            lines.append(f"{entry.name} ({entry.stat().st_size} bytes)")
+    if len(entries) > MAX_LIST_ENTRIES:
+        lines.append(f"[... {len(entries) - MAX_LIST_ENTRIES} more entries]")
+    return _clip(f"{path} ({len(entries)} entries):\n" + "\n".join(lines))
+
+
+# --- CREWAI TOOLS ---
+
+class WorkspaceReadInput(BaseModel):
+    """Input schema for WorkspaceReadTool."""
+    path: str = Field(..., description="File path starting with Results/ or knowledge/.")
+    start_line: Optional[int] = Field(None, description="First line to read (1-based).")
+    end_line: Optional[int] = Field(None, description=f"Last line to read; at most {MAX_LINES} lines per call.")
+    byte_offset: Optional[int] = Field(None, description="Read raw bytes from this offset instead of lines.")
+    byte_length: Optional[int] = Field(None, description="Number of bytes to read with byte_offset.")
+
+
+class WorkspaceReadTool(BaseTool):
+    name: str = "Read workspace file"
+    description: str = (
+        "Reads part of an existing file in Results/ (earlier generated projects) or knowledge/. "
+        f"Returns numbered lines, at most {MAX_LINES} lines or {MAX_RESPONSE_CHARS} characters per call; "
+        "ask for a line range instead of whole large files."
+    )
+    args_schema: Type[BaseModel] = WorkspaceReadInput
+
+    def _run(self, path: str, start_line: Optional[int] = None, end_line: Optional[int] = None,
+             byte_offset: Optional[int] = None, byte_length: Optional[int] = None) -> str:
+        try:
+            return read_workspace_file(path, start_line, end_line, byte_offset, byte_length)
+        except (OSError, ValueError) as e:
+            return f"Error: {e}"
+
+
+class WorkspaceListInput(BaseModel):
+    """Input schema for WorkspaceListTool."""
+    path: str = Field("Results", description="Directory starting with Results or knowledge.")
+
+
+class WorkspaceListTool(BaseTool):
+    name: str = "List workspace directory"
     description: str = (
-        "Clear description for what this tool is useful for, your agent will need this information to use it."
+        "Lists files and folders in Results/ (earlier generated projects) or knowledge/, "
+        "newest first, with file sizes."
     )
-    args_schema: Type[BaseModel] = MyCustomToolInput
+    args_schema: Type[BaseModel] = WorkspaceListInput
+
+    def _run(self, path: str = "Results") -> str:
+        try:
+            return list_workspace(path)
+        except (OSError, ValueError) as e:
+            return f"Error: {e}"
+
 
-    def _run(self, argument: str) -> str:
-        # Implementation goes here
-        return "this is an example of a tool output, ignore it and move along."
+def workspace_tools():
+    """The tools attached to the crew's agents (AGENTIC_AGENT_TOOLS=0 disables them)."""
+    if os.environ.get("AGENTIC_AGENT_TOOLS", "1") == "0":
+        return []
+    return [WorkspaceListTool(), WorkspaceReadTool()]
@@ -0,0 +1,168 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Optional JSON-lines file that collects every run's metrics
+AGGREGATE_LOG = os.environ.get("AGENTIC_METRICS_LOG")
+
+_current = contextvars.ContextVar("agentic_tracer", default=None)
+
+
+def current_tracer():
+    """The tracer of the run executing in this context, or None."""
+    return _current.get()
+
+
+class RunTracer:
+    """
+    Low-overhead timing for one crew run (a stand-in for the disabled OTEL SDK).
+
+    Records task spans, every LLM call (tokens, tokens/sec, queue wait) and
+    named steps such as extraction, then writes them to metrics.json.
+    """
+
+    def __init__(self, topic, task_names=("coding_task", "review_task")):
+        self.topic = topic
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._task_names = list(task_names)
+        self._task_index = 0
+        self._task_start = self._start
+        self.tasks = {name: {"wall_s": None, "llm_calls": 0, "prompt_tokens": 0,
+                             "completion_tokens": 0, "saved_tokens": 0} for name in task_names}
+        self.llm_calls = []
+        self.steps = {}
+        self.extra = {}
+        self._active_steps = []
+        self._active = 0
+
+    # --- RUN SCOPE ---
+
+    @contextmanager
+    def activate(self):
+        """Makes this tracer current for LLM calls made inside the block."""
+        token = _current.set(self)
+        self._active += 1
+        try:
+            yield self
+        finally:
+            self._active -= 1
+            _current.reset(token)
+
+    @contextmanager
+    def step(self, name):
+        """Times a named host-side step (e.g. extraction)."""
+        start = time.perf_counter()
+        self._active_steps.append(name)
+        try:
+            yield
+        finally:
+            self._active_steps.remove(name)
+            with self._lock:
+                self.steps[name] = round(self.steps.get(name, 0.0) + time.perf_counter() - start, 4)
+
+    def task_completed(self, _output=None):
+        """Crew task_callback: closes the current task span (tasks run sequentially)."""
+        now = time.perf_counter()
+        with self._lock:
+            if self._task_index < len(self._task_names):
+                name = self._task_names[self._task_index]
+                self.tasks[name]["wall_s"] = round(now - self._task_start, 4)
+                self._task_index += 1
+            self._task_start = now
+
+    def current_phase(self):
+        """Innermost running step, else the running task, else 'host' (read by the profiler)."""
+        steps = self._active_steps
+        if steps:
+            return steps[-1]
+        if self._active and self._task_index < len(self._task_names):
+            return self._task_names[self._task_index]
+        return "host"
+
+    # --- LLM CALLS ---
+
+    def llm_call(self, model, task_name, wall_s, metadata, first_token_s=None, budget=None,
+                 scheduler_wait_s=None):
+        """
+        Records one LLM request from Ollama's final stream metadata.
+        Queue wait is the client wall time Ollama did not account for.
+        `budget` is the agentic_code.budget report; saved prefill time is
+        the saved tokens at this call's measured prompt eval rate.
+        `scheduler_wait_s` is the time spent queued in agentic_code.scheduler
+        before the request was sent.
+        """
+        ns = 1e9
+        prompt_tokens = metadata.get("prompt_eval_count") or 0
+        completion_tokens = metadata.get("eval_count") or 0
+        eval_s = (metadata.get("eval_duration") or 0) / ns
+        server_s = (metadata.get("total_duration") or 0) / ns
+        call = {
+            "model": model,
+            "task": task_name,
+            "wall_s": round(wall_s, 4),
+            "first_token_s": round(first_token_s, 4) if first_token_s is not None else None,
+            "load_s": round((metadata.get("load_duration") or 0) / ns, 4),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "tokens_per_s": round(completion_tokens / eval_s, 2) if eval_s else None,
+            "queue_wait_s": round(max(0.0, wall_s - server_s), 4) if server_s else None,
+            "scheduler_wait_s": round(scheduler_wait_s, 4) if scheduler_wait_s is not None else None,
+        }
+        if budget is not None:
+            saved = max(0, budget["tokens_before"] - budget["tokens_after"])
+            prefill_s = (metadata.get("prompt_eval_duration") or 0) / ns
+            call["prompt_budget"] = budget["budget"]
+            call["estimated_prompt_tokens"] = budget["tokens_before"]
+            call["saved_tokens"] = saved
+            call["saved_prefill_s"] = round(saved * prefill_s / prompt_tokens, 4) if prompt_tokens else None
+            call["over_budget"] = budget["over_budget"]
+        with self._lock:
+            self.llm_calls.append(call)
+            task = self.tasks.get(task_name)
+            if task is not None:
+                task["llm_calls"] += 1
+                task["prompt_tokens"] += prompt_tokens
+                task["completion_tokens"] += completion_tokens
+                task["saved_tokens"] += call.get("saved_tokens", 0)
+        return call
+
+    # --- OUTPUT ---
+
+    def summary(self):
+        with self._lock:
+            llm_wall = sum(c["wall_s"] for c in self.llm_calls)
+            completion = sum(c["completion_tokens"] for c in self.llm_calls)
+            return {
+                "topic": self.topic,
+                "started_at": self.started_at,
+                "wall_s": round(time.perf_counter() - self._start, 4),
+                "llm_wall_s": round(llm_wall, 4),
+                "prompt_tokens": sum(c["prompt_tokens"] for c in self.llm_calls),
+                "completion_tokens": completion,
+                "tokens_per_s": round(completion / llm_wall, 2) if llm_wall else None,
+                "saved_tokens": sum(c.get("saved_tokens", 0) for c in self.llm_calls),
+                "saved_prefill_s": round(sum(c.get("saved_prefill_s") or 0 for c in self.llm_calls), 4),
+                "scheduler_wait_s": round(sum(c["scheduler_wait_s"] or 0 for c in self.llm_calls), 4),
+                "tasks": {name: dict(task) for name, task in self.tasks.items()},
+                "steps": dict(self.steps),
+                "llm_calls": list(self.llm_calls),
+                **self.extra,
+            }
+
+    def write(self, results_base, aggregate_log=AGGREGATE_LOG):
+        """Writes metrics.json into the project folder and appends to the aggregate log."""
+        metrics = self.summary()
+        metrics["project"] = os.path.basename(os.path.normpath(results_base))
+        os.makedirs(results_base, exist_ok=True)
+        with open(os.path.join(results_base, "metrics.json"), "w", encoding="utf-8") as f:
+            json.dump(metrics, f, indent=2)
+        if aggregate_log:
+            with open(aggregate_log, "a", encoding="utf-8") as f:
+                f.write(json.dumps(metrics) + "\n")
+        return metrics
@@ -0,0 +1,271 @@
+import ast
+import importlib
+import importlib.util
+import json
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from agentic_code.incremental import list_project_files, update_project
+
+REPAIR_ATTEMPTS = int(os.environ.get("AGENTIC_REPAIR_ATTEMPTS", "1"))
+VALIDATION_WORKERS = int(os.environ.get("AGENTIC_VALIDATION_WORKERS", "0")) or min(os.cpu_count() or 1, 8)
+
+
+def _issue(kind, message, line=None):
+    return {"kind": kind, "line": line, "message": message}
+
+
+# --- PYTHON FILES ---
+
+def _local_modules(project_dir):
+    """Dotted module name -> relative path for every Python file in the project."""
+    modules = {}
+    for rel_path in list_project_files(project_dir):
+        if not rel_path.endswith(".py"):
+            continue
+        parts = rel_path[:-3].split("/")
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+        if parts:
+            modules[".".join(parts)] = rel_path
+    return modules
+
+
+def defined_names(tree):
+    """Top-level names a module defines; None if it can't be known (star import, __getattr__)."""
+    names = set()
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                names.update(n.id for n in ast.walk(target) if isinstance(n, ast.Name))
+        elif isinstance(node, (ast.AnnAssign, ast.AugAssign)) and isinstance(node.target, ast.Name):
+            names.add(node.target.id)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name == "*":
+                    return None
+                names.add((alias.asname or alias.name).split(".")[0])
+        elif isinstance(node, (ast.If, ast.Try)):
+            # Conditional definitions: accept anything to avoid false positives
+            return None
+    return None if "__getattr__" in names else names
+
+
+def _requirements(project_dir):
+    path = os.path.join(project_dir, "requirements.txt")
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return {re.split(r"[<>=!~\[; ]", line.strip(), maxsplit=1)[0].lower().replace("_", "-")
+                for line in f if line.strip() and not line.startswith("#")}
+
+
+def _check_import(module, names, line, project_dir, local, issues):
+    """Checks one `import module` / `from module import names` statement."""
+    if module in local or any(m.startswith(module + ".") for m in local):
+        if not names or module not in local:
+            return
+        with open(os.path.join(project_dir, local[module]), "r", encoding="utf-8", errors="replace") as f:
+            try:
+                defined = defined_names(ast.parse(f.read()))
+            except SyntaxError:
+                return  # Reported for that file itself
+        for name in names:
+            if defined is not None and name not in defined and f"{module}.{name}" not in local:
+                issues["errors"].append(_issue("import", f"cannot import name '{name}' from '{module}'", line))
+        return
+
+    top = module.split(".")[0]
+    if top in local:
+        issues["errors"].append(_issue("import", f"No module named '{module}' in the project", line))
+        return
+    if importlib.util.find_spec(top) is None:
+        listed = top.lower().replace("_", "-") in _requirements(project_dir)
+        note = "listed in requirements.txt" if listed else "missing from requirements.txt"
+        issues["warnings"].append(_issue("dependency", f"'{top}' is not installed ({note})", line))
+        return
+    try:
+        imported = importlib.import_module(module)
+    except ModuleNotFoundError:
+        issues["errors"].append(_issue("import", f"No module named '{module}'", line))
+        return
+    except Exception as e:
+        issues["warnings"].append(_issue("import", f"'{module}' failed to import here: {e}", line))
+        return
+    for name in names:
+        if hasattr(imported, name):
+            continue
+        try:
+            # Submodule of a package; raises when `module` is a plain module
+            found = importlib.util.find_spec(f"{module}.{name}") is not None
+        except (ImportError, ValueError):
+            found = False
+        if not found:
+            issues["errors"].append(_issue("import", f"cannot import name '{name}' from '{module}'", line))
+
+
+def _validate_python(project_dir, rel_path, source, issues):
+    try:
+        compile(source, rel_path, "exec", dont_inherit=True)
+    except SyntaxError as e:
+        issues["errors"].append(_issue("syntax", e.msg, e.lineno))
+        return
+    except ValueError as e:
+        issues["errors"].append(_issue("syntax", str(e)))
+        return
+
+    local = _local_modules(project_dir)
+    package = rel_path[:-3].replace("/", ".").rsplit(".", 1)[0] if "/" in rel_path else ""
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                _check_import(alias.name, [], node.lineno, project_dir, local, issues)
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ""
+            if node.level:
+                base = package.split(".") if package else []
+                base = base[:len(base) - (node.level - 1)] if node.level > 1 else base
+                module = ".".join(base + ([module] if module else []))
+            names = [alias.name for alias in node.names if alias.name != "*"]
+            if module:
+                _check_import(module, names, node.lineno, project_dir, local, issues)
+
+
+# --- OTHER FILES ---
+
+def _validate_requirements(source, issues):
+    for line_no, line in enumerate(source.splitlines(), start=1):
+        line = line.strip()
+        if line and not line.startswith(("#", "-")) and not re.match(r"^[A-Za-z0-9][A-Za-z0-9._\-]*(\[.*\])?\s*([<>=!~]=?.*)?(;.*)?$", line):
+            issues["errors"].append(_issue("requirements", f"Unparseable requirement '{line}'", line_no))
+
+
+def validate_file(project_dir, rel_path):
+    """Checks one extracted file. Runs in a worker process; generated code is never executed."""
+    issues = {"errors": [], "warnings": []}
+    try:
+        with open(os.path.join(project_dir, rel_path), "r", encoding="utf-8") as f:
+            source = f.read()
+    except UnicodeDecodeError:
+        return rel_path, {"status": "skipped", **issues}
+
+    if rel_path.endswith(".py"):
+        _validate_python(project_dir, rel_path, source, issues)
+    elif os.path.basename(rel_path) == "requirements.txt":
+        _validate_requirements(source, issues)
+    elif rel_path.endswith(".json"):
+        try:
+            json.loads(source)
+        except ValueError as e:
+            issues["errors"].append(_issue("json", str(e)))
+
+    status = "error" if issues["errors"] else "warning" if issues["warnings"] else "ok"
+    return rel_path, {"status": status, **issues}
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _new_pool(workers):
+    import multiprocessing
+
+    # The hub, the job workers and the service are threaded: forking them can
+    # deadlock the child, so workers are spawned
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def get_pool():
+    """The process-wide validation pool, started on first use and kept for later projects."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _new_pool(VALIDATION_WORKERS)
+        return _pool
+
+
+def _reset_pool(broken):
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _validate_files(project_dir, files, workers=None):
+    """{rel_path: result} from the shared pool (or a pool of `workers` just for this call)."""
+    if workers:
+        with _new_pool(workers) as pool:
+            return dict(pool.map(validate_file, [project_dir] * len(files), files))
+    for attempt in range(2):
+        pool = get_pool()
+        try:
+            return dict(pool.map(validate_file, [project_dir] * len(files), files))
+        except BrokenProcessPool:
+            # A worker died (OOM, killed): start a fresh pool once
+            _reset_pool(pool)
+            if attempt:
+                raise
+
+
+def validate_project(project_dir, workers=None):
+    """
+    Validates every extracted file concurrently in a process pool and writes
+    the structured report to <project>/validation.json.
+    """
+    files = list_project_files(project_dir)
+    results = _validate_files(project_dir, files, workers) if files else {}
+
+    failing = sorted(path for path, result in results.items() if result["status"] == "error")
+    report = {"ok": not failing, "failing": failing, "files": results}
+    with open(os.path.join(project_dir, "validation.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for path in failing:
+        for error in results[path]["errors"]:
+            print(f"🔎 {path}:{error['line'] or '-'} {error['kind']}: {error['message']}")
+    print(f"🔎 Validation: {len(files) - len(failing)}/{len(files)} files passed")
+    return report
+
+
+def repair_request(report):
+    """Turns a validation report into a change request for the failing files."""
+    lines = ["Fix only these problems; keep everything else unchanged:"]
+    for path in report["failing"]:
+        for error in report["files"][path]["errors"]:
+            where = f"line {error['line']}" if error["line"] else "file"
+            lines.append(f"- {path} ({where}): {error['kind']} error: {error['message']}")
+    return "\n".join(lines)
+
+
+def validate_and_repair(project_dir, attempts=REPAIR_ATTEMPTS):
+    """
+    Validates the project and sends only the failing files back to the coder
+    (through the incremental update path) until it passes or attempts run out.
+    The report's 'repair_passes' counts the passes that were needed.
+    """
+    report = validate_project(project_dir)
+    passes = 0
+    for attempt in range(1, attempts + 1):
+        if report["ok"]:
+            break
+        passes = attempt
+        print(f"🛠️ Repair pass {attempt}/{attempts} for: {', '.join(report['failing'])}")
+        files = {}
+        for rel_path in report["failing"]:
+            with open(os.path.join(project_dir, rel_path), "r", encoding="utf-8", errors="replace") as f:
+                files[rel_path] = f.read()
+        try:
+            update_project(project_dir, repair_request(report), files=files)
+        except Exception as e:
+            # The files stay as extracted; the report still lists the problems
+            print(f"⚠️ Repair pass failed: {e}")
+            break
+        report = validate_project(project_dir)
+    report["repair_passes"] = passes
+    return report
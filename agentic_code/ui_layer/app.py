@@ -6,10 +6,30 @@ import sys
 root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(os.path.join(root_path, "src"))
 
-from agentic_code.crew import AgenticCodeCrew
-
 st.set_page_config(page_title="Agentic Code: Project Hub", layout="wide")
 
+
+@st.cache_resource
+def get_job_manager():
+    """One background job runner shared by every session of this server."""
+    from agentic_code.cache import ResultCache
+    from agentic_code.jobs import JobManager
+    from agentic_code.llms import prewarm_async
+    from agentic_code.main import job_runner
+
+    prewarm_async()
+
+    cache = ResultCache(os.path.join(root_path, ".cache", "crew_results"))
+    workers = int(os.environ.get("AGENTIC_HUB_WORKERS", "1"))
+    return JobManager(job_runner(root_path, cache), workers=workers)
+
+
+def get_llm_scheduler():
+    from agentic_code.scheduler import get_scheduler
+
+    return get_scheduler()
+
+
 # --- ADVANCED CSS FOR NEON UI MATCHING ---
 st.markdown("""
     <style>
@@ -62,62 +82,171 @@ st.markdown("""
 col_arch, col_task, col_mon = st.columns([1, 1.8, 1], gap="medium")
 
 # 1. Left: Archive
+ARCHIVE_PAGE_SIZE = 25
+
+
+@st.cache_resource
+def get_archive():
+    """Project index shared by every session; runs finished by the hub index themselves."""
+    from agentic_code.archive import ProjectArchive
+
+    archive = ProjectArchive(os.path.join(root_path, "Results"))
+    # Pick up folders created before the index existed or by the CLI elsewhere
+    archive.sync()
+    return archive
+
+
 with col_arch:
     st.subheader("📂 Project Archive")
-    results_dir = os.path.join(root_path, "Results")
-    if os.path.exists(results_dir):
-        folders = sorted([f for f in os.listdir(results_dir)], reverse=True)
-        st.selectbox("History", folders, label_visibility="collapsed")
-        st.button("📁 OPEN FOLDER", use_container_width=True)
+    archive = get_archive()
+    query = st.text_input("Search", placeholder="Search prompts and files...", label_visibility="collapsed")
+    page = st.session_state.get("archive_page", 1)
+    projects, total = archive.search(query, page=page - 1, page_size=ARCHIVE_PAGE_SIZE)
+    pages = max(1, -(-total // ARCHIVE_PAGE_SIZE))
+    if page > pages:
+        # A narrower search than the last one: jump back to the first page
+        st.session_state["archive_page"] = page = 1
+        projects, total = archive.search(query, page=0, page_size=ARCHIVE_PAGE_SIZE)
+
+    by_id = {p["project_id"]: p for p in projects}
+    selected = st.selectbox(
+        "History", list(by_id), label_visibility="collapsed",
+        format_func=lambda pid: f"{pid} · {(by_id[pid]['prompt'] or '')[:40]}",
+    )
+    st.number_input(f"Page (of {pages}, {total} projects)", min_value=1, max_value=pages, key="archive_page")
+    st.button("📁 OPEN FOLDER", use_container_width=True)
     st.markdown("---")
     st.write("**Project Meta**")
-    st.write("- **Framework:** CrewAI")
-    st.write("- **Status:** Local Node Ready")
+    project = by_id.get(selected)
+    if project:
+        if project["validation_ok"] is None:
+            validation = "Not validated"
+        elif project["validation_ok"]:
+            validation = "✅ Passed"
+        else:
+            validation = f"❌ Failing: {', '.join(project['failing'])}"
+        st.write(f"- **Prompt:** {project['prompt'] or 'unknown'}")
+        st.write(f"- **Models:** {', '.join(project['models']) or 'unknown'}")
+        st.write(f"- **Duration:** {project['wall_s'] or 0:.1f}s · {project['tokens']} tokens")
+        st.write(f"- **Files:** {project['file_count']} ({project['total_bytes'] / 1024:.1f} KB)")
+        st.write(f"- **Validation:** {validation}")
+    else:
+        st.write("- **Framework:** CrewAI")
+        st.write("- **Status:** Local Node Ready")
 
 # 2. Middle: Task
-# 2. Middle: Task
+TERMINAL_CHARS = 3000
+
 with col_task:
     st.subheader("🚀 New Agentic Task")
     prompt = st.text_area("Prompt", height=400, label_visibility="collapsed", placeholder="Define your solution...")
-    
+    profile_run = st.toggle("🔎 Profile run", help="Sample where the time goes: LLM wait vs. host-side work, "
+                                                 "per phase, plus a flamegraph file in the project folder.")
+
     if st.button("EXECUTE AGENTIC FLOW", use_container_width=True):
         if prompt:
-            with st.status("🛠️ Building...", expanded=True) as status:
-                # 1. Run the Crew
-                crew_instance = AgenticCodeCrew().crew()
-                result = crew_instance.kickoff(inputs={'topic': prompt})
-                
-                # 2. Import the saving logic from your main.py
-                from agentic_code.main import extract_and_save_files
-                import datetime
-
-                # 3. Create a unique folder for this run
-                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                project_dir = os.path.join(root_path, "Results", f"Project_{timestamp}")
-                
-                # 4. CRITICAL: Pass the agent's output to the saver
-                # We use result.raw to get the plain text string
-                extract_and_save_files(result.raw, project_dir)
-                
-                status.update(label="✅ Project Saved to Results!", state="complete")
-            st.balloons()
+            import datetime
+            import uuid
+
+            # Create a unique folder for this run and hand it to the background workers;
+            # the suffix keeps two sessions submitting in the same second apart
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            project_dir = os.path.join(root_path, "Results", f"Project_{timestamp}_{uuid.uuid4().hex[:6]}")
+            job_id = get_job_manager().submit(prompt, project_dir, profile=profile_run)
+
+            # Keep the job id in the URL so a browser refresh re-attaches to it
+            st.session_state["job_id"] = job_id
+            st.query_params["job"] = job_id
+            st.toast(f"🛠️ Job {job_id} queued")
         else:
             st.error("Please enter a prompt.")
 
+    # Live tokens of the current job; the fragment redraws at most once per
+    # second however fast the model streams
+    @st.fragment(run_every="1s")
+    def render_terminal():
+        job_id = st.session_state.get("job_id") or st.query_params.get("job")
+        live = get_job_manager().live(job_id) if job_id else None
+        if not live or not live["agents"]:
+            st.code("Waiting for the first token...", language=None)
+            return
+
+        agent_cols = st.columns(len(live["agents"]))
+        for col, (agent_name, stats) in zip(agent_cols, live["agents"].items()):
+            rate = f"{stats['tokens_per_s']} tok/s" if stats["tokens_per_s"] else stats["state"]
+            ttft = f"TTFT {stats['first_token_s']}s" if stats["first_token_s"] is not None else "prefill..."
+            col.metric(agent_name, rate, ttft, delta_color="off")
+        st.code(live["text"][-TERMINAL_CHARS:], language=None)
+
+    render_terminal()
+
 # 3. Right: Monitor
+TASK_CARDS = (
+    ("coding_task", "res-glow", "#00BFFF", "🔍 Analyst Agent"),
+    ("review_task", "cod-glow", "#FFD700", "👨‍💻 Coder Agent"),
+)
+TASK_STATE_LABELS = {
+    "pending": "Waiting...",
+    "running": "Working...",
+    "done": "Complete",
+    "failed": "Failed",
+}
+
 with col_mon:
     st.subheader("📡 Real-Time Monitor")
-    st.markdown("""
-        <div class="monitor-card res-glow">
-            <strong style="color: #00BFFF;">🔍 Researcher Agent</strong><br>
-            <span style="font-size: 12px; color: #8b949e;">Analyzing Requirements...</span>
-        </div>
-        <div class="monitor-card cod-glow">
-            <strong style="color: #FFD700;">👨‍💻 Coder Agent</strong><br>
-            <span style="font-size: 12px; color: #8b949e;">Generating Python Logic...</span>
-        </div>
-        <div class="monitor-card rev-glow">
-            <strong style="color: #39FF14;">🛡️ Reviewer Agent</strong><br>
-            <span style="font-size: 12px; color: #8b949e;">Validating YAML Config...</span>
-        </div>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+
+    @st.fragment(run_every="2s")
+    def render_monitor():
+        manager = get_job_manager()
+        job_id = st.session_state.get("job_id") or st.query_params.get("job")
+        job = manager.get(job_id) if job_id else None
+
+        cards = ""
+        for task_name, glow, color, title in TASK_CARDS:
+            state = job["tasks"][task_name] if job else "pending"
+            cards += f"""
+                <div class="monitor-card {glow}">
+                    <strong style="color: {color};">{title}</strong><br>
+                    <span style="font-size: 12px; color: #8b949e;">{task_name}: {TASK_STATE_LABELS[state]}</span>
+                </div>"""
+        status_text = f"Job {job['id']}: {job['status']}" if job else "No active job"
+        llm_queue = get_llm_scheduler().stats()
+        llm_wait = llm_queue["priorities"]["interactive"]["avg_wait_s"] or 0
+        cards += f"""
+            <div class="monitor-card rev-glow">
+                <strong style="color: #39FF14;">🛡️ Job Queue</strong><br>
+                <span style="font-size: 12px; color: #8b949e;">{status_text} · {manager.queue_depth()} queued</span><br>
+                <span style="font-size: 12px; color: #8b949e;">LLM queue: {llm_queue['queue_depth']} waiting · avg wait {llm_wait:.1f}s</span>
+            </div>"""
+        st.markdown(cards, unsafe_allow_html=True)
+
+        if job and job["status"] == "done":
+            st.success(f"✅ Project Saved to Results! ({os.path.basename(job['project_dir'])})")
+            if job["profile"]:
+                render_profile(job["project_dir"])
+        elif job and job["status"] == "failed":
+            st.error(f"❌ Critical Failure in Crew Execution: {job['error']}")
+
+    def render_profile(project_dir):
+        import json
+
+        try:
+            with open(os.path.join(project_dir, "metrics.json"), "r", encoding="utf-8") as f:
+                profile = json.load(f).get("profile")
+        except (OSError, ValueError):
+            profile = None
+        if not profile:
+            return
+        totals = profile["totals_s"]
+        st.write(f"**🔎 Profile** · LLM wait {totals['llm_wait']:.1f}s · queue {totals['llm_queue']:.1f}s · "
+                 f"host {totals['host']:.1f}s")
+        st.table({phase: seconds for phase, seconds in profile["phases_s"].items()})
+        for entry in profile["host_agentic_code_s"][:5]:
+            st.caption(f"🔥 {entry['function']}: {entry['seconds']:.2f}s")
+        folded_path = os.path.join(project_dir, profile["flamegraph"])
+        if os.path.exists(folded_path):
+            with open(folded_path, "rb") as f:
+                st.download_button("⬇️ Flamegraph stacks", f.read(), file_name=profile["flamegraph"],
+                                   use_container_width=True)
+
+    render_monitor()
@@ -0,0 +1,137 @@
+"""
+Equivalence check and benchmark for the '--- FILE:' marker scanner.
+
+Compares agentic_code.markers.iter_file_blocks against the DOTALL regex it
+replaced, on a corpus of realistic and malformed outputs plus random fuzz,
+then times both on large and adversarial inputs.
+
+    python tests/bench_parser.py [--fuzz 20000] [--size 2000] [--json out.json]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "agentic_code", "src")))
+from agentic_code.markers import iter_file_blocks  # noqa: E402
+
+LEGACY_PATTERN = r'--- FILE:\s*(.*?)\s*---\s*(.*?)(?=\s*--- FILE:|$)'
+
+
+def legacy_blocks(text):
+    """The original extract_and_save_files parsing, kept as the reference."""
+    start_index = text.find("--- FILE:")
+    if start_index == -1:
+        return []
+    blocks = []
+    for rel_path, content in re.findall(LEGACY_PATTERN, text[start_index:], re.DOTALL):
+        rel_path = rel_path.strip().replace('\\', '/')
+        clean_content = content.strip()
+        if clean_content.startswith("```"):
+            clean_content = re.sub(r'^```[a-zA-Z0-9]*\n', '', clean_content)
+            clean_content = re.sub(r'```$', '', clean_content)
+        blocks.append((rel_path, clean_content.strip()))
+    return blocks
+
+
+def scanner_blocks(text):
+    return list(iter_file_blocks(text))
+
+
+CORPUS = {
+    "typical": (
+        "Thought: done\nFinal Answer:\n"
+        "--- FILE: src/__init__.py ---\n\n"
+        "--- FILE: src/engine.py ---\n```python\ndef run():\n    return 1\n```\n"
+        "--- FILE: app.py ---\n```python\nfrom src.engine import run\nprint(run())\n```\n"
+        "--- FILE: requirements.txt ---\nstreamlit\npandas\n"
+    ),
+    "no_markers": "Here is some code:\n```python\nprint('hi')\n```\n",
+    "unterminated_fence": "--- FILE: a.py ---\n```python\nprint(1)\n--- FILE: b.py ---\n```\nx = 2\n",
+    "fence_only": "--- FILE: a.py ---\n```\n--- FILE: b.py ---\n```python\n",
+    "fence_with_space": "--- FILE: a.py ---\n```python \nprint(1)\n```",
+    "inline_close": "--- FILE: a.py ---\n```py\nx = 1```",
+    "windows_paths": "--- FILE: src\\engine.py ---\ncode\r\n--- FILE: .\\app.py ---\r\nui\r\n",
+    "duplicates": "--- FILE: app.py ---\nv1\n--- FILE: app.py ---\nv2\n--- FILE: app.py ---\nv3",
+    "missing_header_close": "--- FILE: a.py\nprint(1)\n--- FILE: b.py ---\nprint(2)\n",
+    "trailing_open_marker": "--- FILE: a.py ---\nx\n--- FILE: b.py",
+    "empty_name": "--- FILE: ---\nbody\n--- FILE:---\n",
+    "extra_dashes": "--- FILE: a.py -----\nbody\n",
+    "crlf_fences": "--- FILE: a.py ---\r\n```python\r\nprint(1)\r\n```\r\n",
+    "preamble": "Sure! Below are the files.\n\n--- FILE: main.py ---\nprint('x')\n",
+    "trailing_newline": "--- FILE: a.py ---\nx\n",
+    "unicode_ws": "--- FILE:\u00a0a.py\u2003---\u2028body\u00a0\n",
+}
+
+FUZZ_ATOMS = ["--- FILE: ", "--- FILE:", "---", "--", " ", "\n", "\r\n", "\t", "a.py", "src/b.py",
+              "src\\c.py", "```", "```python\n", "```py", "print(1)", "x", "`", "-", "FILE:", " "]
+
+
+def check_equivalence(fuzz_cases, seed=0):
+    failures = []
+    for name, text in CORPUS.items():
+        if legacy_blocks(text) != scanner_blocks(text):
+            failures.append(name)
+    rng = random.Random(seed)
+    for i in range(fuzz_cases):
+        text = "".join(rng.choice(FUZZ_ATOMS) for _ in range(rng.randint(0, 40)))
+        if legacy_blocks(text) != scanner_blocks(text):
+            failures.append(f"fuzz#{i}: {text!r}")
+    return failures
+
+
+def timed(func, text, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark(size):
+    body = "\n".join(f"    value_{i} = compute({i})" for i in range(40))
+    inputs = {
+        "multi_file": "".join(f"--- FILE: src/mod_{i}.py ---\n```python\n{body}\n```\n" for i in range(size)),
+        "marker_dense": "".join(f"--- FILE: f{i} ---x" for i in range(size * 20)),
+        "whitespace_runs": "--- FILE: a.py ---\n" + ("x" + " " * 2000 + "\n") * (size // 10 or 1),
+    }
+    results = {}
+    for name, text in inputs.items():
+        legacy_s = timed(legacy_blocks, text)
+        scanner_s = timed(scanner_blocks, text)
+        results[name] = {
+            "bytes": len(text),
+            "legacy_s": round(legacy_s, 5),
+            "scanner_s": round(scanner_s, 5),
+            "speedup": round(legacy_s / scanner_s, 2) if scanner_s else None,
+        }
+        print(f"{name:<16} {len(text) / 1e6:7.2f} MB  legacy {legacy_s:.4f}s  scanner {scanner_s:.4f}s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fuzz", type=int, default=20000, help="Random fuzz cases")
+    parser.add_argument("--size", type=int, default=2000, help="Files in the benchmark inputs")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    failures = check_equivalence(args.fuzz)
+    print(f"Equivalence: {len(CORPUS)} corpus + {args.fuzz} fuzz cases, {len(failures)} mismatches")
+    for failure in failures[:10]:
+        print(f"  MISMATCH {failure}")
+
+    results = {"mismatches": failures, "benchmark": benchmark(args.size)}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
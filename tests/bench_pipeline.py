@@ -0,0 +1,154 @@
+"""
+End-to-end pipeline benchmark against the fake Ollama server.
+
+Measures extraction throughput (one-shot and streaming) on large multi-file
+outputs and, when CrewAI is installed, crew construction, kickoff overhead
+and total wall time. No GPU or real models are needed.
+
+    python tests/bench_pipeline.py [--files 200] [--tps 400] [--json bench.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fake_ollama import FakeOllamaServer, make_project_output, tokenize  # noqa: E402
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "agentic_code", "src"))
+
+
+def quietly(func, *args, **kwargs):
+    """Runs func with the extractor's per-file prints suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def stream_tokens(extractor, tokens):
+    for token in tokens:
+        extractor.feed(token)
+    return extractor.close()
+
+
+def bench_extraction(workdir, files, lines_per_file, repeat):
+    from agentic_code.main import extract_and_save_files
+    from agentic_code.streaming import StreamingFileExtractor
+
+    text = make_project_output(files=files, lines_per_file=lines_per_file)
+    size_mb = len(text.encode("utf-8")) / 1e6
+    tokens = tokenize(text)
+
+    one_shot, streaming = [], []
+    for i in range(repeat):
+        target = os.path.join(workdir, "Results", f"oneshot_{i}")
+        start = time.perf_counter()
+        quietly(extract_and_save_files, text, target)
+        one_shot.append(time.perf_counter() - start)
+
+        target = os.path.join(workdir, "Results", f"stream_{i}")
+        start = time.perf_counter()
+        quietly(stream_tokens, StreamingFileExtractor(target), tokens)
+        streaming.append(time.perf_counter() - start)
+
+    best_one, best_stream = min(one_shot), min(streaming)
+    return {
+        "files": files,
+        "bytes": len(text.encode("utf-8")),
+        "tokens": len(tokens),
+        "one_shot_s": round(best_one, 4),
+        "one_shot_mb_s": round(size_mb / best_one, 2),
+        "streaming_s": round(best_stream, 4),
+        "streaming_mb_s": round(size_mb / best_stream, 2),
+    }
+
+
+def bench_crew(workdir, fake, topic):
+    try:
+        import crewai  # noqa: F401
+    except ImportError:
+        return {"skipped": "crewai not installed"}
+
+    from agentic_code.main import run_topic
+
+    total_start = time.perf_counter()
+    start = time.perf_counter()
+    from agentic_code.crew import AgenticCodeCrew
+
+    import_s = time.perf_counter() - start
+    start = time.perf_counter()
+    AgenticCodeCrew().crew()
+    construct_s = time.perf_counter() - start
+
+    # Host cost of a pooled crew once the first one exists
+    from agentic_code.crew_pool import CrewFactory
+
+    factory = CrewFactory()
+    factory.release(*factory.acquire())
+    start = time.perf_counter()
+    factory.release(*factory.acquire())
+    pooled_s = time.perf_counter() - start
+
+    # Generation time the fake server spends per request, to isolate host overhead
+    tokens = len(tokenize(fake.response))
+    generation_per_call = tokens / fake.tokens_per_second if fake.tokens_per_second else 0.0
+    calls_before = len(fake.requests)
+
+    start = time.perf_counter()
+    quietly(run_topic, topic, os.path.join(workdir, "Results", "crew_run"), cache=None)
+    kickoff_s = time.perf_counter() - start
+    llm_calls = len(fake.requests) - calls_before
+
+    return {
+        "crew_import_s": round(import_s, 4),
+        "crew_construct_s": round(construct_s, 4),
+        "crew_pooled_acquire_s": round(pooled_s, 6),
+        "kickoff_s": round(kickoff_s, 4),
+        "llm_calls": llm_calls,
+        "simulated_generation_s": round(generation_per_call * llm_calls, 4),
+        "kickoff_overhead_s": round(kickoff_s - generation_per_call * llm_calls, 4),
+        "total_wall_s": round(time.perf_counter() - total_start, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=200, help="File blocks in the large output")
+    parser.add_argument("--lines", type=int, default=200, help="Lines per generated file")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tps", type=float, default=400.0, help="Fake server tokens per second")
+    parser.add_argument("--json", help="Write results to this file (default: stdout only)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="agentic_bench_")
+    with FakeOllamaServer(tokens_per_second=args.tps) as fake:
+        # llms.py reads the endpoint at import time
+        os.environ["OLLAMA_HOST"] = fake.base_url
+        sys.path.insert(0, SRC)
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            results = {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "extraction": bench_extraction(workdir, args.files, args.lines, args.repeat),
+                "crew": bench_crew(workdir, fake, "Build a unit converter"),
+            }
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Cold-start benchmark for the CLI entry points and the Streamlit hub.
+
+Every measurement runs in a fresh interpreter inside an empty working
+directory, so each command takes its cheap "nothing to do" path. The script
+fails if a command exceeds the budget or pulls in the LLM stack.
+
+    python tests/bench_startup.py [--budget 1.0] [--repeat 3] [--json out.json]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+PROJECT = os.path.join(ROOT, "agentic_code")
+SRC = os.path.join(PROJECT, "src")
+HEAVY_MODULES = ("crewai", "crewai_tools", "langchain_ollama", "litellm")
+
+# Calls one entry point the way the console script would and reports what it loaded
+PROBE = """
+import sys, time, json, importlib
+start = time.perf_counter()
+module_name, func_name = sys.argv[1].split(":")
+module = importlib.import_module(module_name)
+func = getattr(module, func_name, None)
+imported = time.perf_counter()
+if func is not None:
+    sys.argv = [func_name, "__missing__"]
+    try:
+        func()
+    except SystemExit:
+        pass
+done = time.perf_counter()
+heavy = sorted({m.split(".")[0] for m in sys.modules} & set(%r))
+print(json.dumps({"found": func is not None, "import": imported - start,
+                  "call": done - imported, "heavy": heavy}))
+""" % (HEAVY_MODULES,)
+
+# Runs one script pass of ui_layer/app.py the way `streamlit run` would, without
+# a server. The app is executed as if it lived in the empty working directory,
+# so its archive and job manager start from nothing. Without Streamlit
+# installed, a stand-in answers every st.* call with its default value.
+HUB_PROBE = """
+import sys, os, time, json, types
+APP = sys.argv[1]
+
+
+class _Container:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def _stub_streamlit():
+    st = types.ModuleType("streamlit")
+    st.__getattr__ = lambda name: (lambda *args, **kwargs: None)
+    st.session_state, st.query_params = {}, {}
+
+    def decorator(func=None, **kwargs):
+        return func if callable(func) else (lambda f: f)
+
+    st.cache_resource = st.fragment = decorator
+    st.columns = lambda spec, **kwargs: [_Container() for _ in range(spec if isinstance(spec, int) else len(spec))]
+    st.text_input = st.text_area = lambda *args, **kwargs: ""
+    st.button = st.toggle = lambda *args, **kwargs: False
+    st.selectbox = lambda label, options, *args, **kwargs: next(iter(options), None)
+    st.number_input = lambda *args, min_value=None, value=None, **kwargs: value if value is not None else min_value
+    sys.modules["streamlit"] = st
+
+
+start = time.perf_counter()
+try:
+    import streamlit
+    streamlit_ok = True
+except ImportError:
+    _stub_streamlit()
+    streamlit_ok = False
+with open(APP, "r", encoding="utf-8") as f:
+    code = compile(f.read(), APP, "exec")
+exec(code, {"__name__": "__main__", "__file__": os.path.join(os.getcwd(), "ui_layer", "app.py")})
+done = time.perf_counter()
+heavy = sorted({m.split(".")[0] for m in sys.modules} & set(%r))
+print(json.dumps({"found": True, "import": done - start, "call": 0.0,
+                  "heavy": heavy, "streamlit": streamlit_ok}), flush=True)
+# The job manager's workers and the pre-warm thread must not hold the process open
+os._exit(0)
+""" % (HEAVY_MODULES,)
+HUB_APP = os.path.join(PROJECT, "ui_layer", "app.py")
+
+
+def declared_scripts():
+    """Reads [project.scripts] from pyproject.toml."""
+    with open(os.path.join(PROJECT, "pyproject.toml"), "r", encoding="utf-8") as f:
+        text = f.read()
+    section = re.search(r"^\[project\.scripts\]\s*$(.*?)(?=^\[)", text, re.S | re.M)
+    scripts = {}
+    for name, target in re.findall(r'^(\w+)\s*=\s*"([^"]+)"', section.group(1), re.M):
+        scripts[name] = target
+    return scripts
+
+
+def measure(code, args, workdir):
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", code, *args], cwd=workdir, env=env,
+                          capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1:], "wall": wall}
+    # Background threads of the probed app may print after the result line
+    result = json.loads([line for line in proc.stdout.splitlines() if line.startswith("{")][-1])
+    result["wall"] = wall
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget", type=float, default=1.0, help="Max cold-start seconds per command")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per command (best is reported)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    targets = [(name, PROBE, [target]) for name, target in declared_scripts().items()]
+    targets.append(("streamlit_hub", HUB_PROBE, [HUB_APP]))
+
+    results = {}
+    failed = False
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, code, probe_args in targets:
+            runs = [measure(code, probe_args, workdir) for _ in range(args.repeat)]
+            best = min(runs, key=lambda r: r["wall"])
+            results[name] = best
+            if "error" in best:
+                status = f"ERROR {best['error']}"
+                failed = True
+            elif not best["found"]:
+                # A console script pointing at a missing function fails at install time too
+                status = "FAIL not implemented"
+                failed = True
+            elif best["heavy"]:
+                status = f"FAIL loaded {', '.join(best['heavy'])}"
+                failed = True
+            elif best["wall"] > args.budget:
+                status = "FAIL over budget"
+                failed = True
+            else:
+                status = "ok"
+            print(f"{name:<18} {best['wall']:.3f}s  {status}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"budget": args.budget, "results": results}, f, indent=2)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
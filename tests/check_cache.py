@@ -0,0 +1,68 @@
+"""
+Checks that a repeated topic is served from the result cache.
+
+Runs the same topic twice through run_topic with the crew kickoff replaced
+by a canned answer: the first run must call it, the second must be a cache
+hit even though the first run's project is now in Results/ (and so in the
+retrieval index). Needs neither Ollama nor CrewAI.
+
+    python tests/check_cache.py
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "agentic_code", "src"))
+sys.path.insert(0, SRC)
+
+from agentic_code import main  # noqa: E402
+from agentic_code.cache import ResultCache  # noqa: E402
+
+ANSWER = "--- FILE: app.py ---\n```python\nfrom src.engine import convert\n\nprint(convert(1))\n```\n" \
+         "--- FILE: src/engine.py ---\n```python\ndef convert(value):\n    return value * 2\n```\n"
+
+
+def main_check():
+    failures = []
+
+    def check(name, ok):
+        print(f"{'✅' if ok else '❌'} {name}")
+        if not ok:
+            failures.append(name)
+
+    kickoffs = []
+
+    def canned_kickoff(topic, results_base, tracer, *args, **kwargs):
+        # Retrieval runs as it would before a real crew
+        main.build_context(topic, results_base)
+        kickoffs.append(topic)
+        return ANSWER, None
+
+    main._kickoff = canned_kickoff
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            cache = ResultCache(os.path.join(workdir, ".cache", "crew_results"))
+            topic = "Build a unit converter"
+            with contextlib.redirect_stdout(io.StringIO()):
+                first = main.run_topic(topic, os.path.join("Results", "Project_1"), cache=cache)
+                after_first = len(kickoffs)
+                second = main.run_topic(topic, os.path.join("Results", "Project_2"), cache=cache)
+                after_second = len(kickoffs)
+                main.run_topic(topic, os.path.join("Results", "Project_3"), cache=cache, fanout=True)
+        finally:
+            os.chdir(cwd)
+
+    check("the first run calls the crew", after_first == 1)
+    check("the repeated topic is a cache hit", after_second == 1 and cache.hits == 1)
+    check("the hit returns the cached output", first == second == ANSWER)
+    check("fan-out mode has its own cache entry", len(kickoffs) == 2)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main_check()
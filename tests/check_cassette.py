@@ -0,0 +1,76 @@
+"""
+Offline check of the LLM record/replay layer.
+
+Records a fake streamed answer through a cassette, replays it through the
+client the crew would get from agentic_code.llms, and checks prompt
+normalization, answer order for repeated prompts and the miss error. Needs
+neither Ollama nor langchain.
+
+    python tests/check_cassette.py
+"""
+import os
+import sys
+import tempfile
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "agentic_code", "src"))
+sys.path.insert(0, SRC)
+
+from agentic_code import llms  # noqa: E402
+from agentic_code.cassette import Cassette, CassetteMiss, ReplayChunk, use_cassette  # noqa: E402
+
+
+class ScriptedClient:
+    """Streams the given answers in order, like ChatOllama.stream."""
+
+    def __init__(self, answers):
+        self.answers = list(answers)
+
+    def stream(self, messages, stop=None):
+        text = self.answers.pop(0)
+        for i in range(0, len(text), 5):
+            yield ReplayChunk(text[i:i + 5])
+        yield ReplayChunk("", {"done": True, "eval_count": len(text), "prompt_eval_count": 12})
+
+
+def collect(client, content):
+    chunks = list(client.stream([{"role": "user", "content": content}]))
+    return "".join(c.content for c in chunks), chunks[-1].response_metadata
+
+
+def main():
+    failures = []
+
+    def check(name, ok):
+        print(f"{'✅' if ok else '❌'} {name}")
+        if not ok:
+            failures.append(name)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "cassettes", "check.json.gz")
+        recorder = Cassette(path, mode="record").client("coder", ScriptedClient(["first", "second"]))
+        collect(recorder, "Build Results/Project_20260101_120000 now")
+        collect(recorder, "Build Results/Project_20260101_120000 now")
+
+        replay = Cassette(path, mode="replay")
+        use_cassette(replay)
+        client = llms.get_client("coder")
+        check("replay client needs no langchain", "langchain_ollama" not in sys.modules)
+        text, metadata = collect(client, "Build  Results/Project_20261018_080000\nnow")
+        check("volatile project names and whitespace are normalized", text == "first")
+        check("final chunk carries the recorded metadata", metadata.get("done") and metadata.get("eval_count") == 5)
+        later_run = "Build Results/Project_20261018_090000 now"
+        check("repeated prompts replay in recorded order", collect(client, later_run)[0] == "second")
+        replay.rewind()
+        check("rewind starts over", collect(client, later_run)[0] == "first")
+        try:
+            collect(client, "an unrecorded prompt")
+            check("unrecorded prompts raise CassetteMiss", False)
+        except CassetteMiss:
+            check("unrecorded prompts raise CassetteMiss", True)
+        check("pre-warming is skipped on replay", llms.prewarm(["coder"]) == {})
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
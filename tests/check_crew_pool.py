@@ -0,0 +1,99 @@
+"""
+Checks that a pooled crew starts every job from a clean slate.
+
+Resets a crew stand-in and, when CrewAI is installed, runs the same topic
+twice through CrewFactory against the fake Ollama server: both runs must send
+the same first prompt, with nothing left over from the previous job.
+
+    python tests/check_crew_pool.py
+"""
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fake_ollama import FakeOllamaServer  # noqa: E402
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "agentic_code", "src"))
+sys.path.insert(0, SRC)
+
+from agentic_code.crew_pool import _reset_run_state  # noqa: E402
+
+
+def stand_in_crew():
+    """The attributes a finished kickoff leaves on a crew, its agents and tools."""
+    executor = SimpleNamespace(messages=[{"role": "system", "content": "old"}], iterations=3,
+                               have_forced_answer=True)
+    tool = SimpleNamespace(current_usage_count=2)
+    agent = SimpleNamespace(agent_executor=executor, tools_results=[{"result": "old"}],
+                            tools_handler=SimpleNamespace(last_used_tool={"tool": "old"}),
+                            cache_handler=SimpleNamespace(_cache={"key": "old"}), tools=[tool])
+    task = SimpleNamespace(output="old", callback=print, used_tools=1, tools_errors=1, delegations=1)
+    return SimpleNamespace(agents=[agent], tasks=[task], task_callback=print, usage_metrics="old")
+
+
+def first_prompts(fake, factory, topic, runs=2):
+    """Messages of the first /api/chat request of each pooled run."""
+    prompts = []
+    for _ in range(runs):
+        start = len(fake.requests)
+        crew, generation = factory.acquire()
+        with contextlib.redirect_stdout(io.StringIO()):
+            crew.kickoff(inputs={"topic": topic, "context": "No related notes."})
+        factory.release(crew, generation)
+        chats = [r["body"] for r in fake.requests[start:] if r["path"] == "/api/chat"]
+        prompts.append(chats[0]["messages"] if chats else None)
+    return prompts
+
+
+def main():
+    failures = []
+
+    def check(name, ok):
+        print(f"{'✅' if ok else '❌'} {name}")
+        if not ok:
+            failures.append(name)
+
+    crew = stand_in_crew()
+    _reset_run_state(crew)
+    agent, task = crew.agents[0], crew.tasks[0]
+    check("executor conversation is cleared", agent.agent_executor.messages == [])
+    check("executor counters are reset", agent.agent_executor.iterations == 0
+          and not agent.agent_executor.have_forced_answer)
+    check("tool results and tool cache are cleared", agent.tools_results == [] and agent.cache_handler._cache == {}
+          and agent.tools_handler.last_used_tool == {})
+    check("tool usage counts are reset", agent.tools[0].current_usage_count == 0)
+    check("task output and callbacks are cleared", task.output is None and task.callback is None
+          and crew.task_callback is None)
+
+    try:
+        import crewai  # noqa: F401
+    except ImportError:
+        print("⏭️ CrewAI not installed: skipping the pooled kickoff check")
+        sys.exit(1 if failures else 0)
+
+    workdir = tempfile.mkdtemp(prefix="agentic_pool_")
+    cwd = os.getcwd()
+    with FakeOllamaServer(tokens_per_second=0) as fake:
+        # llms.py reads the endpoint at import time
+        os.environ["OLLAMA_HOST"] = fake.base_url
+        os.chdir(workdir)
+        try:
+            from agentic_code.crew_pool import CrewFactory
+
+            first, second = first_prompts(fake, CrewFactory(), "Build a unit converter")
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(workdir, ignore_errors=True)
+    check("both pooled runs sent a prompt", first is not None and second is not None)
+    check("a reused crew sends the same first prompt", first == second)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
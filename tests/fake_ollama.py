@@ -0,0 +1,211 @@
+"""
+Local stand-in for an Ollama server, for benchmarks and offline runs.
+
+Speaks the native API used by the shared ChatOllama clients (/api/chat,
+/api/generate, /api/tags) and the OpenAI-compatible /v1/chat/completions,
+streaming a canned response at a fixed token rate.
+
+    python tests/fake_ollama.py --port 11434 --tps 40 [--response file.txt]
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_project_output(files=4, lines_per_file=40):
+    """A canned coder answer with `files` '--- FILE:' blocks."""
+    names = ["src/__init__.py", "src/engine.py", "app.py", "requirements.txt"]
+    names += [f"src/module_{i}.py" for i in range(len(names), files)]
+    blocks = []
+    for name in names[:files]:
+        body = "\n".join(f"value_{i} = {i} * 2  # generated line" for i in range(lines_per_file))
+        blocks.append(f"--- FILE: {name} ---\n```python\n{body}\n```\n")
+    return "Final Answer:\n" + "\n".join(blocks)
+
+
+def tokenize(text):
+    """Splits text into word-ish tokens, roughly like a BPE stream."""
+    return re.findall(r"\s*\S+|\s+", text)
+
+
+class FakeOllamaServer:
+    """
+    Threaded HTTP server streaming `response` at `tokens_per_second`.
+
+    Use as a context manager; `base_url` points at the native API root.
+    """
+
+    def __init__(self, response=None, tokens_per_second=200.0, load_seconds=0.0, port=0):
+        self.response = response if response is not None else make_project_output()
+        self.tokens_per_second = tokens_per_second
+        self.load_seconds = load_seconds
+        self.requests = []
+        self._loaded = set()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- SIMULATION ---
+
+    def _load(self, model):
+        """Charges the model load time once per model, like a cold Ollama."""
+        with self._lock:
+            cold = model not in self._loaded
+            self._loaded.add(model)
+        if cold and self.load_seconds:
+            time.sleep(self.load_seconds)
+        return self.load_seconds if cold else 0.0
+
+    def _tokens(self):
+        delay = 1.0 / self.tokens_per_second if self.tokens_per_second else 0.0
+        for token in tokenize(self.response):
+            if delay:
+                time.sleep(delay)
+            yield token
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _body(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def _send_json(self, payload):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _start_stream(self, content_type):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+            def _chunk(self, data):
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._send_json({"models": [{"name": m} for m in sorted(server._loaded)]})
+                elif self.path == "/api/version":
+                    self._send_json({"version": "0.0.0-fake"})
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                body = self._body()
+                with server._lock:
+                    server.requests.append({"path": self.path, "body": body})
+                if self.path == "/api/generate" and not body.get("prompt"):
+                    load_s = server._load(body.get("model"))
+                    self._send_json({"model": body.get("model"), "response": "", "done": True,
+                                     "load_duration": int(load_s * 1e9)})
+                elif self.path in ("/api/chat", "/api/generate"):
+                    self._native(body)
+                elif self.path == "/v1/chat/completions":
+                    self._openai(body)
+                else:
+                    self.send_error(404)
+
+            def _native(self, body):
+                model = body.get("model")
+                start = time.perf_counter()
+                load_s = server._load(model)
+                key = "message" if self.path == "/api/chat" else "response"
+                if body.get("stream", True) is False:
+                    text = "".join(server._tokens())
+                    payload = {"role": "assistant", "content": text} if key == "message" else text
+                    self._send_json({"model": model, key: payload, "done": True,
+                                     "load_duration": int(load_s * 1e9)})
+                    return
+                self._start_stream("application/x-ndjson")
+                count = 0
+                for token in server._tokens():
+                    count += 1
+                    payload = {"role": "assistant", "content": token} if key == "message" else token
+                    self._chunk(json.dumps({"model": model, key: payload, "done": False}).encode() + b"\n")
+                total_ns = int((time.perf_counter() - start) * 1e9)
+                payload = {"role": "assistant", "content": ""} if key == "message" else ""
+                final = {"model": model, key: payload, "done": True, "done_reason": "stop",
+                         "total_duration": total_ns, "load_duration": int(load_s * 1e9),
+                         "prompt_eval_count": 0, "prompt_eval_duration": 0,
+                         "eval_count": count, "eval_duration": total_ns - int(load_s * 1e9)}
+                self._chunk(json.dumps(final).encode() + b"\n")
+                self._chunk(b"")
+
+            def _openai(self, body):
+                model = body.get("model")
+                server._load(model)
+                if not body.get("stream"):
+                    text = "".join(server._tokens())
+                    self._send_json({"id": "fake", "object": "chat.completion", "model": model,
+                                     "choices": [{"index": 0, "finish_reason": "stop",
+                                                  "message": {"role": "assistant", "content": text}}]})
+                    return
+                self._start_stream("text/event-stream")
+                for token in server._tokens():
+                    event = {"id": "fake", "object": "chat.completion.chunk", "model": model,
+                             "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]}
+                    self._chunk(f"data: {json.dumps(event)}\n\n".encode())
+                done = {"id": "fake", "object": "chat.completion.chunk", "model": model,
+                        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+                self._chunk(f"data: {json.dumps(done)}\n\n".encode())
+                self._chunk(b"data: [DONE]\n\n")
+                self._chunk(b"")
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Ollama server")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--tps", type=float, default=40.0, help="Tokens per second")
+    parser.add_argument("--load", type=float, default=0.0, help="Simulated model load seconds")
+    parser.add_argument("--response", help="File with the canned response")
+    args = parser.parse_args()
+
+    response = None
+    if args.response:
+        with open(args.response, "r", encoding="utf-8") as f:
+            response = f.read()
+    fake = FakeOllamaServer(response, tokens_per_second=args.tps, load_seconds=args.load, port=args.port)
+    print(f"Fake Ollama listening on {fake.base_url}")
+    fake.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()